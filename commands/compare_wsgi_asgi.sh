@@ -0,0 +1,24 @@
+#!/bin/sh
+# Compare the sync (WSGI) and async (ASGI) performance read endpoints,
+# each served by a single worker process.
+# Usage: commands/compare_wsgi_asgi.sh <jwt-access-token> [performance-id]
+
+TOKEN=$1
+PERFORMANCE=${2:-1}
+
+# Throttling would answer most of the requests with 429.
+export THROTTLE_DISABLED=1
+
+gunicorn theater_api.wsgi:application --workers 1 --bind 127.0.0.1:8001 &
+WSGI_PID=$!
+uvicorn theater_api.asgi:application --workers 1 --port 8002 &
+ASGI_PID=$!
+trap 'kill $WSGI_PID $ASGI_PID' EXIT
+sleep 3
+
+for ENDPOINT in "" "$PERFORMANCE/" "$PERFORMANCE/seat-map/"; do
+    python manage.py load_test --token "$TOKEN" \
+        "http://127.0.0.1:8001/api/theatre/performances/$ENDPOINT" \
+        "http://127.0.0.1:8002/api/theatre/async/performances/$ENDPOINT" \
+        || exit 1
+done
@@ -6,7 +6,12 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "theater_api.settings")
+    os.environ.setdefault(
+        "DJANGO_SETTINGS_MODULE",
+        "theater_api.test_settings"
+        if sys.argv[1:2] == ["test"]
+        else "theater_api.settings",
+    )
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -0,0 +1,49 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def replica_reads():
+    """Route the reads of the enclosed block to a read replica."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def reads_from_replica():
+    """Whether the reads of the current context go to a read replica."""
+    return _replica_reads.get() and bool(settings.DATABASE_REPLICAS)
+
+
+class ReplicaRouter:
+    """
+    Send reads inside ``replica_reads()`` to a random database of
+    ``DATABASE_REPLICAS``; everything else, including all writes, goes to
+    the primary (``default``) database.
+    """
+
+    def db_for_read(self, model, **hints):
+        if reads_from_replica():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication.
+        return db not in settings.DATABASE_REPLICAS
@@ -56,6 +56,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "theatre.middleware.RequestMetricsMiddleware",
+    "theatre.middleware.PrimaryAfterWriteMiddleware",
 ]
 
 ROOT_URLCONF = "theater_api.urls"
@@ -90,8 +92,67 @@ DATABASES = {
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
         "HOST": "localhost",
         "PORT": 5432,
+        # Keep connections open between requests and check them before
+        # reuse, instead of connecting on every request.
+        "CONN_MAX_AGE": int(os.environ.get("DATABASE_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
+
+# Connection pool, e.g. DATABASE_POOL_MAX_SIZE=20. Requires psycopg 3
+# ("psycopg[pool]") and replaces persistent connections.
+if os.environ.get("DATABASE_POOL_MAX_SIZE"):
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("DATABASE_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.environ["DATABASE_POOL_MAX_SIZE"]),
+            "timeout": int(os.environ.get("DATABASE_POOL_TIMEOUT", 10)),
+        }
+    }
+
+# Read replicas, e.g. DATABASE_REPLICA_HOSTS=replica-1,replica-2. Catalog
+# and performance reads go to them, see theater_api.db_routers.
+DATABASE_REPLICAS = []
+for index, host in enumerate(
+    filter(None, os.environ.get("DATABASE_REPLICA_HOSTS", "").split(","))
+):
+    DATABASES[f"replica_{index}"] = {**DATABASES["default"], "HOST": host}
+    DATABASE_REPLICAS.append(f"replica_{index}")
+
+DATABASE_ROUTERS = ["theater_api.db_routers.ReplicaRouter"]
+
+# Seconds a user's reads stay on the primary database after a write, so
+# they see their own changes despite replication lag.
+READ_REPLICA_PIN_SECONDS = int(os.environ.get("READ_REPLICA_PIN_SECONDS", 5))
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "responses": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "responses",
+        "TIMEOUT": 60 * 60,
+    },
+}
+
+RESPONSE_CACHE_ALIAS = "responses"
+
+# Throttle counters must be shared by all server processes: point
+# THROTTLE_REDIS_URL at Redis in production (requires `redis`).
+if os.environ.get("THROTTLE_REDIS_URL"):
+    CACHES["throttle"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ["THROTTLE_REDIS_URL"],
+    }
+else:
+    CACHES["throttle"] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "throttle",
+    }
+
+THROTTLE_CACHE_ALIAS = "throttle"
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -137,21 +198,63 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "theatre.throttling.ScopedFixedWindowThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "10/day", "user": "30/day"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "10/day",
+        "user": "30/day",
+        "catalog": "1000/hour",
+        "reservations": "10/minute",
+    },
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
 }
 
+# THROTTLE_DISABLED=1 turns every rate off, e.g. for the servers under
+# test in commands/compare_wsgi_asgi.sh. Never set it in production.
+if os.environ.get("THROTTLE_DISABLED"):
+    REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] = dict.fromkeys(
+        REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]
+    )
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=112424),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": False,
+    "TOKEN_OBTAIN_SERIALIZER": (
+        "user.serializers.TokenObtainPairWithClaimsSerializer"
+    ),
+}
+
+# How long catalog endpoints trust the cached active and staff status of
+# a token's user (theatre.authentication.StatelessJWTAuthentication).
+JWT_USER_STATE_CACHE_SECONDS = 30
+
+SEAT_HOLD_LIFETIME = timedelta(minutes=10)
+
+# Fan-out of live seat changes; use theatre.broker.RedisBroker with
+# OPTIONS {"url": ...} when running several server processes.
+SEAT_EVENTS_BROKER = {
+    "BACKEND": os.environ.get(
+        "SEAT_EVENTS_BROKER", "theatre.broker.InMemoryBroker"
+    ),
+    "OPTIONS": (
+        {"url": os.environ["REDIS_URL"]} if os.environ.get("REDIS_URL") else {}
+    ),
 }
 
+# Share of requests timed by theatre.middleware.RequestMetricsMiddleware.
+REQUEST_METRICS_SAMPLE_RATE = float(
+    os.environ.get("REQUEST_METRICS_SAMPLE_RATE", "0.05")
+)
+
+# Serve performance and play lists and reservation tickets from
+# theatre.values_serializers and render them with orjson when installed.
+FAST_LIST_SERIALIZATION = (
+    os.environ.get("FAST_LIST_SERIALIZATION", "").lower() in ("1", "true")
+)
+
 INTERNAL_IPS = [
     "127.0.0.1",
 ]
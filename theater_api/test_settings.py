@@ -0,0 +1,13 @@
+"""
+Settings of the test suite, used by ``python manage.py test``.
+"""
+
+from theater_api.settings import *  # noqa: F401,F403
+from theater_api.settings import DATABASES
+
+# Mirror of the primary for the replica routing tests, which route to it
+# with DATABASE_REPLICAS=["replica"]. Nothing else reads from it.
+DATABASES = {
+    **DATABASES,
+    "replica": {**DATABASES["default"], "TEST": {"MIRROR": "default"}},
+}
@@ -1,4 +1,8 @@
+from django import forms
 from django.contrib import admin
+
+from theatre.schedule import play_duration_errors
+from theatre.seat_map import performance_seats_outside_hall, seats_outside_hall
 from .models import (
     TheatreHall,
     Play,
@@ -6,17 +10,71 @@ from .models import (
     Genre,
     Performance,
     Reservation,
+    SeatHold,
 )
 
 
+class TheatreHallAdminForm(forms.ModelForm):
+    def clean(self):
+        cleaned_data = super().clean()
+        rows = cleaned_data.get("rows")
+        seats_in_row = cleaned_data.get("seats_in_row")
+        if (
+            self.instance.pk is not None
+            and rows
+            and seats_in_row
+            and {"rows", "seats_in_row"} & set(self.changed_data)
+        ):
+            outside = seats_outside_hall(self.instance.pk, rows, seats_in_row)
+            if outside:
+                raise forms.ValidationError(
+                    f"{outside} sold or held seats would be outside of "
+                    f"the resized hall."
+                )
+        return cleaned_data
+
+
+class PlayAdminForm(forms.ModelForm):
+    def clean_duration(self):
+        duration = self.cleaned_data["duration"]
+        if self.instance.pk is not None and "duration" in self.changed_data:
+            errors = play_duration_errors(self.instance, duration)
+            if errors:
+                raise forms.ValidationError(errors)
+        return duration
+
+
+class PerformanceAdminForm(forms.ModelForm):
+    def clean(self):
+        cleaned_data = super().clean()
+        theatre_hall = cleaned_data.get("theatre_hall")
+        if (
+            self.instance.pk is not None
+            and theatre_hall is not None
+            and "theatre_hall" in self.changed_data
+        ):
+            outside = performance_seats_outside_hall(
+                self.instance.pk, theatre_hall
+            )
+            if outside:
+                self.add_error(
+                    "theatre_hall",
+                    f"{outside} sold or held seats would be outside of "
+                    f"the new theatre hall.",
+                )
+        return cleaned_data
+
+
 @admin.register(TheatreHall)
 class TheatreHallAdmin(admin.ModelAdmin):
+    form = TheatreHallAdminForm
     list_display = ["name", "rows", "seats_in_row"]
     search_fields = ["name"]
 
 
 @admin.register(Play)
 class PlayAdmin(admin.ModelAdmin):
+    form = PlayAdminForm
     list_display = ["title"]
     filter_horizontal = ["actors", "genres"]
     search_fields = ["title"]
@@ -24,6 +82,7 @@ class PlayAdmin(admin.ModelAdmin):
 
 @admin.register(Performance)
 class PerformanceAdmin(admin.ModelAdmin):
+    form = PerformanceAdminForm
     list_display = ["play", "theatre_hall", "show_time"]
     list_filter = ["show_time", "theatre_hall"]
 
@@ -34,6 +93,12 @@ class ReservationAdmin(admin.ModelAdmin):
     list_filter = ["created_at"]
 
 
+@admin.register(SeatHold)
+class SeatHoldAdmin(admin.ModelAdmin):
+    list_display = ["user", "performance", "created_at", "expires_at"]
+    list_filter = ["expires_at"]
+
+
 @admin.register(Actor)
 class ActorAdmin(admin.ModelAdmin):
     list_display = ("first_name", "last_name", "full_name")
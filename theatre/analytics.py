@@ -0,0 +1,225 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from theatre.filters import parse_date_param, show_time_range
+from theatre.models import (
+    Performance,
+    RollupWatermark,
+    SalesRollup,
+    Ticket,
+)
+
+SALES_ROLLUP = "sales"
+# Reservations younger than this may belong to transactions that have
+# not committed yet, so they are left for the next refresh.
+REFRESH_LAG = timedelta(minutes=5)
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+
+
+def refresh_sales_rollups(full=False, now=None):
+    """
+    Add the tickets of reservations created since the last refresh to the
+    sales rollups. ``full`` rebuilds the rollups from all reservations,
+    which also drops cancelled tickets. Return the number of rollup rows
+    created and updated and the new watermark.
+    """
+    until = (now or timezone.now()) - REFRESH_LAG
+    with transaction.atomic():
+        watermark, _ = (
+            RollupWatermark.objects.select_for_update().get_or_create(
+                name=SALES_ROLLUP
+            )
+        )
+        if full:
+            SalesRollup.objects.all().delete()
+            watermark.created_at = None
+
+        tickets = Ticket.objects.filter(reservation__created_at__lte=until)
+        if watermark.created_at is not None:
+            tickets = tickets.filter(
+                reservation__created_at__gt=watermark.created_at
+            )
+        sales = list(
+            tickets.values(
+                "performance_id",
+                day=TruncDate("reservation__created_at"),
+                play_id=F("performance__play_id"),
+                theatre_hall_id=F("performance__theatre_hall_id"),
+            )
+            .annotate(tickets=Count("id"))
+            .order_by()
+        )
+
+        rollups = {
+            (rollup.day, rollup.performance_id): rollup
+            for rollup in SalesRollup.objects.filter(
+                day__in={sale["day"] for sale in sales},
+                performance_id__in={sale["performance_id"] for sale in sales},
+            )
+        }
+        created, updated = [], []
+        for sale in sales:
+            rollup = rollups.get((sale["day"], sale["performance_id"]))
+            if rollup is None:
+                created.append(SalesRollup(**sale))
+            else:
+                rollup.tickets += sale["tickets"]
+                updated.append(rollup)
+        SalesRollup.objects.bulk_create(created, batch_size=1000)
+        SalesRollup.objects.bulk_update(updated, ["tickets"], batch_size=1000)
+
+        if watermark.created_at is None or until > watermark.created_at:
+            watermark.created_at = until
+        watermark.save()
+    return {
+        "created": len(created),
+        "updated": len(updated),
+        "watermark": watermark.created_at,
+    }
+
+
+def _limit(query_params):
+    try:
+        limit = int(query_params.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValidationError(
+            {"limit": f"Must be an integer between 1 and {MAX_LIMIT}."}
+        )
+    return limit
+
+
+def _sales(query_params):
+    """Sales rollups of the inclusive ``from``/``to`` sale dates."""
+    rollups = SalesRollup.objects.all()
+    if query_params.get("from"):
+        rollups = rollups.filter(
+            day__gte=parse_date_param(query_params["from"], "from")
+        )
+    if query_params.get("to"):
+        rollups = rollups.filter(
+            day__lte=parse_date_param(query_params["to"], "to")
+        )
+    return rollups
+
+
+def _top(rollups, query_params, fields):
+    """
+    Sum the tickets of ``rollups`` grouped by the lookups of ``fields``,
+    a mapping of response keys to lookups that starts with the id.
+    """
+    lookups = list(fields.values())
+    rows = (
+        rollups.filter(**{f"{lookups[0]}__isnull": False})
+        .values(*lookups)
+        .annotate(tickets=Sum("tickets"))
+        .order_by("-tickets", lookups[0])[: _limit(query_params)]
+    )
+    return [
+        {
+            **{key: row[lookup] for key, lookup in fields.items()},
+            "tickets": row["tickets"],
+        }
+        for row in rows
+    ]
+
+
+def sales_over_time(query_params):
+    """Tickets sold per day."""
+    return list(
+        _sales(query_params)
+        .values("day")
+        .annotate(tickets=Sum("tickets"))
+        .order_by("day")
+    )
+
+
+def top_plays(query_params):
+    """Plays with the most tickets sold."""
+    return _top(
+        _sales(query_params),
+        query_params,
+        {"id": "play", "title": "play__title"},
+    )
+
+
+def top_actors(query_params):
+    """Actors whose plays sold the most tickets."""
+    return _top(
+        _sales(query_params),
+        query_params,
+        {
+            "id": "play__actors",
+            "first_name": "play__actors__first_name",
+            "last_name": "play__actors__last_name",
+        },
+    )
+
+
+def top_genres(query_params):
+    """Genres whose plays sold the most tickets."""
+    return _top(
+        _sales(query_params),
+        query_params,
+        {"id": "play__genres", "name": "play__genres__name"},
+    )
+
+
+def occupancy_by_hall(query_params):
+    """
+    Tickets sold, capacity and occupancy per theatre hall over the
+    performances shown within the inclusive ``from``/``to`` dates.
+    """
+    start, end = show_time_range(query_params)
+    performances = Performance.objects.all()
+    if start:
+        performances = performances.filter(show_time__gte=start)
+    if end:
+        performances = performances.filter(show_time__lt=end)
+
+    sold = dict(
+        SalesRollup.objects.filter(performance__in=performances)
+        .values("theatre_hall")
+        .annotate(tickets=Sum("tickets"))
+        .values_list("theatre_hall", "tickets")
+    )
+    halls = (
+        performances.values(
+            "theatre_hall", theatre_hall_name=F("theatre_hall__name")
+        )
+        .annotate(
+            performances=Count("id"),
+            capacity=Sum(
+                F("theatre_hall__rows") * F("theatre_hall__seats_in_row")
+            ),
+        )
+        .order_by("theatre_hall")
+    )
+    return [
+        {
+            **hall,
+            "seats_sold": sold.get(hall["theatre_hall"], 0),
+            "occupancy": (
+                round(sold.get(hall["theatre_hall"], 0) / hall["capacity"], 4)
+                if hall["capacity"]
+                else 0.0
+            ),
+        }
+        for hall in halls
+    ]
+
+
+def refreshed_until():
+    """Reservations created up to this time are in the sales rollups."""
+    return (
+        RollupWatermark.objects.filter(name=SALES_ROLLUP)
+        .values_list("created_at", flat=True)
+        .first()
+    )
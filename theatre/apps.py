@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class TheatreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "theatre"
+
+    def ready(self):
+        from theatre import signals  # noqa: F401
+        from theatre.schedule import create_schedule_constraint
+        from theatre.search import create_search_index
+
+        post_migrate.connect(create_search_index, sender=self)
+        post_migrate.connect(create_schedule_constraint, sender=self)
@@ -0,0 +1,188 @@
+import asyncio
+import json
+from contextlib import nullcontext
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from theater_api.db_routers import replica_reads
+from theatre.authentication import StatelessJWTAuthentication
+from theatre.broker import get_broker, seat_channel
+from theatre.filters import filter_performances
+from theatre.middleware import time_serialization
+from theatre.models import Performance
+from theatre.permissions import IsAdminOrIfAuthenticatedReadOnly
+from theatre.replicas import is_pinned_to_primary
+from theatre.seat_map import SEAT_MAP_ENCODINGS, seat_map_data
+from theatre.serializers import (
+    PerformanceDetailSerializer,
+    PerformanceListSerializer,
+)
+from theatre.views import PerformancePagination, PerformanceViewSet
+
+
+class _RequestGate(APIView):
+    """
+    Runs DRF authentication, permission and throttle checks, exception
+    handling and rendering for the async views, so they answer exactly
+    like their synchronous viewset counterparts.
+    """
+
+    authentication_classes = (StatelessJWTAuthentication,)
+    permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    renderer_classes = (JSONRenderer,)
+    throttle_scope = "catalog"
+
+
+class AsyncReadView(View):
+    """
+    Base of the async read endpoints. Only the authentication lookup and
+    the queries leave the event loop, so a worker keeps serving other
+    clients while responses are written to slow ones.
+    """
+
+    http_method_names = ["get"]
+
+    async def get(self, request, *args, **kwargs):
+        gate = _RequestGate()
+        gate.args, gate.kwargs = args, kwargs
+        drf_request = gate.initialize_request(request, *args, **kwargs)
+        gate.request = drf_request
+        gate.headers = gate.default_response_headers
+
+        def check_request():
+            gate.initial(drf_request, *args, **kwargs)
+            return is_pinned_to_primary(drf_request.user)
+
+        try:
+            pinned = await sync_to_async(check_request)()
+            with replica_reads() if not pinned else nullcontext():
+                response = await self.get_response_data(
+                    drf_request, *args, **kwargs
+                )
+        except Exception as exc:
+            response = gate.handle_exception(exc)
+
+        if not isinstance(response, Response):
+            return response
+        response = gate.finalize_response(
+            drf_request, response, *args, **kwargs
+        )
+        response.render()
+        return HttpResponse(
+            response.content,
+            status=response.status_code,
+            headers=dict(response.items()),
+        )
+
+    async def get_response_data(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+
+class AsyncPerformanceListView(AsyncReadView):
+    async def get_response_data(self, request):
+        queryset = filter_performances(
+            PerformanceViewSet.queryset, request.query_params
+        ).defer("seat_map")
+        paginator = PerformancePagination()
+        # The paginator evaluates the queryset itself, the same way the
+        # async ORM does: in a worker thread.
+        page = await sync_to_async(paginator.paginate_queryset)(
+            queryset, request
+        )
+        serializer = PerformanceListSerializer(page, many=True)
+        return Response(
+            {
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
+                "results": time_serialization(serializer.to_representation)(
+                    page
+                ),
+            }
+        )
+
+
+async def _get_performance(queryset, pk):
+    try:
+        return await queryset.aget(pk=pk)
+    except Performance.DoesNotExist:
+        raise Http404
+
+
+class AsyncPerformanceDetailView(AsyncReadView):
+    async def get_response_data(self, request, pk):
+        performance = await _get_performance(
+            Performance.objects.select_related(
+                "play", "theatre_hall"
+            ).prefetch_related("play__genres", "play__actors"),
+            pk,
+        )
+        serializer = PerformanceDetailSerializer(performance)
+        return Response(
+            time_serialization(serializer.to_representation)(performance)
+        )
+
+
+class AsyncSeatMapView(AsyncReadView):
+    async def get_response_data(self, request, pk):
+        encoding = request.query_params.get("encoding", "bitmap")
+        if encoding not in SEAT_MAP_ENCODINGS:
+            return Response(
+                {"encoding": "Must be one of: bitmap, rle."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        performance = await _get_performance(
+            Performance.objects.select_related("theatre_hall").only(
+                "id", "seat_map", "theatre_hall"
+            ),
+            pk,
+        )
+        return Response(seat_map_data(performance, encoding))
+
+
+def _event(name, data):
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+class AsyncSeatEventsView(AsyncReadView):
+    """
+    Server-sent events of a performance's seats: a ``snapshot`` event
+    with the bitmap seat map, then a ``seats`` event with the ``taken``
+    and ``released`` seats of every committed change.
+    """
+
+    keepalive_seconds = 15
+
+    async def get_response_data(self, request, pk):
+        queryset = Performance.objects.select_related("theatre_hall").only(
+            "id", "seat_map", "theatre_hall"
+        )
+        await _get_performance(queryset, pk)
+        response = StreamingHttpResponse(
+            self.stream(queryset, pk), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self, queryset, pk):
+        async with get_broker().subscribe(seat_channel(pk)) as queue:
+            # Read the snapshot only once subscribed, so that no change
+            # committed in between is lost.
+            performance = await _get_performance(queryset, pk)
+            yield _event("snapshot", seat_map_data(performance, "bitmap"))
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), self.keepalive_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield _event("seats", message)
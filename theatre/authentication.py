@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+
+def _user_state_key(user_id):
+    return f"theatre:user-state:{user_id}"
+
+
+def forget_user_state(user_id):
+    cache.delete(_user_state_key(user_id))
+
+
+def get_user_state(user_id):
+    """
+    Return ``(is_active, is_staff)`` of a user, cached for
+    ``JWT_USER_STATE_CACHE_SECONDS``, or ``None`` if the user is gone.
+    """
+    key = _user_state_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = (
+            get_user_model()
+            .objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+            .values_list("is_active", "is_staff")
+            .first()
+        ) or ()
+        cache.set(key, state, timeout=settings.JWT_USER_STATE_CACHE_SECONDS)
+    return tuple(state) or None
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Authenticate with the ``is_staff`` claim of the access token and
+    return a lightweight token user instead of loading the user row.
+    The token is rejected when the user was deleted, deactivated or had
+    their staff status changed, as seen through a short-lived cache.
+    Tokens issued without the claim fall back to the user lookup.
+    """
+
+    def get_user(self, validated_token):
+        if "is_staff" not in validated_token:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+        state = get_user_state(user_id)
+        if state is None or not state[0]:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        if state[1] != validated_token["is_staff"]:
+            raise AuthenticationFailed(
+                _("Token is outdated, obtain a new one"),
+                code="token_not_valid",
+            )
+        return api_settings.TOKEN_USER_CLASS(validated_token)
@@ -0,0 +1,347 @@
+import random
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from theatre.cache import CachedResponseMixin
+from theatre.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    SeatHold,
+    HeldSeat,
+    TheatreHall,
+    Ticket,
+)
+from theatre.search import refresh_search_documents
+from theatre.seat_map import SeatMap
+
+API_PREFIX = "/api/theatre/"
+
+DEFAULT_VOLUMES = {
+    "genres": 20,
+    "actors": 500,
+    "halls": 10,
+    "plays": 2000,
+    "performances": 5000,
+    "reservations": 1000,
+    "tickets_per_reservation": 4,
+    "genres_per_play": 2,
+    "actors_per_play": 5,
+}
+
+
+def seed(volumes=None, random_seed=0, email="benchmark@theatre.local"):
+    """
+    Bulk-insert a realistic catalog, schedule and sales history, and return
+    the staff user that owns the reservations and a seat hold.
+    """
+    volumes = {**DEFAULT_VOLUMES, **(volumes or {})}
+    rng = random.Random(random_seed)
+    user = get_user_model().objects.create_user(
+        email=email, password=None, is_staff=True
+    )
+
+    genres = Genre.objects.bulk_create(
+        Genre(name=f"Genre {i}") for i in range(volumes["genres"])
+    )
+    actors = Actor.objects.bulk_create(
+        Actor(first_name=f"First{i}", last_name=f"Last{i}")
+        for i in range(volumes["actors"])
+    )
+    halls = TheatreHall.objects.bulk_create(
+        TheatreHall(
+            name=f"Hall {i}",
+            rows=rng.randint(10, 40),
+            seats_in_row=rng.randint(15, 50),
+        )
+        for i in range(volumes["halls"])
+    )
+    plays = Play.objects.bulk_create(
+        Play(title=f"Play {i:06}", description=f"Description of play {i}")
+        for i in range(volumes["plays"])
+    )
+    Play.genres.through.objects.bulk_create(
+        Play.genres.through(play_id=play.id, genre_id=genre.id)
+        for play in plays
+        for genre in rng.sample(
+            genres, min(volumes["genres_per_play"], len(genres))
+        )
+    )
+    Play.actors.through.objects.bulk_create(
+        Play.actors.through(play_id=play.id, actor_id=actor.id)
+        for play in plays
+        for actor in rng.sample(
+            actors, min(volumes["actors_per_play"], len(actors))
+        )
+    )
+    refresh_search_documents(play.id for play in plays)
+
+    start = timezone.now() + timedelta(days=1)
+    performances = []
+    # Three-hour slots of at least a year, so that no performances overlap.
+    slots = max(8 * 365, volumes["performances"])
+    for show_time in sorted(
+        start + timedelta(hours=3 * slot)
+        for slot in rng.sample(range(slots), volumes["performances"])
+    ):
+        play = rng.choice(plays)
+        performances.append(
+            Performance(
+                play=play,
+                theatre_hall=rng.choice(halls),
+                show_time=show_time,
+                end_time=show_time + play.duration,
+            )
+        )
+    Performance.objects.bulk_create(performances)
+
+    reservations = Reservation.objects.bulk_create(
+        Reservation(user=user) for _ in range(volumes["reservations"])
+    )
+    seat_maps = {}
+    tickets = []
+    for reservation in reservations:
+        performance = rng.choice(performances)
+        seat_map = seat_maps.setdefault(
+            performance.id,
+            SeatMap(
+                performance.theatre_hall.rows,
+                performance.theatre_hall.seats_in_row,
+            ),
+        )
+        for _ in range(volumes["tickets_per_reservation"]):
+            row = rng.randint(1, seat_map.rows)
+            seat = rng.randint(1, seat_map.seats_in_row)
+            if seat_map.is_taken(row, seat):
+                continue
+            seat_map.take(row, seat)
+            tickets.append(
+                Ticket(
+                    reservation=reservation,
+                    performance=performance,
+                    row=row,
+                    seat=seat,
+                )
+            )
+    Ticket.objects.bulk_create(tickets, batch_size=1000)
+
+    for performance in performances:
+        if performance.id in seat_maps:
+            performance.seat_map = seat_maps[performance.id].to_bytes()
+            performance.tickets_sold = seat_maps[performance.id].taken_count
+    Performance.objects.bulk_update(
+        performances, ["seat_map", "tickets_sold"], batch_size=1000
+    )
+
+    hold = SeatHold.objects.create(
+        user=user,
+        performance=performances[0],
+        expires_at=timezone.now() + timedelta(hours=1),
+    )
+    HeldSeat.objects.create(
+        hold=hold,
+        performance=performances[0],
+        row=performances[0].theatre_hall.rows,
+        seat=performances[0].theatre_hall.seats_in_row,
+    )
+    return user
+
+
+@contextmanager
+def seeded_client(volumes=None):
+    """
+    Seed benchmark data in a transaction that is rolled back on exit and
+    yield an API client authenticated as the seeded staff user, together
+    with that user. Throttling is disabled, as it is not what is measured,
+    and so is ``DEBUG``: it shows debug_toolbar, which instruments every
+    request of the test client, and logs every query.
+    """
+    with transaction.atomic(), mock.patch.object(
+        APIView, "check_throttles"
+    ), override_settings(ALLOWED_HOSTS=["testserver"], DEBUG=False):
+        user = seed(volumes)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        yield client, user
+        transaction.set_rollback(True)
+
+
+def _detail_object(viewset, user):
+    model = viewset.queryset.model
+    queryset = model.objects.order_by("pk")
+    if "user" in {field.name for field in model._meta.fields}:
+        queryset = queryset.filter(user=user)
+    return queryset.first()
+
+
+# Server-sent event streams do not end, so they cannot be timed.
+UNBOUNDED_ROUTES = {"async-performance-seat-events"}
+
+
+def _router_routes(router, user):
+    routes = []
+    for prefix, viewset, basename in router.registry:
+        obj = _detail_object(viewset, user)
+        if hasattr(viewset, "list"):
+            routes.append((f"{basename}-list", f"{API_PREFIX}{prefix}/"))
+        if hasattr(viewset, "retrieve") and obj is not None:
+            routes.append(
+                (f"{basename}-detail", f"{API_PREFIX}{prefix}/{obj.pk}/")
+            )
+        for extra_action in viewset.get_extra_actions():
+            if "get" not in extra_action.mapping:
+                continue
+            name = f"{basename}-{extra_action.url_name}"
+            if extra_action.detail and obj is not None:
+                url = f"{API_PREFIX}{prefix}/{obj.pk}/{extra_action.url_path}/"
+            elif not extra_action.detail:
+                url = f"{API_PREFIX}{prefix}/{extra_action.url_path}/"
+            else:
+                continue
+            routes.append((name, url))
+    return routes
+
+
+def _view_routes(urlpatterns):
+    # The only object these views take by ``pk`` is a performance.
+    performance = Performance.objects.order_by("pk").first()
+    routes = []
+    for pattern in urlpatterns:
+        if not isinstance(pattern, URLPattern):
+            continue
+        view_class = getattr(pattern.callback, "view_class", None)
+        if (
+            not hasattr(view_class, "get")
+            or pattern.name in UNBOUNDED_ROUTES
+        ):
+            continue
+        kwargs = {}
+        if "pk" in pattern.pattern.converters:
+            if performance is None:
+                continue
+            kwargs["pk"] = performance.pk
+        routes.append(
+            (pattern.name, reverse(f"theatre:{pattern.name}", kwargs=kwargs))
+        )
+    return routes
+
+
+def discover_routes(urls, user):
+    """
+    Build ``(name, url)`` pairs for every GET route of the ``urls`` module
+    (``theatre.urls``): list, retrieve and extra GET actions of each
+    viewset registered on its router, and the GET views of its other
+    URL patterns.
+    """
+    return _router_routes(urls.router, user) + _view_routes(urls.urlpatterns)
+
+
+def _uncached(self, handler, request, *args, **kwargs):
+    return handler(request, *args, **kwargs)
+
+
+@contextmanager
+def uncached_responses():
+    """
+    Bypass the response cache of the catalog viewsets, so that repeated
+    requests measure the view instead of a cache hit.
+    """
+    with mock.patch.object(CachedResponseMixin, "cached_response", _uncached):
+        yield
+
+
+def filtered_plays_params():
+    """
+    Play list filters by the first genre and the first actor, which
+    exercise both EXISTS subqueries on the M2M through tables.
+    """
+    return {
+        "genres": str(Genre.objects.order_by("pk").values_list("pk")[0][0]),
+        "actors": str(Actor.objects.order_by("pk").values_list("pk")[0][0]),
+    }
+
+
+def percentile(values, percentile):
+    values = sorted(values)
+    index = min(len(values) - 1, round(percentile / 100 * (len(values) - 1)))
+    return values[index]
+
+
+def _request(client, url):
+    response = client.get(url)
+    if response.streaming:
+        b"".join(response.streaming_content)
+    return response
+
+
+def measure(client, url, repeat):
+    """
+    Request ``url`` ``repeat`` times and return the status code, the query
+    count of the first (cold) request, p50/p95 latency in milliseconds and
+    the peak memory allocated while serving one request in KiB.
+    """
+    with CaptureQueriesContext(connection) as queries:
+        response = _request(client, url)
+    query_count = len(queries.captured_queries)
+
+    tracemalloc.start()
+    _request(client, url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _request(client, url)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "status": response.status_code,
+        "queries": query_count,
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "memory_kib": round(peak / 1024, 1),
+    }
+
+
+def find_regressions(results, baseline, threshold):
+    """
+    Compare results with a baseline. Any extra query is a regression;
+    latency and memory regress when they grow by more than ``threshold``.
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result["status"] != expected["status"]:
+            regressions.append(
+                f"{name}: status {result['status']}, "
+                f"baseline {expected['status']}"
+            )
+        if result["queries"] > expected["queries"]:
+            regressions.append(
+                f"{name}: {result['queries']} queries, "
+                f"baseline {expected['queries']}"
+            )
+        for metric in ("p95_ms", "memory_kib"):
+            if result[metric] > expected[metric] * (1 + threshold):
+                regressions.append(
+                    f"{name}: {metric} {result[metric]}, "
+                    f"baseline {expected[metric]}"
+                )
+    return regressions
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+CHANNEL_PREFIX = "theatre:seats:"
+
+
+def seat_channel(performance_id):
+    return f"{CHANNEL_PREFIX}{performance_id}"
+
+
+class InMemoryBroker:
+    """
+    Fan messages out to the subscribers of this process. Each subscriber
+    owns an ``asyncio.Queue``; publishing is thread-safe, so synchronous
+    views and signal handlers can publish to subscribers on the event loop.
+    """
+
+    def __init__(self, **options):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, message)
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscribers.get(channel, ()))
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        """Yield a queue receiving the messages published to ``channel``."""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers[channel].add(subscriber)
+        try:
+            yield subscriber[1]
+        finally:
+            with self._lock:
+                self._subscribers[channel].discard(subscriber)
+                if not self._subscribers[channel]:
+                    del self._subscribers[channel]
+
+
+class RedisBroker(InMemoryBroker):
+    """
+    Publish through Redis so that every server process sees every seat
+    change. A process holds a single pattern subscription and fans the
+    messages out to its local subscribers. Requires the ``redis`` package.
+    """
+
+    def __init__(self, url="redis://localhost:6379/0", **options):
+        super().__init__(**options)
+        self.url = url
+        self._client = None
+        self._listener = None
+
+    def publish(self, channel, message):
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis.from_url(self.url)
+        self._client.publish(channel, json.dumps(message))
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(
+                self._listen()
+            )
+        async with super().subscribe(channel) as queue:
+            yield queue
+
+    async def _listen(self):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        async with client.pubsub() as pubsub:
+            await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+            async for item in pubsub.listen():
+                if item["type"] == "pmessage":
+                    super().publish(
+                        item["channel"].decode(), json.loads(item["data"])
+                    )
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    config = settings.SEAT_EVENTS_BROKER
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+def publish_seat_changes(performance_id, taken=(), released=()):
+    """
+    Announce seats taken and released in a performance once the current
+    transaction commits.
+    """
+    message = {
+        "performance": performance_id,
+        "taken": [list(seat) for seat in taken],
+        "released": [list(seat) for seat in released],
+    }
+    transaction.on_commit(
+        lambda: get_broker().publish(seat_channel(performance_id), message)
+    )
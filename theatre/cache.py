@@ -0,0 +1,116 @@
+import hashlib
+import json
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework import status
+from rest_framework.response import Response
+
+from theater_api.db_routers import reads_from_replica
+
+
+def get_response_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def _version_key(model):
+    return f"theatre:version:{model._meta.label_lower}"
+
+
+def _written_key(model):
+    return f"theatre:written:{model._meta.label_lower}"
+
+
+def _new_version():
+    # Versions start from the clock, so an evicted counter can never
+    # fall back to a value that cached responses were stored under.
+    return int(time.time() * 1000)
+
+
+def get_versions(models):
+    cache = get_response_cache()
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _new_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate_model(model):
+    """Expire every cached response built from ``model`` rows."""
+    cache = get_response_cache()
+    try:
+        cache.incr(_version_key(model))
+    except ValueError:
+        cache.set(_version_key(model), _new_version(), timeout=None)
+    # Read replicas may lag behind the write for as long as the writer's
+    # reads are pinned to the primary.
+    cache.set(
+        _written_key(model), True, timeout=settings.READ_REPLICA_PIN_SECONDS
+    )
+
+
+def recently_written(models):
+    """Whether ``models`` changed within ``READ_REPLICA_PIN_SECONDS``."""
+    keys = [_written_key(model) for model in models]
+    return bool(get_response_cache().get_many(keys))
+
+
+def make_etag(data):
+    content = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    return '"%s"' % hashlib.md5(content.encode()).hexdigest()
+
+
+class CachedResponseMixin:
+    """
+    Cache successful GET responses of a viewset per path and normalized
+    query parameters. Writes to ``cache_models`` invalidate the entries,
+    and clients revalidating with ``If-None-Match`` get a 304.
+    """
+
+    cache_models = ()
+
+    def get_cache_key(self, request):
+        versions = get_versions(self.cache_models)
+        query = urlencode(
+            sorted(
+                (key, value)
+                for key, values in request.query_params.lists()
+                for value in values
+            )
+        )
+        return (
+            f"theatre:response:{':'.join(map(str, versions))}:"
+            f"{request.get_host()}{request.path}?{query}"
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        cache = get_response_cache()
+        cache_key = self.get_cache_key(request)
+        cached = cache.get(cache_key)
+        if cached is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            cached = (response.data, make_etag(response.data))
+            # A lagging replica can still return the rows from before the
+            # latest write, which must not be stored under the new version.
+            if not (
+                reads_from_replica() and recently_written(self.cache_models)
+            ):
+                cache.set(cache_key, cached)
+
+        data, etag = cached
+        if etag in request.headers.get("If-None-Match", ""):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+        return Response(data, headers={"ETag": etag})
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
@@ -0,0 +1,46 @@
+from django.db import connection
+
+
+def _plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _explain_postgresql(cursor, sql):
+    cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")
+    plan = cursor.fetchone()[0][0]
+    seq_scans = [
+        node["Relation Name"]
+        for node in _plan_nodes(plan["Plan"])
+        if node["Node Type"] == "Seq Scan"
+    ]
+    return seq_scans, plan["Execution Time"]
+
+
+def _explain_sqlite(cursor, sql):
+    cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+    seq_scans = []
+    for *_, detail in cursor.fetchall():
+        words = detail.split()
+        if words[0] == "SCAN" and "USING" not in words:
+            seq_scans.append(words[1])
+    return seq_scans, None
+
+
+def explain(sql):
+    """
+    Explain a ``SELECT`` on the default database and return the tables it
+    scans sequentially and, on PostgreSQL, its execution time in ms
+    (``EXPLAIN ANALYZE``). SQLite plans are not executed.
+    """
+    explainers = {
+        "postgresql": _explain_postgresql,
+        "sqlite": _explain_sqlite,
+    }
+    if connection.vendor not in explainers:
+        raise NotImplementedError(
+            f"EXPLAIN is not supported on {connection.vendor}"
+        )
+    with connection.cursor() as cursor:
+        return explainers[connection.vendor](cursor, sql)
@@ -0,0 +1,87 @@
+import csv
+import json
+from datetime import datetime, time, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from theatre.models import Ticket
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+EXPORT_FIELDS = (
+    ("reservation_id", "reservation_id"),
+    ("reservation_created_at", "reservation__created_at"),
+    ("user_email", "reservation__user__email"),
+    ("ticket_id", "id"),
+    ("performance_id", "performance_id"),
+    ("show_time", "performance__show_time"),
+    ("play_title", "performance__play__title"),
+    ("theatre_hall", "performance__theatre_hall__name"),
+    ("row", "row"),
+    ("seat", "seat"),
+)
+
+CHUNK_SIZE = 2000
+
+
+def _start_of_day(date):
+    return timezone.make_aware(datetime.combine(date, time.min))
+
+
+def export_rows(date_from=None, date_to=None, performance_ids=None):
+    """
+    Yield one flat tuple per ticket, ordered by reservation. Rows are
+    fetched in chunks through a server-side cursor where the database
+    supports it, so memory use does not depend on the export size.
+    Both dates are inclusive and filter on the reservation time.
+    """
+    tickets = Ticket.objects.all()
+    if date_from:
+        tickets = tickets.filter(
+            reservation__created_at__gte=_start_of_day(date_from)
+        )
+    if date_to:
+        tickets = tickets.filter(
+            reservation__created_at__lt=_start_of_day(
+                date_to + timedelta(days=1)
+            )
+        )
+    if performance_ids:
+        tickets = tickets.filter(performance_id__in=performance_ids)
+
+    return (
+        tickets.order_by("reservation_id", "id")
+        .values_list(*(lookup for _, lookup in EXPORT_FIELDS))
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([name for name, _ in EXPORT_FIELDS])
+    for row in rows:
+        yield writer.writerow(
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in row
+        )
+
+
+def iter_ndjson(rows):
+    names = [name for name, _ in EXPORT_FIELDS]
+    for row in rows:
+        yield json.dumps(dict(zip(names, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+def iter_export(export_format, rows):
+    if export_format == "ndjson":
+        return iter_ndjson(rows)
+    return iter_csv(rows)
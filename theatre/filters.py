@@ -0,0 +1,134 @@
+from datetime import datetime, time, timedelta
+
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from theatre.models import Play
+from theatre.search import search_plays
+
+
+def params_to_ints(value, name):
+    """Parse comma-separated ids of query parameter ``name``."""
+    try:
+        ids = [int(str_id) for str_id in value.split(",")]
+    except ValueError:
+        raise ValidationError(
+            {name: "Must be a comma-separated list of integer ids."}
+        )
+    if any(id_ < 1 for id_ in ids):
+        raise ValidationError({name: "Ids must be positive integers."})
+    return ids
+
+
+def _has_related(through, related_field, ids, play_ref="pk"):
+    return Exists(
+        through.objects.filter(
+            play_id=OuterRef(play_ref), **{f"{related_field}__in": ids}
+        )
+    )
+
+
+def filter_plays(queryset, query_params):
+    """
+    Apply every given play filter with AND semantics. Related ids are
+    matched with EXISTS subqueries, so plays are never duplicated.
+    """
+    title = query_params.get("title")
+    genres = query_params.get("genres")
+    actors = query_params.get("actors")
+    search = query_params.get("search")
+
+    if title:
+        queryset = queryset.filter(title__icontains=title)
+    if genres:
+        queryset = queryset.filter(
+            _has_related(
+                Play.genres.through,
+                "genre_id",
+                params_to_ints(genres, "genres"),
+            )
+        )
+    if actors:
+        queryset = queryset.filter(
+            _has_related(
+                Play.actors.through,
+                "actor_id",
+                params_to_ints(actors, "actors"),
+            )
+        )
+    if search:
+        queryset = search_plays(queryset, search)
+    return queryset
+
+
+def parse_date_param(value, name):
+    """Parse a ``YYYY-MM-DD`` query parameter ``name``."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValidationError({name: "Must be a date in YYYY-MM-DD format."})
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def show_time_range(query_params):
+    """
+    Parse the inclusive ``from`` and ``to`` dates of the query parameters
+    into the ``(start, end)`` show time bounds of a half-open range.
+    Missing bounds are ``None``.
+    """
+    start = end = None
+    if query_params.get("from"):
+        start = _start_of_day(parse_date_param(query_params["from"], "from"))
+    if query_params.get("to"):
+        end = _start_of_day(
+            parse_date_param(query_params["to"], "to") + timedelta(days=1)
+        )
+    if start and end and start >= end:
+        raise ValidationError({"to": "Must not be earlier than from."})
+    return start, end
+
+
+def filter_performances(queryset, query_params):
+    """
+    Apply every given performance filter with AND semantics: a ``date``
+    or a ``from``/``to`` date range, and comma-separated ``play``,
+    ``hall`` and ``genre`` ids.
+    """
+    date = query_params.get("date")
+    plays = query_params.get("play")
+    halls = query_params.get("hall")
+    genres = query_params.get("genre")
+
+    # Ranges on show_time can use its index, show_time__date cannot.
+    if date:
+        day = parse_date_param(date, "date")
+        queryset = queryset.filter(
+            show_time__gte=_start_of_day(day),
+            show_time__lt=_start_of_day(day + timedelta(days=1)),
+        )
+    start, end = show_time_range(query_params)
+    if start:
+        queryset = queryset.filter(show_time__gte=start)
+    if end:
+        queryset = queryset.filter(show_time__lt=end)
+
+    if plays:
+        queryset = queryset.filter(play_id__in=params_to_ints(plays, "play"))
+    if halls:
+        queryset = queryset.filter(
+            theatre_hall_id__in=params_to_ints(halls, "hall")
+        )
+    if genres:
+        queryset = queryset.filter(
+            _has_related(
+                Play.genres.through,
+                "genre_id",
+                params_to_ints(genres, "genre"),
+                play_ref="play_id",
+            )
+        )
+    return queryset
@@ -0,0 +1,207 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from theatre.models import HeldSeat, Reservation, SeatHold, Ticket
+from theatre.seat_map import (
+    SeatMap,
+    best_available,
+    lock_performances,
+    save_seat_map,
+)
+
+
+def release_expired_holds(performance_ids=None, now=None):
+    """Delete expired holds, optionally only for the given performances."""
+    expired = SeatHold.objects.filter(expires_at__lte=now or timezone.now())
+    if performance_ids is not None:
+        expired = expired.filter(performance_id__in=performance_ids)
+    deleted, by_model = expired.delete()
+    return by_model.get(SeatHold._meta.label, 0)
+
+
+def _seats_q(seats):
+    return Q(*[Q(row=row, seat=seat) for row, seat in seats], _connector=Q.OR)
+
+
+def _held_seats(performance_ids, user):
+    """Map performance id to seats held by users other than ``user``."""
+    held = defaultdict(set)
+    for performance_id, row, seat in (
+        HeldSeat.objects.filter(performance_id__in=performance_ids)
+        .exclude(hold__user=user)
+        .values_list("performance_id", "row", "seat")
+    ):
+        held[performance_id].add((row, seat))
+    return held
+
+
+def _check_available(performances, seats_by_performance, user):
+    """
+    Validate requested seats against the locked seat maps and active holds
+    of other users, reporting every unavailable seat at once.
+    """
+    held = _held_seats(seats_by_performance.keys(), user)
+    seat_maps = {}
+    errors = []
+    for performance_id, seats in seats_by_performance.items():
+        performance = performances.get(performance_id)
+        if performance is None:
+            errors.append(f"Performance {performance_id} does not exist.")
+            continue
+        seat_map = SeatMap.for_performance(performance)
+        requested = set()
+        for row, seat in seats:
+            if (row, seat) in requested:
+                errors.append(
+                    f"Row {row}, seat {seat} is requested more than once "
+                    f"for performance {performance_id}."
+                )
+                continue
+            requested.add((row, seat))
+            try:
+                taken = seat_map.is_taken(row, seat)
+            except IndexError:
+                errors.append(
+                    f"Row {row}, seat {seat} does not exist "
+                    f"in performance {performance_id}."
+                )
+                continue
+            if taken or (row, seat) in held[performance_id]:
+                errors.append(
+                    f"Row {row}, seat {seat} is not available "
+                    f"for performance {performance_id}."
+                )
+        seat_maps[performance_id] = seat_map
+    if errors:
+        raise ValidationError({"seats": errors})
+    return seat_maps
+
+
+def hold_seats(user, performance, seats, lifetime=None):
+    """
+    Hold ``(row, seat)`` pairs of a performance for ``user`` until the hold
+    expires. Contention is resolved on the performance row lock, before any
+    reservation is attempted.
+    """
+    lifetime = lifetime or settings.SEAT_HOLD_LIFETIME
+    seats = list(dict.fromkeys(seats))
+    with transaction.atomic():
+        performances = lock_performances([performance.id])
+        release_expired_holds([performance.id])
+        _check_available(performances, {performance.id: seats}, user)
+        HeldSeat.objects.filter(
+            _seats_q(seats), hold__user=user, performance=performance
+        ).delete()
+
+        hold = SeatHold.objects.create(
+            user=user,
+            performance=performance,
+            expires_at=timezone.now() + lifetime,
+        )
+        HeldSeat.objects.bulk_create(
+            HeldSeat(hold=hold, performance=performance, row=row, seat=seat)
+            for row, seat in seats
+        )
+        return hold
+
+
+def book_seats(user, tickets_data, hold=None):
+    """
+    Create a reservation with a ticket for each of ``tickets_data``
+    (``performance``, ``row``, ``seat`` mappings) and mark the seats taken.
+    Seats held by ``user`` are released as they are booked.
+    """
+    seats_by_performance = defaultdict(list)
+    for ticket_data in tickets_data:
+        performance = ticket_data["performance"]
+        performance_id = getattr(performance, "id", performance)
+        seats_by_performance[performance_id].append(
+            (ticket_data["row"], ticket_data["seat"])
+        )
+
+    with transaction.atomic():
+        performances = lock_performances(seats_by_performance.keys())
+        release_expired_holds(seats_by_performance.keys())
+        if hold is not None and not SeatHold.objects.filter(
+            pk=hold.pk
+        ).exists():
+            raise ValidationError({"hold": "Seat hold has expired."})
+        seat_maps = _check_available(performances, seats_by_performance, user)
+
+        reservation = Reservation.objects.create(user=user)
+        Ticket.objects.bulk_create(
+            Ticket(
+                reservation=reservation,
+                performance_id=performance_id,
+                row=row,
+                seat=seat,
+            )
+            for performance_id, seats in seats_by_performance.items()
+            for row, seat in seats
+        )
+
+        for performance_id, seats in seats_by_performance.items():
+            seat_map = seat_maps[performance_id]
+            for row, seat in seats:
+                seat_map.take(row, seat)
+            save_seat_map(performances[performance_id], seat_map)
+            HeldSeat.objects.filter(
+                _seats_q(seats),
+                hold__user=user,
+                performance_id=performance_id,
+            ).delete()
+
+        if hold is not None:
+            hold.delete()
+        return reservation
+
+
+def book_best_available(user, performance_id, count):
+    """
+    Book the best ``count`` adjacent seats of a performance that are
+    neither taken nor held by other users. The seats are chosen and booked
+    under the same performance row lock.
+    """
+    with transaction.atomic():
+        performance = lock_performances([performance_id]).get(performance_id)
+        if performance is None:
+            raise ValidationError(
+                {
+                    "performance": (
+                        f"Performance {performance_id} does not exist."
+                    )
+                }
+            )
+        release_expired_holds([performance_id])
+        seat_map = SeatMap.for_performance(performance)
+        for row, seat in _held_seats([performance_id], user)[performance_id]:
+            seat_map.take(row, seat)
+
+        seats = best_available(seat_map, count)
+        if seats is None:
+            raise ValidationError(
+                {"seats": f"No {count} adjacent seats are available."}
+            )
+        return book_seats(
+            user,
+            [
+                {"performance": performance_id, "row": row, "seat": seat}
+                for row, seat in seats
+            ],
+        )
+
+
+def confirm_hold(hold):
+    """Turn an active seat hold into a reservation."""
+    if hold.is_expired:
+        raise ValidationError({"hold": "Seat hold has expired."})
+    tickets_data = [
+        {"performance": hold.performance_id, "row": row, "seat": seat}
+        for row, seat in hold.seats.values_list("row", "seat")
+    ]
+    return book_seats(hold.user, tickets_data, hold=hold)
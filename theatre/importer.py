@@ -0,0 +1,365 @@
+import csv
+import io
+import json
+import time
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from theatre.cache import invalidate_model
+from theatre.models import Actor, Genre, Performance, Play, TheatreHall
+from theatre.schedule import find_conflicts
+from theatre.search import refresh_search_documents
+
+CSV_COLUMNS = (
+    "play_title",
+    "description",
+    "genres",
+    "actors",
+    "theatre_hall",
+    "rows",
+    "seats_in_row",
+    "show_time",
+)
+CSV_LIST_SEPARATOR = ";"
+
+
+def _split(value):
+    return [
+        item.strip()
+        for item in (value or "").split(CSV_LIST_SEPARATOR)
+        if item.strip()
+    ]
+
+
+def parse_season_csv(content):
+    """
+    Turn a CSV season file, one performance per line, into the JSON
+    season structure. Genres and actors are ``;``-separated names.
+    """
+    reader = csv.DictReader(io.StringIO(content))
+    missing = set(CSV_COLUMNS) - set(reader.fieldnames or ())
+    if missing:
+        raise ValidationError(
+            {"file": f"Missing CSV columns: {', '.join(sorted(missing))}."}
+        )
+
+    plays, halls, performances = {}, {}, []
+    for line in reader:
+        plays.setdefault(
+            line["play_title"],
+            {
+                "title": line["play_title"],
+                "description": line["description"],
+                "genres": _split(line["genres"]),
+                "actors": _split(line["actors"]),
+            },
+        )
+        halls.setdefault(
+            line["theatre_hall"],
+            {
+                "name": line["theatre_hall"],
+                "rows": line["rows"],
+                "seats_in_row": line["seats_in_row"],
+            },
+        )
+        performances.append(
+            {
+                "play": line["play_title"],
+                "theatre_hall": line["theatre_hall"],
+                "show_time": line["show_time"],
+            }
+        )
+    return {
+        "theatre_halls": list(halls.values()),
+        "plays": list(plays.values()),
+        "performances": performances,
+    }
+
+
+def parse_season(content, file_format):
+    if file_format == "csv":
+        return parse_season_csv(content)
+    try:
+        season = json.loads(content)
+    except ValueError as error:
+        raise ValidationError({"file": f"Invalid JSON: {error}."})
+    if not isinstance(season, dict):
+        raise ValidationError({"file": "Season must be a JSON object."})
+    return season
+
+
+class SeasonImporter:
+    """
+    Import genres, actors, theatre halls, plays and performances of a
+    season. Actors, genres, halls and plays are deduplicated by name
+    against the file and the database, references are resolved in memory
+    and every table is written with batched ``bulk_create`` calls inside
+    a single transaction.
+    """
+
+    def __init__(self, season, batch_size=1000):
+        self.season = season
+        self.batch_size = batch_size
+        self.timings = {}
+        self.created = {}
+        self.errors = []
+
+    @contextmanager
+    def _timed(self, stage):
+        start = time.perf_counter()
+        yield
+        self.timings[stage] = round((time.perf_counter() - start) * 1000, 2)
+
+    def _bulk_create(self, model, objects, **kwargs):
+        objects = list(objects)
+        model.objects.bulk_create(
+            objects, batch_size=self.batch_size, **kwargs
+        )
+        self.created[model._meta.model_name] = len(objects)
+        return objects
+
+    @staticmethod
+    def _play_names(play, field):
+        names = play.get(field, [])
+        if isinstance(names, list) and all(
+            isinstance(name, str) for name in names
+        ):
+            return names
+        return []
+
+    def _check_plays(self):
+        for index, play in enumerate(self.season.get("plays", [])):
+            for field in ("genres", "actors"):
+                names = play.get(field, [])
+                if names and not self._play_names(play, field):
+                    self.errors.append(
+                        f"Play {index}: {field} must be a list of names."
+                    )
+
+    def _genres(self):
+        names = set(self.season.get("genres", []))
+        for play in self.season.get("plays", []):
+            names.update(self._play_names(play, "genres"))
+        genres = {
+            genre.name: genre
+            for genre in Genre.objects.filter(name__in=names)
+        }
+        for genre in self._bulk_create(
+            Genre, (Genre(name=name) for name in names - genres.keys())
+        ):
+            genres[genre.name] = genre
+        return genres
+
+    def _actors(self):
+        names = {
+            (actor["first_name"], actor["last_name"])
+            for actor in self.season.get("actors", [])
+        }
+        for play in self.season.get("plays", []):
+            for full_name in self._play_names(play, "actors"):
+                first_name, _, last_name = full_name.partition(" ")
+                names.add((first_name, last_name))
+        actors = {}
+        for actor in Actor.objects.filter(
+            first_name__in={first for first, _ in names},
+            last_name__in={last for _, last in names},
+        ):
+            actors[(actor.first_name, actor.last_name)] = actor
+        for actor in self._bulk_create(
+            Actor,
+            (
+                Actor(first_name=first_name, last_name=last_name)
+                for first_name, last_name in names - actors.keys()
+            ),
+        ):
+            actors[(actor.first_name, actor.last_name)] = actor
+        return actors
+
+    def _halls(self):
+        rows = {
+            hall["name"]: hall
+            for hall in self.season.get("theatre_halls", [])
+        }
+        halls = {
+            hall.name: hall
+            for hall in TheatreHall.objects.filter(name__in=rows)
+        }
+        new_halls = {}
+        for name, hall in rows.items():
+            if name in halls:
+                continue
+            try:
+                hall_rows = int(hall["rows"])
+                seats_in_row = int(hall["seats_in_row"])
+            except (KeyError, TypeError, ValueError):
+                hall_rows = seats_in_row = 0
+            if hall_rows < 1 or seats_in_row < 1:
+                self.errors.append(
+                    f"Theatre hall {name!r}: rows and seats_in_row "
+                    f"must be positive integers."
+                )
+                continue
+            new_halls[name] = TheatreHall(
+                name=name, rows=hall_rows, seats_in_row=seats_in_row
+            )
+        for hall in self._bulk_create(TheatreHall, new_halls.values()):
+            halls[hall.name] = hall
+        return halls
+
+    def _plays(self, genres, actors):
+        rows = {play["title"]: play for play in self.season.get("plays", [])}
+        plays = {
+            play.title: play for play in Play.objects.filter(title__in=rows)
+        }
+        for play in self._bulk_create(
+            Play,
+            (
+                Play(
+                    title=title,
+                    description=row.get("description", ""),
+                )
+                for title, row in rows.items()
+                if title not in plays
+            ),
+        ):
+            plays[play.title] = play
+
+        play_genres = []
+        play_actors = []
+        for title, row in rows.items():
+            play_id = plays[title].id
+            play_genres.extend(
+                Play.genres.through(play_id=play_id, genre_id=genres[name].id)
+                for name in self._play_names(row, "genres")
+            )
+            for full_name in self._play_names(row, "actors"):
+                first_name, _, last_name = full_name.partition(" ")
+                play_actors.append(
+                    Play.actors.through(
+                        play_id=play_id,
+                        actor_id=actors[(first_name, last_name)].id,
+                    )
+                )
+        Play.genres.through.objects.bulk_create(
+            play_genres, batch_size=self.batch_size, ignore_conflicts=True
+        )
+        Play.actors.through.objects.bulk_create(
+            play_actors, batch_size=self.batch_size, ignore_conflicts=True
+        )
+        self.created["play_genres"] = len(play_genres)
+        self.created["play_actors"] = len(play_actors)
+        return plays
+
+    def _performances(self, plays, halls):
+        new_performances = []
+        for index, row in enumerate(self.season.get("performances", [])):
+            play = plays.get(row.get("play"))
+            hall = halls.get(row.get("theatre_hall"))
+            try:
+                show_time = parse_datetime(str(row.get("show_time", "")))
+            except ValueError:
+                # Well formatted, but not a real date or time.
+                show_time = None
+            if play is None or hall is None or show_time is None:
+                self.errors.append(
+                    f"Performance {index}: unknown play, unknown theatre "
+                    f"hall or invalid show_time."
+                )
+                continue
+            if timezone.is_naive(show_time):
+                show_time = timezone.make_aware(show_time)
+            new_performances.append(
+                Performance(
+                    play=play,
+                    theatre_hall=hall,
+                    show_time=show_time,
+                    end_time=show_time + play.duration,
+                )
+            )
+
+        scheduled = set(
+            Performance.objects.filter(
+                play__in=plays.values(), theatre_hall__in=halls.values()
+            ).values_list("play_id", "theatre_hall_id", "show_time")
+        )
+        unique_performances = []
+        for performance in new_performances:
+            key = (
+                performance.play_id,
+                performance.theatre_hall_id,
+                performance.show_time,
+            )
+            if key not in scheduled:
+                scheduled.add(key)
+                unique_performances.append(performance)
+        # Genres, actors, halls and plays are already written at this point
+        # and overlaps need the saved halls, so conflicts are only reported
+        # here: run() raises on any error inside its transaction, which
+        # rolls those rows back.
+        for conflict in find_conflicts(unique_performances):
+            performance = unique_performances[conflict["index"]]
+            self.errors.append(
+                f"Performance of {performance.play.title!r} at "
+                f"{performance.show_time.isoformat()} overlaps another "
+                f"performance in {performance.theatre_hall.name!r}."
+            )
+        if not self.errors:
+            self._bulk_create(Performance, unique_performances)
+
+    def run(self, dry_run=False):
+        """
+        Import the season and return a report with created row counts
+        and per-stage timings in milliseconds. Nothing is written when
+        ``dry_run`` is set or any row is invalid: stages write as they go
+        and report invalid rows in ``self.errors``, and raising on them
+        inside the transaction rolls back what earlier stages wrote.
+        """
+        start = time.perf_counter()
+        with transaction.atomic():
+            try:
+                self._check_plays()
+                with self._timed("genres"):
+                    genres = self._genres()
+                with self._timed("actors"):
+                    actors = self._actors()
+                with self._timed("theatre_halls"):
+                    halls = self._halls()
+                with self._timed("plays"):
+                    plays = self._plays(genres, actors)
+                with self._timed("performances"):
+                    self._performances(plays, halls)
+            except (KeyError, TypeError, AttributeError) as error:
+                raise ValidationError(
+                    {"file": f"Malformed season file: {error!r}."}
+                )
+
+            if self.errors:
+                # Also rolls back the rows written before the error was
+                # found, e.g. plays of a season with overlapping
+                # performances.
+                raise ValidationError({"errors": self.errors})
+
+            if dry_run:
+                transaction.set_rollback(True)
+            else:
+                with self._timed("search_documents"):
+                    refresh_search_documents(
+                        play.id for play in plays.values()
+                    )
+                transaction.on_commit(self._invalidate_cache)
+
+        self.timings["total"] = round((time.perf_counter() - start) * 1000, 2)
+        return {
+            "dry_run": dry_run,
+            "created": self.created,
+            "timings_ms": self.timings,
+        }
+
+    @staticmethod
+    def _invalidate_cache():
+        for model in (Genre, Actor, TheatreHall, Play):
+            invalidate_model(model)
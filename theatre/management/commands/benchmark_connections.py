@@ -0,0 +1,82 @@
+import statistics
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from theatre.benchmarks import percentile
+from theatre.cache import get_response_cache
+from theatre.metrics import registry
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure request latency of a cheap endpoint with a new database "
+        "connection per request and with the configured connection reuse "
+        "(persistent connections or pool)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="/api/theatre/genres/")
+        parser.add_argument("--repeat", type=int, default=200)
+
+    def measure(self, client, url, repeat):
+        latencies = []
+        opened = registry.connections_opened(DEFAULT_DB_ALIAS)
+        for _ in range(repeat):
+            # What a WSGI server does around every request.
+            close_old_connections()
+            get_response_cache().clear()
+            start = time.perf_counter()
+            client.get(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+            close_old_connections()
+        return (
+            statistics.median(latencies),
+            percentile(latencies, 95),
+            registry.connections_opened(DEFAULT_DB_ALIAS) - opened,
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[DEFAULT_DB_ALIAS]
+        settings_dict = connection.settings_dict
+        configured = {
+            "CONN_MAX_AGE": settings_dict["CONN_MAX_AGE"],
+            "OPTIONS": settings_dict["OPTIONS"],
+        }
+        no_reuse = {
+            "CONN_MAX_AGE": 0,
+            "OPTIONS": {
+                key: value
+                for key, value in settings_dict["OPTIONS"].items()
+                if key != "pool"
+            },
+        }
+
+        client = APIClient()
+        client.force_authenticate(
+            user=get_user_model()(email="benchmark@theatre.local")
+        )
+        with mock.patch.object(APIView, "check_throttles"), override_settings(
+            ALLOWED_HOSTS=["testserver"]
+        ):
+            for label, connection_settings in (
+                ("new connection per request", no_reuse),
+                ("configured reuse", configured),
+            ):
+                connection.close()
+                settings_dict.update(connection_settings)
+                p50, p95, opened = self.measure(
+                    client, options["url"], options["repeat"]
+                )
+                self.stdout.write(
+                    f"{label:<28} p50 {p50:8.2f} ms  p95 {p95:8.2f} ms  "
+                    f"{opened} connections opened"
+                )
+            connection.close()
+            settings_dict.update(configured)
@@ -0,0 +1,86 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from theatre.benchmarks import (
+    DEFAULT_VOLUMES,
+    discover_routes,
+    find_regressions,
+    measure,
+    seeded_client,
+    uncached_responses,
+)
+from theatre import urls
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed benchmark data in a rolled back transaction and measure query "
+        "counts, latency and memory of every theatre GET route"
+    )
+
+    def add_arguments(self, parser):
+        for volume, default in DEFAULT_VOLUMES.items():
+            parser.add_argument(
+                f"--{volume.replace('_', '-')}", type=int, default=default
+            )
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--baseline",
+            default=str(Path(settings.BASE_DIR) / "benchmark_baseline.json"),
+            help="Baseline file to compare with or to save to",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Store the results as the new baseline",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.25,
+            help="Allowed relative growth of p95 latency and memory",
+        )
+
+    def handle(self, *args, **options):
+        volumes = {volume: options[volume] for volume in DEFAULT_VOLUMES}
+
+        with seeded_client(volumes) as (client, user), uncached_responses():
+            results = {}
+            for name, url in discover_routes(urls, user):
+                results[name] = measure(client, url, options["repeat"])
+                self.stdout.write(
+                    "{name:<40} {status} {queries:>4} queries "
+                    "p50 {p50_ms:>9.2f} ms  p95 {p95_ms:>9.2f} ms  "
+                    "{memory_kib:>9.1f} KiB".format(
+                        name=name, **results[name]
+                    )
+                )
+
+        baseline_path = Path(options["baseline"])
+        if options["save_baseline"]:
+            baseline_path.write_text(json.dumps(results, indent=2) + "\n")
+            self.stdout.write(
+                self.style.SUCCESS(f"Saved baseline to {baseline_path}")
+            )
+            return
+
+        if not baseline_path.exists():
+            self.stdout.write(
+                f"No baseline at {baseline_path}, "
+                f"run with --save-baseline to create one"
+            )
+            return
+
+        regressions = find_regressions(
+            results,
+            json.loads(baseline_path.read_text()),
+            options["threshold"],
+        )
+        if regressions:
+            raise CommandError(
+                "Regressions found:\n" + "\n".join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS("No regressions found"))
@@ -0,0 +1,112 @@
+import statistics
+import time
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand, CommandError
+
+from theatre.benchmarks import (
+    API_PREFIX,
+    DEFAULT_VOLUMES,
+    filtered_plays_params,
+    measure,
+    seeded_client,
+    uncached_responses,
+)
+from theatre.filters import filter_plays
+from theatre.models import Play
+from theatre.views import PlayPagination
+
+
+def filter_query_ms(params, repeat):
+    """
+    Median time of the first page of filtered plays as the paginator
+    queries it, without the prefetches and serialization, which grow with
+    the page's genres and actors rather than with the through tables.
+    """
+    queryset = filter_plays(
+        Play.objects.order_by(*PlayPagination.ordering), params
+    )[: PlayPagination.page_size + 1]
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        list(queryset.all())
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the play list filtered by genre and actor while the genre "
+        "and actor through tables grow, and fail when its query count or "
+        "the time of its filter query grows with them"
+    )
+
+    def add_arguments(self, parser):
+        for volume, default in DEFAULT_VOLUMES.items():
+            if volume in ("genres_per_play", "actors_per_play"):
+                continue
+            parser.add_argument(
+                f"--{volume.replace('_', '-')}", type=int, default=default
+            )
+        parser.add_argument(
+            "--per-play",
+            type=int,
+            nargs="+",
+            default=[2, 8, 32],
+            help="Genres and actors per play of each run",
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.5,
+            help="Allowed relative growth of the filter query time over "
+            "the first run",
+        )
+
+    def handle(self, *args, **options):
+        results = []
+        for per_play in options["per_play"]:
+            volumes = {
+                volume: options[volume]
+                for volume in DEFAULT_VOLUMES
+                if volume in options
+            }
+            volumes.update(
+                genres=max(volumes["genres"], per_play),
+                actors=max(volumes["actors"], per_play),
+                genres_per_play=per_play,
+                actors_per_play=per_play,
+            )
+            with seeded_client(volumes) as (client, _), uncached_responses():
+                params = filtered_plays_params()
+                url = f"{API_PREFIX}plays/?{urlencode(params)}"
+                through_rows = (
+                    Play.genres.through.objects.count()
+                    + Play.actors.through.objects.count()
+                )
+                result = measure(client, url, options["repeat"])
+                result["filter_ms"] = filter_query_ms(
+                    params, options["repeat"]
+                )
+            results.append(result)
+            self.stdout.write(
+                f"{per_play:>4} per play  {through_rows:>9} through rows  "
+                f"{result['queries']:>3} queries  "
+                f"filter query {result['filter_ms']:>8.2f} ms "
+                f"(x{result['filter_ms'] / results[0]['filter_ms']:.2f})  "
+                f"request p50 {result['p50_ms']:>9.2f} ms  "
+                f"p95 {result['p95_ms']:>9.2f} ms"
+            )
+
+        first, last = results[0], results[-1]
+        if last["queries"] != first["queries"]:
+            raise CommandError(
+                "The filtered play list needs more queries with larger "
+                "through tables."
+            )
+        if last["filter_ms"] > first["filter_ms"] * (1 + options["threshold"]):
+            raise CommandError(
+                f"The filter query grew from {first['filter_ms']:.2f} ms to "
+                f"{last['filter_ms']:.2f} ms with larger through tables."
+            )
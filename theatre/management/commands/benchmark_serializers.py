@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from theatre.benchmarks import (
+    API_PREFIX,
+    DEFAULT_VOLUMES,
+    measure,
+    seeded_client,
+    uncached_responses,
+)
+from theatre.models import Reservation
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed benchmark data in a rolled back transaction and compare the "
+        "regular serializers with FAST_LIST_SERIALIZATION on the list "
+        "endpoints: latency, memory and whether responses are identical"
+    )
+
+    def add_arguments(self, parser):
+        for volume, default in DEFAULT_VOLUMES.items():
+            parser.add_argument(
+                f"--{volume.replace('_', '-')}", type=int, default=default
+            )
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--page-size", type=int, default=100)
+
+    def handle(self, *args, **options):
+        volumes = {volume: options[volume] for volume in DEFAULT_VOLUMES}
+        page = f"page_size={options['page_size']}"
+
+        mismatches = []
+        with seeded_client(volumes) as (client, user), uncached_responses():
+            reservation = Reservation.objects.filter(user=user).first()
+            urls = {
+                "performance-list": f"{API_PREFIX}performances/?{page}",
+                "play-list": f"{API_PREFIX}plays/?{page}",
+                "play-search": f"{API_PREFIX}plays/?{page}&search=play",
+                "reservation-detail": (
+                    f"{API_PREFIX}reservations/{reservation.id}/"
+                ),
+            }
+            for name, url in urls.items():
+                results, contents = {}, {}
+                for fast in (False, True):
+                    with override_settings(FAST_LIST_SERIALIZATION=fast):
+                        contents[fast] = client.get(url).content
+                        results[fast] = measure(
+                            client, url, options["repeat"]
+                        )
+                identical = contents[False] == contents[True]
+                if not identical:
+                    mismatches.append(name)
+                regular, fast = results[False], results[True]
+                self.stdout.write(
+                    f"{name:<20} regular p50 {regular['p50_ms']:>9.2f} ms  "
+                    f"fast p50 {fast['p50_ms']:>9.2f} ms  "
+                    f"x{regular['p50_ms'] / fast['p50_ms']:.1f}  "
+                    f"memory {regular['memory_kib']:>8.1f} -> "
+                    f"{fast['memory_kib']:>8.1f} KiB  "
+                    f"{'identical' if identical else 'DIFFERENT'}"
+                )
+
+        if mismatches:
+            raise CommandError(
+                "Fast responses differ for: " + ", ".join(mismatches)
+            )
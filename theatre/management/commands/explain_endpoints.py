@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from theatre.benchmarks import DEFAULT_VOLUMES, discover_routes, seeded_client
+from theatre.explain import explain
+from theatre import urls
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed benchmark data in a rolled back transaction, request every "
+        "theatre GET route and EXPLAIN ANALYZE the queries it runs, "
+        "reporting sequential scans"
+    )
+
+    def add_arguments(self, parser):
+        for volume, default in DEFAULT_VOLUMES.items():
+            parser.add_argument(
+                f"--{volume.replace('_', '-')}", type=int, default=default
+            )
+        parser.add_argument(
+            "--fail-on-seq-scan",
+            action="store_true",
+            help="Exit with an error when any sequential scan is found",
+        )
+
+    def handle(self, *args, **options):
+        volumes = {volume: options[volume] for volume in DEFAULT_VOLUMES}
+
+        seq_scan_count = 0
+        with seeded_client(volumes) as (client, user):
+            for name, url in discover_routes(urls, user):
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(url)
+                    if response.streaming:
+                        b"".join(response.streaming_content)
+
+                self.stdout.write(f"{name} ({url})")
+                for query in queries.captured_queries:
+                    sql = query["sql"]
+                    if not sql.lstrip().upper().startswith("SELECT"):
+                        continue
+                    try:
+                        seq_scans, duration = explain(sql)
+                    except NotImplementedError as error:
+                        raise CommandError(str(error))
+
+                    timing = (
+                        f"{duration:9.2f} ms" if duration is not None else ""
+                    )
+                    if seq_scans:
+                        seq_scan_count += len(seq_scans)
+                        self.stdout.write(
+                            self.style.WARNING(
+                                f"  {timing} seq scan on "
+                                f"{', '.join(seq_scans)}: {sql[:200]}"
+                            )
+                        )
+                    else:
+                        self.stdout.write(f"  {timing} {sql[:120]}")
+
+        if seq_scan_count and options["fail_on_seq_scan"]:
+            raise CommandError(f"{seq_scan_count} sequential scans found")
+        self.stdout.write(f"{seq_scan_count} sequential scans found")
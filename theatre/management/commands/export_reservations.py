@@ -0,0 +1,71 @@
+from argparse import ArgumentTypeError
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from theatre.export import EXPORT_FORMATS, export_rows, iter_export
+
+
+def _date(value):
+    try:
+        date = parse_date(value)
+    except ValueError:
+        date = None
+    if date is None:
+        raise ArgumentTypeError(f"{value!r} is not a YYYY-MM-DD date")
+    return date
+
+
+class Command(BaseCommand):
+    help = "Stream reservation tickets to a CSV or NDJSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            choices=list(EXPORT_FORMATS),
+            default="csv",
+            dest="export_format",
+        )
+        parser.add_argument(
+            "--from", type=_date, dest="date_from",
+            help="First reservation date, YYYY-MM-DD",
+        )
+        parser.add_argument(
+            "--to", type=_date, dest="date_to",
+            help="Last reservation date, YYYY-MM-DD",
+        )
+        parser.add_argument(
+            "--performance",
+            type=int,
+            action="append",
+            dest="performance_ids",
+            help="Only export tickets of the given performance (repeatable)",
+        )
+        parser.add_argument(
+            "--output", help="File to write to, standard output by default"
+        )
+
+    def handle(self, *args, **options):
+        rows = export_rows(
+            date_from=options["date_from"],
+            date_to=options["date_to"],
+            performance_ids=options["performance_ids"],
+        )
+        chunks = iter_export(options["export_format"], rows)
+
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        try:
+            with open(
+                options["output"], "w", newline="", encoding="utf-8"
+            ) as output:
+                for chunk in chunks:
+                    output.write(chunk)
+        except OSError as error:
+            raise CommandError(error)
+        self.stderr.write(
+            self.style.SUCCESS(f"Exported reservations to {options['output']}")
+        )
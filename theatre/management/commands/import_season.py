@@ -0,0 +1,49 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from theatre.importer import SeasonImporter, parse_season
+
+
+class Command(BaseCommand):
+    help = (
+        "Import genres, actors, theatre halls, plays and performances "
+        "from a JSON or CSV season file"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to a .json or .csv file")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate and time the import, then roll it back",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        try:
+            content = path.read_text(encoding="utf-8")
+        except OSError as error:
+            raise CommandError(error)
+
+        file_format = "csv" if path.suffix.lower() == ".csv" else "json"
+        try:
+            report = SeasonImporter(
+                parse_season(content, file_format),
+                batch_size=options["batch_size"],
+            ).run(dry_run=options["dry_run"])
+        except ValidationError as error:
+            raise CommandError(error.detail)
+
+        for model_name, count in report["created"].items():
+            self.stdout.write(f"{model_name}: {count} created")
+        for stage, duration in report["timings_ms"].items():
+            self.stdout.write(f"{stage}: {duration} ms")
+        if report["dry_run"]:
+            self.stdout.write(
+                self.style.SUCCESS("Dry run finished, nothing was saved")
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("Season imported"))
@@ -0,0 +1,81 @@
+import statistics
+import time
+from collections import Counter
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from theatre.benchmarks import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent GET requests at running servers and report "
+        "throughput and latency, e.g. to compare WSGI and ASGI workers"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("urls", nargs="+")
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--token", help="JWT access token")
+        parser.add_argument("--timeout", type=float, default=30)
+
+    def handle(self, *args, **options):
+        headers = {}
+        if options["token"]:
+            headers["Authorization"] = f"Bearer {options['token']}"
+
+        def fetch(url):
+            request = urllib.request.Request(url, headers=headers)
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(
+                    request, timeout=options["timeout"]
+                ) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as error:
+                status = error.code
+            except (urllib.error.URLError, OSError):
+                status = None
+            return status, (time.perf_counter() - start) * 1000
+
+        failed = 0
+        for url in options["urls"]:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(options["concurrency"]) as executor:
+                results = list(
+                    executor.map(fetch, [url] * options["requests"])
+                )
+            elapsed = time.perf_counter() - start
+
+            latencies = [
+                latency for status, latency in results if status == 200
+            ]
+            errors = Counter(
+                "no response" if status is None else f"HTTP {status}"
+                for status, _ in results
+                if status != 200
+            )
+            failed += sum(errors.values())
+            summary = ", ".join(
+                f"{count} {error}" for error, count in errors.most_common()
+            )
+            if not latencies:
+                self.stdout.write(f"{url}: all requests failed ({summary})")
+                continue
+            self.stdout.write(
+                f"{url}\n"
+                f"  {len(latencies) / elapsed:9.1f} req/s  "
+                f"p50 {statistics.median(latencies):8.2f} ms  "
+                f"p95 {percentile(latencies, 95):8.2f} ms  "
+                f"{summary or '0 errors'}"
+            )
+
+        # Throttled or failed requests skew throughput and latency, so
+        # the run does not count as a measurement.
+        if failed:
+            raise CommandError(f"{failed} requests did not return 200.")
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from theatre.models import Play
+from theatre.search import refresh_search_documents
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search documents of all plays"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        play_ids = list(
+            Play.objects.order_by("pk").values_list("pk", flat=True)
+        )
+        batch_size = options["batch_size"]
+        for start in range(0, len(play_ids), batch_size):
+            refresh_search_documents(play_ids[start:start + batch_size])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt search documents of {len(play_ids)} plays"
+            )
+        )
@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from theatre.models import Performance
+from theatre.seat_map import lock_performances, rebuild_seat_map, save_seat_map
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute performance seat maps and sold tickets counters "
+        "from ticket rows and fix any drift"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--performance",
+            type=int,
+            action="append",
+            dest="performances",
+            help="Only reconcile the given performance id (repeatable)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drift without writing any changes",
+        )
+
+    def handle(self, *args, **options):
+        performance_ids = Performance.objects.order_by("pk").values_list(
+            "pk", flat=True
+        )
+        if options["performances"]:
+            performance_ids = performance_ids.filter(
+                pk__in=options["performances"]
+            )
+
+        checked = drifted = 0
+        for performance_id in list(performance_ids):
+            with transaction.atomic():
+                performance = lock_performances([performance_id]).get(
+                    performance_id
+                )
+                if performance is None:
+                    continue
+                checked += 1
+                seat_map = rebuild_seat_map(performance)
+                if (
+                    seat_map.to_bytes() == bytes(performance.seat_map)
+                    and seat_map.taken_count == performance.tickets_sold
+                ):
+                    continue
+
+                drifted += 1
+                self.stdout.write(
+                    f"Performance {performance_id}: stored "
+                    f"{performance.tickets_sold} sold, "
+                    f"actual {seat_map.taken_count}"
+                )
+                if not options["dry_run"]:
+                    save_seat_map(performance, seat_map)
+
+        action = "Found" if options["dry_run"] else "Fixed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {checked} performances. "
+                f"{action} {drifted} with drift."
+            )
+        )
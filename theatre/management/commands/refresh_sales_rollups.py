@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from theatre.analytics import refresh_sales_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Add tickets of reservations created since the last run to the "
+        "sales rollups served by the analytics endpoints"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rebuild the rollups from all reservations, which also "
+            "drops cancelled tickets",
+        )
+
+    def handle(self, *args, **options):
+        result = refresh_sales_rollups(full=options["full"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result['created']} and updated "
+                f"{result['updated']} rollup rows, complete up to "
+                f"{result['watermark'].isoformat()}"
+            )
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from theatre.holds import release_expired_holds
+
+
+class Command(BaseCommand):
+    help = "Delete expired seat holds so their seats become available"
+
+    def handle(self, *args, **options):
+        released = release_expired_holds()
+        self.stdout.write(
+            self.style.SUCCESS(f"Released {released} expired seat holds")
+        )
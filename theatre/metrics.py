@@ -0,0 +1,112 @@
+import math
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from django.db import connections
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, math.inf)
+
+
+class _ViewMetrics:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.db_ms = 0.0
+        self.serializer_ms = 0.0
+        self.render_ms = 0.0
+        self.queries = 0
+        self.response_bytes = 0
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS_MS)
+
+    def observe(
+        self,
+        total_ms,
+        db_ms,
+        serializer_ms,
+        render_ms,
+        queries,
+        response_bytes,
+    ):
+        self.count += 1
+        self.total_ms += total_ms
+        self.db_ms += db_ms
+        self.serializer_ms += serializer_ms
+        self.render_ms += render_ms
+        self.queries += queries
+        self.response_bytes += response_bytes or 0
+        self.latency_buckets[bisect_left(LATENCY_BUCKETS_MS, total_ms)] += 1
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "avg_total_ms": round(self.total_ms / self.count, 3),
+            "avg_db_ms": round(self.db_ms / self.count, 3),
+            "avg_serializer_ms": round(self.serializer_ms / self.count, 3),
+            "avg_render_ms": round(self.render_ms / self.count, 3),
+            "avg_queries": round(self.queries / self.count, 2),
+            "avg_response_bytes": round(self.response_bytes / self.count),
+            "latency_ms_histogram": {
+                ("+Inf" if bound == math.inf else str(bound)): count
+                for bound, count in zip(
+                    LATENCY_BUCKETS_MS, self.latency_buckets
+                )
+            },
+        }
+
+
+class MetricsRegistry:
+    """
+    Per-process histograms of sampled requests, keyed by viewset action
+    (``PlayViewSet.list``) or URL name for plain views.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = defaultdict(_ViewMetrics)
+        self._connections_opened = Counter()
+
+    def observe(self, view, **values):
+        with self._lock:
+            self._views[view].observe(**values)
+
+    def connection_opened(self, alias):
+        with self._lock:
+            self._connections_opened[alias] += 1
+
+    def connections_opened(self, alias):
+        with self._lock:
+            return self._connections_opened[alias]
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                view: metrics.as_dict()
+                for view, metrics in sorted(self._views.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+            self._connections_opened.clear()
+
+
+registry = MetricsRegistry()
+
+
+def database_stats():
+    """
+    Connection reuse settings of every database, the connections Django
+    opened (pool checkouts when pooling) and psycopg pool statistics.
+    """
+    stats = {}
+    for alias in connections:
+        connection = connections[alias]
+        pool = getattr(connection, "pool", None)
+        stats[alias] = {
+            "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+            "health_checks": connection.settings_dict["CONN_HEALTH_CHECKS"],
+            "connections_opened": registry.connections_opened(alias),
+            "pool": pool.get_stats() if pool is not None else None,
+        }
+    return stats
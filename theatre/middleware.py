@@ -0,0 +1,251 @@
+import json
+import logging
+import random
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+from theatre.metrics import registry
+from theatre.replicas import pin_to_primary
+
+logger = logging.getLogger("theatre.metrics")
+
+_query_timer = ContextVar("theatre_query_timer", default=None)
+
+
+class _QueryTimer:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.serializer_duration = 0.0
+
+
+def _time_query(execute, sql, params, many, context):
+    timer = _query_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.duration += time.perf_counter() - start
+        timer.count += 1
+
+
+def time_serialization(to_representation):
+    """
+    Wrap ``to_representation`` so that the time it takes is reported as
+    serializer time of a sampled request.
+    """
+
+    @wraps(to_representation)
+    def timed(*args, **kwargs):
+        timer = _query_timer.get()
+        if timer is None:
+            return to_representation(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return to_representation(*args, **kwargs)
+        finally:
+            timer.serializer_duration += time.perf_counter() - start
+
+    return timed
+
+
+class SerializerTimingMixin:
+    """
+    Report the time the view's serializers take to build response data
+    (``serializer.data``), nested serializers included, as serializer time.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        serializer.to_representation = time_serialization(
+            serializer.to_representation
+        )
+        return serializer
+
+
+def _install_query_timer():
+    # Connections are per thread and the async ORM runs its queries in a
+    # worker thread, so the wrapper is installed on the connections of
+    # the current thread and finds the request's timer via a context
+    # variable, which sync_to_async carries across.
+    for connection in connections.all():
+        if _time_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(_time_query)
+
+
+def _view_name(request):
+    match = request.resolver_match
+    if match is None:
+        return "unresolved"
+    view_class = getattr(match.func, "cls", None) or getattr(
+        match.func, "view_class", None
+    )
+    actions = getattr(match.func, "actions", None)
+    if view_class is not None and actions:
+        action = actions.get(request.method.lower(), request.method.lower())
+        return f"{view_class.__name__}.{action}"
+    if view_class is not None:
+        return f"{view_class.__name__}.{request.method.lower()}"
+    return match.view_name
+
+
+class RequestMetricsMiddleware:
+    """
+    Record query count, database time, serializer time (of views using
+    ``SerializerTimingMixin``), renderer time and response size of a
+    sample of requests (``REQUEST_METRICS_SAMPLE_RATE``). Sampled responses
+    get a ``Server-Timing`` header, a structured log line is written and
+    the numbers are aggregated per view in ``theatre.metrics.registry``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= settings.REQUEST_METRICS_SAMPLE_RATE:
+            return self.get_response(request)
+
+        _install_query_timer()
+        timer = _QueryTimer()
+        token = _query_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _query_timer.reset(token)
+        return self._record(request, response, timer, start)
+
+    async def __acall__(self, request):
+        if random.random() >= settings.REQUEST_METRICS_SAMPLE_RATE:
+            return await self.get_response(request)
+
+        await sync_to_async(_install_query_timer)()
+        timer = _QueryTimer()
+        token = _query_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _query_timer.reset(token)
+        return self._record(request, response, timer, start)
+
+    def _record(self, request, response, timer, start):
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = timer.duration * 1000
+        serializer_ms = timer.serializer_duration * 1000
+
+        render_ms = 0.0
+        if hasattr(request, "_metrics_render_start"):
+            render_ms = (
+                request._metrics_render_end - request._metrics_render_start
+            ) * 1000
+        response_bytes = (
+            None if response.streaming else len(response.content)
+        )
+        view = _view_name(request)
+
+        response["Server-Timing"] = (
+            f'db;dur={db_ms:.2f};desc="{timer.count} queries", '
+            f"serializer;dur={serializer_ms:.2f}, "
+            f"render;dur={render_ms:.2f}, total;dur={total_ms:.2f}"
+        )
+        registry.observe(
+            view,
+            total_ms=total_ms,
+            db_ms=db_ms,
+            serializer_ms=serializer_ms,
+            render_ms=render_ms,
+            queries=timer.count,
+            response_bytes=response_bytes,
+        )
+        logger.info(
+            json.dumps(
+                {
+                    "view": view,
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "queries": timer.count,
+                    "db_ms": round(db_ms, 2),
+                    "serializer_ms": round(serializer_ms, 2),
+                    "render_ms": round(render_ms, 2),
+                    "total_ms": round(total_ms, 2),
+                    "response_bytes": response_bytes,
+                }
+            )
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; time the
+        # renderer. Serializers already ran inside the view.
+        request._metrics_render_start = time.perf_counter()
+
+        def render_finished(rendered):
+            request._metrics_render_end = time.perf_counter()
+
+        response.add_post_render_callback(render_finished)
+        return response
+
+
+class PrimaryAfterWriteMiddleware:
+    """
+    Pin the reads of a user to the primary database for
+    ``READ_REPLICA_PIN_SECONDS`` after a successful write request, so
+    replication lag never hides their own changes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self._is_write(request, response):
+            self._pin(request)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self._is_write(request, response):
+            await sync_to_async(self._pin)(request)
+        return response
+
+    @staticmethod
+    def _is_write(request, response):
+        return (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+        )
+
+    @staticmethod
+    def _pin(request):
+        # DRF sets the token-authenticated user on the Django request.
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user)
@@ -1,6 +1,9 @@
+from datetime import timedelta
+
 from django.conf import settings
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 
 
@@ -19,14 +22,41 @@ class TheatreHall(models.Model):
         return self.name
 
 
+class PlayQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        if "duration" not in kwargs:
+            return super().update(**kwargs)
+
+        # Play.save() is covered by a pre_save signal, bulk updates move
+        # the performances' end times here.
+        from theatre.schedule import change_play_duration
+
+        with transaction.atomic(using=self.db):
+            play_ids = list(self.values_list("id", flat=True))
+            updated = super().update(**kwargs)
+            for play in Play.objects.filter(pk__in=play_ids).only(
+                "id", "duration"
+            ):
+                change_play_duration(play, play.duration)
+        return updated
+
+
 class Play(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
     actors = models.ManyToManyField("Actor", blank=True)
     genres = models.ManyToManyField("Genre", blank=True)
+    duration = models.DurationField(default=timedelta(hours=2))
+    search_document = models.TextField(blank=True, editable=False)
+
+    objects = PlayQuerySet.as_manager()
 
     class Meta:
         ordering = ["title"]
+        indexes = [
+            # The play list's cursor order.
+            models.Index(fields=["title", "id"], name="play_title_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -59,10 +89,40 @@ class Performance(models.Model):
         TheatreHall, on_delete=models.CASCADE, related_name="performances"
     )
     show_time = models.DateTimeField()
+    # show_time plus the play's duration, kept for the hall overlap checks.
+    # Rows created before it existed are filled in after ``migrate``.
+    end_time = models.DateTimeField(null=True, editable=False)
+    seat_map = models.BinaryField(default=bytes, editable=False)
+    tickets_sold = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # Date filter (a show_time range) and the list's cursor order.
+            models.Index(
+                fields=["show_time", "id"], name="performance_show_time_idx"
+            ),
+            models.Index(
+                fields=["play", "show_time"], name="performance_play_time_idx"
+            ),
+            models.Index(
+                fields=["theatre_hall", "show_time"],
+                name="performance_hall_time_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.play.title} - {self.show_time}"
 
+    def save(self, *args, **kwargs):
+        show_time = self._meta.get_field("show_time").to_python(
+            self.show_time
+        )
+        self.end_time = show_time + self.play.duration
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "end_time"}
+        super().save(*args, **kwargs)
+
 
 class Reservation(models.Model):
     user = models.ForeignKey(
@@ -72,10 +132,61 @@ class Reservation(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # A user's reservations in the list's cursor order.
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="reservation_user_created_idx",
+            ),
+            # Incremental refresh of the sales rollups.
+            models.Index(
+                fields=["created_at"], name="reservation_created_idx"
+            ),
+        ]
+
     def __str__(self):
         return str(self.created_at)
 
 
+class SeatHold(models.Model):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="seat_holds",
+    )
+    performance = models.ForeignKey(
+        Performance, on_delete=models.CASCADE, related_name="seat_holds"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+    def __str__(self):
+        return f"Hold {self.id} until {self.expires_at}"
+
+
+class HeldSeat(models.Model):
+    hold = models.ForeignKey(
+        SeatHold, on_delete=models.CASCADE, related_name="seats"
+    )
+    performance = models.ForeignKey(
+        Performance, on_delete=models.CASCADE, related_name="held_seats"
+    )
+    row = models.PositiveIntegerField(validators=[MinValueValidator(1)])
+    seat = models.PositiveIntegerField(validators=[MinValueValidator(1)])
+
+    class Meta:
+        unique_together = ("performance", "row", "seat")
+        ordering = ["row", "seat"]
+
+    def __str__(self):
+        return f"Held seat: Row {self.row}, Seat {self.seat}"
+
+
 class Ticket(models.Model):
     row = models.PositiveIntegerField(validators=[MinValueValidator(1)])
     seat = models.PositiveIntegerField(validators=[MinValueValidator(1)])
@@ -130,3 +241,43 @@ class Ticket(models.Model):
 
     def __str__(self):
         return f"Ticket {self.id}: Row {self.row}, Seat {self.seat}"
+
+
+class SalesRollup(models.Model):
+    """
+    Tickets sold per sale day and performance, maintained by the
+    ``refresh_sales_rollups`` command for the analytics endpoints.
+    """
+
+    day = models.DateField()
+    performance = models.ForeignKey(
+        Performance, on_delete=models.CASCADE, related_name="sales_rollups"
+    )
+    play = models.ForeignKey(
+        Play, on_delete=models.CASCADE, related_name="sales_rollups"
+    )
+    theatre_hall = models.ForeignKey(
+        TheatreHall, on_delete=models.CASCADE, related_name="sales_rollups"
+    )
+    tickets = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "performance"],
+                name="sales_rollup_day_performance_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day}: {self.tickets} tickets for {self.performance_id}"
+
+
+class RollupWatermark(models.Model):
+    """Reservations created up to ``created_at`` are in rollup ``name``."""
+
+    name = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(null=True)
+
+    def __str__(self):
+        return f"{self.name} up to {self.created_at}"
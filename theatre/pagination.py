@@ -0,0 +1,105 @@
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+
+def _reversed(ordering):
+    return tuple(
+        field[1:] if field.startswith("-") else f"-{field}"
+        for field in ordering
+    )
+
+
+def _after(ordering, values):
+    """
+    Keyset condition selecting the rows after ``values`` in ``ordering``,
+    e.g. ``show_time >= t AND (show_time > t OR (show_time = t AND
+    id > i))``. The leading range lets an index on the ordering start at
+    the position instead of filtering every row.
+    """
+    fields = [field.lstrip("-") for field in ordering]
+    condition = Q()
+    for index, (order, field) in enumerate(zip(ordering, fields)):
+        lookup = "lt" if order.startswith("-") else "gt"
+        condition |= Q(
+            **{f"{field}__{lookup}": values[index]},
+            **dict(zip(fields[:index], values[:index])),
+        )
+    lookup = "lte" if ordering[0].startswith("-") else "gte"
+    return Q(**{f"{fields[0]}__{lookup}": values[0]}) & condition
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination over every field of the ordering, which must end
+    with a unique field. DRF's cursor keeps the first field's value plus
+    an offset into the rows sharing it, so pages within ties skip rows
+    with OFFSET; here the cursor keeps the values of all fields and every
+    page starts with a keyset condition on them.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = None if self.cursor is None else self.cursor.position
+
+        ordering = _reversed(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(
+                _after(ordering, self._decode_position(position))
+            )
+
+        # One extra row tells whether a page follows.
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        following = (
+            self._get_position_from_instance(results[-1], self.ordering)
+            if len(results) > self.page_size
+            else None
+        )
+        if reverse:
+            self.page.reverse()
+            self.next_position, self.previous_position = position, following
+        else:
+            self.next_position, self.previous_position = following, position
+        self.has_next = self.next_position is not None
+        self.has_previous = self.previous_position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def _decode_position(self, position):
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not (
+            isinstance(values, list)
+            and len(values) == len(self.ordering)
+            and all(isinstance(value, str) for value in values)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            field = field.lstrip("-")
+            value = (
+                instance[field]
+                if isinstance(instance, dict)
+                else getattr(instance, field)
+            )
+            values.append(str(value))
+        return json.dumps(values)
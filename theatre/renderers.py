@@ -0,0 +1,38 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Render compact JSON with ``orjson`` when it is installed, byte for byte
+    like ``JSONRenderer`` for the strings, integers and nulls of list
+    payloads. Indented output, data ``orjson`` rejects (e.g. integers
+    beyond 64 bits) and a missing ``orjson`` fall back to ``JSONRenderer``.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            content = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Like JSONRenderer: the separators are valid JSON but not valid
+        # JavaScript.
+        return content.replace(
+            "\u2028".encode(), b"\\u2028"
+        ).replace("\u2029".encode(), b"\\u2029")
@@ -0,0 +1,40 @@
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+from theater_api.db_routers import replica_reads
+
+
+def _pin_key(user):
+    return f"theatre:primary-pin:{user.pk}"
+
+
+def pin_to_primary(user):
+    """Keep the reads of ``user`` on the primary for a while after a write."""
+    cache.set(_pin_key(user), True, timeout=settings.READ_REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user):
+    return user.is_authenticated and cache.get(_pin_key(user), False)
+
+
+class ReadReplicaMixin:
+    """
+    Serve safe-method requests of a viewset from a read replica, unless
+    the user wrote something within ``READ_REPLICA_PIN_SECONDS``.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        # Unhandled exceptions skip finalize_response, so the routing
+        # state is scoped to the whole dispatch.
+        with ExitStack() as self._replica_reads:
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not is_pinned_to_primary(
+            request.user
+        ):
+            self._replica_reads.enter_context(replica_reads())
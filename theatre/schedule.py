@@ -0,0 +1,304 @@
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import groupby
+from operator import itemgetter
+
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    IntegrityError,
+    connections,
+    transaction,
+)
+from django.db.models import (
+    Count,
+    DurationField,
+    F,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from theatre.filters import filter_performances, parse_date_param
+from theatre.models import Performance, Play, TheatreHall
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_DEFAULT_DAYS = 31
+CALENDAR_MAX_DAYS = 92
+
+SCHEDULE_CONSTRAINT = "performance_hall_no_overlap"
+
+SCHEDULE_CONSTRAINT_SQL = (
+    f"ALTER TABLE theatre_performance ADD CONSTRAINT {SCHEDULE_CONSTRAINT} "
+    "EXCLUDE USING gist "
+    "(theatre_hall_id WITH =, tstzrange(show_time, end_time) WITH &&) "
+    "WHERE (end_time IS NOT NULL)"
+)
+
+
+def _calendar_params(query_params):
+    """
+    Default the calendar to a month from today and bound its length, so
+    that a request never aggregates an open-ended schedule.
+    """
+    params = query_params.copy()
+    params.pop("date", None)
+    start = (
+        parse_date_param(params["from"], "from")
+        if params.get("from")
+        else timezone.localdate()
+    )
+    end = (
+        parse_date_param(params["to"], "to")
+        if params.get("to")
+        else start + timedelta(days=CALENDAR_DEFAULT_DAYS - 1)
+    )
+    if (end - start).days >= CALENDAR_MAX_DAYS:
+        raise ValidationError(
+            {"to": f"The calendar spans at most {CALENDAR_MAX_DAYS} days."}
+        )
+    params["from"], params["to"] = start.isoformat(), end.isoformat()
+    return params
+
+
+def performance_calendar(query_params):
+    """
+    Aggregate the filtered performances per day and theatre hall with one
+    grouped query: number of performances, seats sold, capacity and
+    occupancy. Days without performances are left out.
+    """
+    rows = (
+        filter_performances(
+            Performance.objects.all(), _calendar_params(query_params)
+        )
+        .annotate(date=TruncDate("show_time"))
+        .values("date", "theatre_hall", "theatre_hall__name")
+        .annotate(
+            performances=Count("id"),
+            seats_sold=Sum("tickets_sold"),
+            capacity=Sum(
+                F("theatre_hall__rows") * F("theatre_hall__seats_in_row")
+            ),
+        )
+        .order_by("date", "theatre_hall")
+    )
+    return [
+        {
+            "date": date,
+            "halls": [
+                {
+                    "theatre_hall": row["theatre_hall"],
+                    "theatre_hall_name": row["theatre_hall__name"],
+                    "performances": row["performances"],
+                    "seats_sold": row["seats_sold"],
+                    "capacity": row["capacity"],
+                    "occupancy": (
+                        round(row["seats_sold"] / row["capacity"], 4)
+                        if row["capacity"]
+                        else 0.0
+                    ),
+                }
+                for row in day_rows
+            ],
+        }
+        for date, day_rows in groupby(rows, key=itemgetter("date"))
+    ]
+
+
+def find_conflicts(performances):
+    """
+    Check proposed performances against each other and the stored
+    schedule in one pass. Stored performances overlapping the proposals'
+    time span are loaded with one query, then the intervals of every hall
+    are sorted and swept, each compared with the one ending last so far.
+
+    ``performances`` are ``Performance`` instances with ``theatre_hall_id``,
+    ``show_time`` and ``end_time`` set; those with a primary key replace
+    their stored row. Return a conflict per overlapping proposal, as
+    ``{"index": i, "conflicts_with": {"index": j}}`` for another proposal
+    or ``{"index": i, "conflicts_with": {"performance": id}}``, at most one
+    per proposal.
+    """
+    by_hall = defaultdict(list)
+    for index, performance in enumerate(performances):
+        by_hall[performance.theatre_hall_id].append(
+            (performance.show_time, performance.end_time, {"index": index})
+        )
+    if not by_hall:
+        return []
+
+    stored = (
+        Performance.objects.filter(
+            theatre_hall_id__in=by_hall.keys(),
+            show_time__lt=max(p.end_time for p in performances),
+            end_time__gt=min(p.show_time for p in performances),
+        )
+        .exclude(pk__in=[p.pk for p in performances if p.pk is not None])
+        .values_list("id", "theatre_hall_id", "show_time", "end_time")
+    )
+    for performance_id, hall_id, show_time, end_time in stored:
+        by_hall[hall_id].append(
+            (show_time, end_time, {"performance": performance_id})
+        )
+
+    # A proposal can overlap several intervals, report its first conflict.
+    conflicts = {}
+    for intervals in by_hall.values():
+        intervals.sort(key=itemgetter(0, 1))
+        latest = None
+        for interval in intervals:
+            if latest is not None and interval[0] < latest[1]:
+                if "index" in interval[2]:
+                    conflicts.setdefault(
+                        interval[2]["index"],
+                        {**interval[2], "conflicts_with": latest[2]},
+                    )
+                elif "index" in latest[2]:
+                    conflicts.setdefault(
+                        latest[2]["index"],
+                        {**latest[2], "conflicts_with": interval[2]},
+                    )
+            if latest is None or interval[1] > latest[1]:
+                latest = interval
+    return [conflicts[index] for index in sorted(conflicts)]
+
+
+def validate_schedule(proposals):
+    """
+    Validate proposed performances (``play``, ``theatre_hall`` ids and
+    ``show_time`` mappings) without saving them. Plays and halls are
+    loaded with one query each, overlaps are found by ``find_conflicts``.
+    """
+    plays = Play.objects.only("id", "duration").in_bulk(
+        {proposal["play"] for proposal in proposals}
+    )
+    halls = TheatreHall.objects.only("id").in_bulk(
+        {proposal["theatre_hall"] for proposal in proposals}
+    )
+
+    errors = []
+    performances = []
+    indexes = []
+    for index, proposal in enumerate(proposals):
+        play = plays.get(proposal["play"])
+        if play is None or proposal["theatre_hall"] not in halls:
+            errors.append(
+                {"index": index, "error": "Unknown play or theatre hall."}
+            )
+            continue
+        performances.append(
+            Performance(
+                play_id=play.id,
+                theatre_hall_id=proposal["theatre_hall"],
+                show_time=proposal["show_time"],
+                end_time=proposal["show_time"] + play.duration,
+            )
+        )
+        indexes.append(index)
+
+    conflicts = []
+    for conflict in find_conflicts(performances):
+        other = conflict["conflicts_with"]
+        if "index" in other:
+            other = {"index": indexes[other["index"]]}
+        conflicts.append(
+            {"index": indexes[conflict["index"]], "conflicts_with": other}
+        )
+    return {
+        "valid": not errors and not conflicts,
+        "performances": len(proposals),
+        "conflicts": conflicts,
+        "errors": errors,
+    }
+
+
+def play_duration_errors(play, duration):
+    """
+    Describe the overlaps that changing a play's duration to ``duration``
+    would cause among its performances, without saving anything.
+    """
+    performances = list(
+        play.performances.only("id", "theatre_hall_id", "show_time")
+    )
+    for performance in performances:
+        performance.end_time = performance.show_time + duration
+    errors = []
+    for conflict in find_conflicts(performances):
+        other = conflict["conflicts_with"]
+        other_id = other.get("performance") or performances[other["index"]].id
+        errors.append(
+            f"Performance {performances[conflict['index']].id} would "
+            f"overlap with performance {other_id}."
+        )
+    return errors
+
+
+def change_play_duration(play, duration):
+    """
+    Move the end times of a play's performances to a new duration,
+    refusing changes that would make any of them overlap.
+    """
+    errors = play_duration_errors(play, duration)
+    if errors:
+        raise ValidationError({"duration": errors})
+    play.performances.update(end_time=F("show_time") + Value(duration))
+
+
+@contextmanager
+def schedule_constraint_errors():
+    """
+    Report performances rejected by the PostgreSQL exclusion constraint,
+    e.g. after a race between two overlapping writes, as a validation
+    error.
+    """
+    try:
+        with transaction.atomic():
+            yield
+    except IntegrityError as error:
+        if SCHEDULE_CONSTRAINT not in str(error):
+            raise
+        raise ValidationError(
+            {"show_time": "The theatre hall is booked at this time."}
+        )
+
+
+def create_schedule_constraint(using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Fill in missing performance end times and, on PostgreSQL, add the
+    exclusion constraint that keeps performances of a hall from
+    overlapping (requires the ``btree_gist`` extension). Other backends
+    rely on ``find_conflicts`` in the API.
+    """
+    Performance.objects.using(using).filter(end_time=None).update(
+        end_time=F("show_time")
+        + Subquery(
+            Play.objects.filter(pk=OuterRef("play_id")).values("duration"),
+            output_field=DurationField(),
+        )
+    )
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_constraint WHERE conname = %s",
+            [SCHEDULE_CONSTRAINT],
+        )
+        if cursor.fetchone() is not None:
+            return
+        try:
+            with transaction.atomic(using=using):
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+                cursor.execute(SCHEDULE_CONSTRAINT_SQL)
+        except IntegrityError:
+            logger.warning(
+                "Performances of a theatre hall overlap, %s was not "
+                "created. Reschedule them and run migrate again.",
+                SCHEDULE_CONSTRAINT,
+            )
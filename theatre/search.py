@@ -0,0 +1,125 @@
+import re
+from collections import defaultdict
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import Case, FloatField, Q, Value, When
+
+from theatre.models import Play
+
+SEARCH_CONFIG = "english"
+
+SEARCH_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS theatre_play_search_document_gin "
+    "ON theatre_play USING gin "
+    "(to_tsvector('english'::regconfig, COALESCE(search_document, '')))"
+)
+
+TITLE_WEIGHT = 2.0
+
+
+def build_search_document(title, description, actors, genres):
+    return " ".join([title, description, *actors, *genres])
+
+
+def refresh_search_documents(play_ids):
+    """Rebuild ``Play.search_document`` for the given plays in bulk."""
+    play_ids = list(play_ids)
+    if not play_ids:
+        return
+    actors = defaultdict(list)
+    for play_id, first_name, last_name in Play.actors.through.objects.filter(
+        play_id__in=play_ids
+    ).values_list("play_id", "actor__first_name", "actor__last_name"):
+        actors[play_id].append(f"{first_name} {last_name}")
+    genres = defaultdict(list)
+    for play_id, name in Play.genres.through.objects.filter(
+        play_id__in=play_ids
+    ).values_list("play_id", "genre__name"):
+        genres[play_id].append(name)
+
+    plays = Play.objects.filter(pk__in=play_ids).only(
+        "id", "title", "description"
+    )
+    for play in plays:
+        play.search_document = build_search_document(
+            play.title, play.description, actors[play.id], genres[play.id]
+        )
+    Play.objects.bulk_update(plays, ["search_document"], batch_size=500)
+
+
+def create_search_index(using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Create the full-text GIN index on PostgreSQL. Other backends search
+    with the pure-Python fallback of ``search_plays``.
+    """
+    if connections[using].vendor != "postgresql":
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(SEARCH_INDEX_SQL)
+
+
+def _terms(text):
+    return re.findall(r"\w+", text.lower())
+
+
+def _postgres_search(queryset, query):
+    from django.contrib.postgres.search import (
+        SearchQuery,
+        SearchRank,
+        SearchVector,
+    )
+
+    search_query = SearchQuery(
+        query, config=SEARCH_CONFIG, search_type="websearch"
+    )
+    weighted_vector = SearchVector(
+        "title", weight="A", config=SEARCH_CONFIG
+    ) + SearchVector("search_document", weight="B", config=SEARCH_CONFIG)
+    return (
+        queryset.alias(
+            document=SearchVector("search_document", config=SEARCH_CONFIG)
+        )
+        .filter(document=search_query)
+        .annotate(search_rank=SearchRank(weighted_vector, search_query))
+    )
+
+
+def _fallback_search(queryset, query):
+    terms = _terms(query)
+    if not terms:
+        return queryset.none()
+    matches = queryset.filter(
+        *[Q(search_document__icontains=term) for term in terms]
+    ).values_list("id", "title", "search_document")
+
+    ranks = {}
+    for play_id, title, document in matches:
+        title_terms = _terms(title)
+        document_terms = _terms(document)
+        ranks[play_id] = sum(
+            TITLE_WEIGHT * title_terms.count(term)
+            + document_terms.count(term)
+            for term in terms
+        ) / (len(document_terms) or 1)
+    return queryset.filter(pk__in=ranks).annotate(
+        search_rank=Case(
+            *[
+                When(pk=play_id, then=Value(rank))
+                for play_id, rank in ranks.items()
+            ],
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+    )
+
+
+def search_plays(queryset, query):
+    """
+    Filter plays matching ``query`` in their title, description, actors
+    or genres, ordered by relevance (``search_rank``).
+    """
+    if connection.vendor == "postgresql":
+        queryset = _postgres_search(queryset, query)
+    else:
+        queryset = _fallback_search(queryset, query)
+    return queryset.order_by("-search_rank", "id")
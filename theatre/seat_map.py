@@ -0,0 +1,307 @@
+import base64
+
+from django.db import transaction
+from django.db.models import Q
+
+from theatre.broker import publish_seat_changes
+from theatre.models import HeldSeat, Performance, Ticket
+
+
+class SeatMap:
+    """One bit per seat of a hall, row-major, most significant bit first."""
+
+    def __init__(self, rows, seats_in_row, data=b""):
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        size = (rows * seats_in_row + 7) // 8
+        self._bits = bytearray(bytes(data)[:size].ljust(size, b"\0"))
+
+    @classmethod
+    def for_performance(cls, performance):
+        hall = performance.theatre_hall
+        return cls(hall.rows, hall.seats_in_row, performance.seat_map)
+
+    @property
+    def total_seats(self):
+        return self.rows * self.seats_in_row
+
+    def _position(self, row, seat):
+        if not (1 <= row <= self.rows and 1 <= seat <= self.seats_in_row):
+            raise IndexError(f"Seat ({row}, {seat}) is outside of the hall")
+        index = (row - 1) * self.seats_in_row + (seat - 1)
+        return index >> 3, 0x80 >> (index & 7)
+
+    def is_taken(self, row, seat):
+        byte, mask = self._position(row, seat)
+        return bool(self._bits[byte] & mask)
+
+    def take(self, row, seat):
+        byte, mask = self._position(row, seat)
+        self._bits[byte] |= mask
+
+    def release(self, row, seat):
+        byte, mask = self._position(row, seat)
+        self._bits[byte] &= ~mask & 0xFF
+
+    @property
+    def taken_count(self):
+        return int.from_bytes(self._bits, "big").bit_count()
+
+    @property
+    def available_count(self):
+        return self.total_seats - self.taken_count
+
+    def _seat(self, index):
+        row, seat = divmod(index, self.seats_in_row)
+        return row + 1, seat + 1
+
+    def taken(self):
+        """Yield ``(row, seat)`` of every taken seat in hall order."""
+        for byte_index, byte in enumerate(self._bits):
+            if not byte:
+                continue
+            for bit in range(8):
+                if byte & (0x80 >> bit):
+                    yield self._seat(byte_index * 8 + bit)
+
+    def free_intervals(self):
+        """
+        Index the free seats as a list of ``(first_seat, last_seat)`` runs
+        per row, first row first. Runs are found with integer bit
+        operations, so the cost grows with the number of runs rather than
+        the number of seats.
+        """
+        width = self.seats_in_row
+        row_mask = (1 << width) - 1
+        bits = int.from_bytes(self._bits, "big") >> (
+            len(self._bits) * 8 - self.total_seats
+        )
+        intervals = [None] * self.rows
+        for row in range(self.rows - 1, -1, -1):
+            # Seat 1 is the most significant bit of the row.
+            free = ~bits & row_mask
+            bits >>= width
+            runs = []
+            while free:
+                start = free.bit_length()
+                end = (~free & ((1 << start) - 1)).bit_length()
+                runs.append((width - start + 1, width - end))
+                free &= (1 << end) - 1
+            intervals[row] = runs
+        return intervals
+
+    def changes(self, new):
+        """
+        Return the ``(taken, released)`` seat lists that turn this map into
+        ``new``, a map of the same hall.
+        """
+        taken, released = [], []
+        for byte_index, (old, current) in enumerate(
+            zip(self._bits, new._bits)
+        ):
+            changed = old ^ current
+            if not changed:
+                continue
+            for bit in range(8):
+                mask = 0x80 >> bit
+                if changed & mask:
+                    seats = taken if current & mask else released
+                    seats.append(self._seat(byte_index * 8 + bit))
+        return taken, released
+
+    def to_bytes(self):
+        return bytes(self._bits)
+
+    def to_base64(self):
+        return base64.b64encode(self._bits).decode("ascii")
+
+    def to_runs(self):
+        """
+        Run-length encode the map as alternating free/taken run lengths,
+        always starting with a (possibly empty) run of free seats.
+        """
+        runs = []
+        current, length = 0, 0
+        for index in range(self.total_seats):
+            bit = 1 if self._bits[index >> 3] & (0x80 >> (index & 7)) else 0
+            if bit == current:
+                length += 1
+            else:
+                runs.append(length)
+                current, length = bit, 1
+        runs.append(length)
+        return runs
+
+
+SEAT_MAP_ENCODINGS = ("bitmap", "rle")
+
+# Rows are preferred by their distance to this fraction of the hall depth.
+PREFERRED_ROW_DEPTH = 1 / 3
+
+
+def best_available(seat_map, count):
+    """
+    Find ``count`` adjacent free seats in the best row: the one closest to
+    a third of the way back that has such a block, nearer to the stage on
+    ties. Within the row the block closest to its centre is chosen.
+    Return the ``(row, seat)`` pairs, or ``None`` if no row fits.
+    """
+    if count > seat_map.seats_in_row:
+        return None
+    preferred_row = max(1, round(seat_map.rows * PREFERRED_ROW_DEPTH))
+    # Seat number the block should start at to be centred in the row.
+    ideal_first = (seat_map.seats_in_row - count) // 2 + 1
+    intervals = seat_map.free_intervals()
+    for row in sorted(
+        range(1, seat_map.rows + 1),
+        key=lambda row: (abs(row - preferred_row), row),
+    ):
+        best_first = None
+        for first, last in intervals[row - 1]:
+            if last - first + 1 < count:
+                continue
+            candidate = min(max(ideal_first, first), last - count + 1)
+            if best_first is None or abs(candidate - ideal_first) < abs(
+                best_first - ideal_first
+            ):
+                best_first = candidate
+        if best_first is not None:
+            return [
+                (row, seat) for seat in range(best_first, best_first + count)
+            ]
+    return None
+
+
+def seat_map_data(performance, encoding):
+    """Response payload of the seat map endpoints."""
+    seat_map = SeatMap.for_performance(performance)
+    return {
+        "performance": performance.id,
+        "rows": seat_map.rows,
+        "seats_in_row": seat_map.seats_in_row,
+        "taken": seat_map.taken_count,
+        "encoding": encoding,
+        "data": (
+            seat_map.to_base64()
+            if encoding == "bitmap"
+            else seat_map.to_runs()
+        ),
+    }
+
+
+def lock_performances(performance_ids):
+    """
+    Lock performance rows in primary key order, so that concurrent
+    bookings spanning several performances cannot deadlock.
+    Must be called inside a transaction.
+    """
+    return {
+        performance.id: performance
+        for performance in Performance.objects.select_for_update(
+            of=("self",)
+        )
+        .select_related("theatre_hall")
+        .filter(pk__in=performance_ids)
+        .order_by("pk")
+    }
+
+
+def save_seat_map(performance, seat_map):
+    """
+    Store the seat map and the sold tickets counter derived from it, and
+    publish the changed seats to the watchers of the performance.
+    """
+    taken, released = SeatMap.for_performance(performance).changes(seat_map)
+    if taken or released:
+        publish_seat_changes(performance.pk, taken, released)
+
+    performance.seat_map = seat_map.to_bytes()
+    performance.tickets_sold = seat_map.taken_count
+    Performance.objects.filter(pk=performance.pk).update(
+        seat_map=performance.seat_map, tickets_sold=performance.tickets_sold
+    )
+
+
+def update_seat_map(performance_id, taken=(), released=()):
+    """
+    Apply taken and released ``(row, seat)`` pairs to the stored seat map
+    of a performance while holding its row lock.
+    """
+    with transaction.atomic():
+        performance = lock_performances([performance_id]).get(performance_id)
+        if performance is None:
+            return None
+        seat_map = SeatMap.for_performance(performance)
+        for row, seat in released:
+            seat_map.release(row, seat)
+        for row, seat in taken:
+            seat_map.take(row, seat)
+        save_seat_map(performance, seat_map)
+        return seat_map
+
+
+def rebuild_seat_map(performance):
+    """
+    Recompute the seat map of a performance from its ticket rows. Tickets
+    outside the hall (see ``seats_outside_hall``) are left out.
+    """
+    hall = performance.theatre_hall
+    seat_map = SeatMap(hall.rows, hall.seats_in_row)
+    for row, seat in performance.tickets.filter(
+        row__lte=hall.rows, seat__lte=hall.seats_in_row
+    ).values_list("row", "seat"):
+        seat_map.take(row, seat)
+    return seat_map
+
+
+def _seats_outside(rows, seats_in_row, **performance_filter):
+    outside = Q(row__gt=rows) | Q(seat__gt=seats_in_row)
+    return (
+        Ticket.objects.filter(outside, **performance_filter).count()
+        + HeldSeat.objects.filter(outside, **performance_filter).count()
+    )
+
+
+def seats_outside_hall(theatre_hall_id, rows, seats_in_row):
+    """
+    Count the sold and held seats of a theatre hall's performances that
+    would not fit into ``rows`` rows of ``seats_in_row`` seats.
+    """
+    return _seats_outside(
+        rows, seats_in_row, performance__theatre_hall_id=theatre_hall_id
+    )
+
+
+def performance_seats_outside_hall(performance_id, theatre_hall):
+    """
+    Count the sold and held seats of a performance that would not fit
+    into ``theatre_hall``, e.g. before moving the performance there.
+    """
+    return _seats_outside(
+        theatre_hall.rows,
+        theatre_hall.seats_in_row,
+        performance_id=performance_id,
+    )
+
+
+def rebuild_seat_maps(performance_ids):
+    """
+    Re-encode the stored seat maps of performances whose hall layout
+    changed, as the bitmaps use the old row width.
+    """
+    with transaction.atomic():
+        for performance in lock_performances(performance_ids).values():
+            seat_map = rebuild_seat_map(performance)
+            # The old and the new map describe different halls, so no
+            # seat changes are published.
+            Performance.objects.filter(pk=performance.pk).update(
+                seat_map=seat_map.to_bytes(),
+                tickets_sold=seat_map.taken_count,
+            )
+
+
+def rebuild_hall_seat_maps(theatre_hall):
+    """Re-encode the seat maps of a resized theatre hall's performances."""
+    rebuild_seat_maps(
+        list(theatre_hall.performances.values_list("pk", flat=True))
+    )
@@ -1,4 +1,7 @@
+from collections import defaultdict
+
 from django.db import transaction
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
@@ -10,7 +13,12 @@ from theatre.models import (
     Performance,
     Reservation,
     Ticket,
+    SeatHold,
+    HeldSeat,
 )
+from theatre.holds import book_best_available, book_seats, hold_seats
+from theatre.schedule import find_conflicts, schedule_constraint_errors
+from theatre.seat_map import SeatMap, performance_seats_outside_hall
 
 
 class TheatreHallSerializer(serializers.ModelSerializer):
@@ -34,7 +42,15 @@ class GenreSerializer(serializers.ModelSerializer):
 class PlaySerializer(serializers.ModelSerializer):
     class Meta:
         model = Play
-        fields = ("id", "title", "description", "actors", "genres")
+        fields = (
+            "id", "title", "description", "duration", "actors", "genres"
+        )
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        # Saving a new duration moves the end times of the play's
+        # performances, or fails if they would overlap (theatre.signals).
+        return super().update(instance, validated_data)
 
 
 class PlayListSerializer(PlaySerializer):
@@ -64,13 +80,61 @@ class PlayDetailSerializer(PlaySerializer):
 
     class Meta:
         model = Play
-        fields = ("id", "title", "description", "actors", "genres")
+        fields = (
+            "id", "title", "description", "duration", "actors", "genres"
+        )
 
 
 class PerformanceSerializer(serializers.ModelSerializer):
+    def validate(self, attrs):
+        data = super(PerformanceSerializer, self).validate(attrs=attrs)
+        play = attrs.get("play") or self.instance.play
+        theatre_hall = attrs.get("theatre_hall") or self.instance.theatre_hall
+        show_time = attrs.get("show_time") or self.instance.show_time
+        if self.instance is not None and (
+            theatre_hall.id != self.instance.theatre_hall_id
+        ):
+            # The stored seat map is re-encoded for the new hall on save
+            # (theatre.signals), every sold and held seat has to fit.
+            outside = performance_seats_outside_hall(
+                self.instance.pk, theatre_hall
+            )
+            if outside:
+                raise ValidationError(
+                    {
+                        "theatre_hall": (
+                            f"{outside} sold or held seats would be "
+                            f"outside of the new theatre hall."
+                        )
+                    }
+                )
+        performance = Performance(
+            pk=getattr(self.instance, "pk", None),
+            theatre_hall_id=theatre_hall.id,
+            show_time=show_time,
+            end_time=show_time + play.duration,
+        )
+        conflicts = find_conflicts([performance])
+        if conflicts:
+            raise ValidationError(
+                {
+                    "show_time": (
+                        f"The theatre hall is booked at this time by "
+                        f"performance "
+                        f"{conflicts[0]['conflicts_with']['performance']}."
+                    )
+                }
+            )
+        return data
+
+    def save(self, **kwargs):
+        with schedule_constraint_errors():
+            return super().save(**kwargs)
+
     class Meta:
         model = Performance
-        fields = ("id", "show_time", "play", "theatre_hall")
+        fields = ("id", "show_time", "end_time", "play", "theatre_hall")
+        read_only_fields = ("end_time",)
 
 
 class PerformanceListSerializer(PerformanceSerializer):
@@ -103,6 +167,16 @@ class PerformanceListSerializer(PerformanceSerializer):
         )
 
 
+class ScheduledPerformanceSerializer(serializers.Serializer):
+    play = serializers.IntegerField(min_value=1)
+    theatre_hall = serializers.IntegerField(min_value=1)
+    show_time = serializers.DateTimeField()
+
+
+class ScheduleValidationSerializer(serializers.Serializer):
+    performances = ScheduledPerformanceSerializer(many=True)
+
+
 class TicketSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs=attrs)
@@ -119,6 +193,90 @@ class TicketSerializer(serializers.ModelSerializer):
         fields = ("id", "row", "seat", "performance")
 
 
+class ReservationTicketListSerializer(serializers.ListSerializer):
+    """
+    Validates all tickets of a reservation at once: referenced performances
+    and their halls are loaded with one query, while seat ranges, seats
+    repeated in the payload and already taken seats are checked in memory.
+    """
+
+    def to_internal_value(self, data):
+        attrs = super().to_internal_value(data)
+        performances = (
+            Performance.objects.select_related("theatre_hall")
+            .only("id", "seat_map", "theatre_hall")
+            .in_bulk({ticket["performance_id"] for ticket in attrs})
+        )
+
+        errors = []
+        requested = set()
+        seat_maps = {}
+        for ticket in attrs:
+            performance = performances.get(ticket["performance_id"])
+            if performance is None:
+                errors.append(
+                    {
+                        "performance": f"Invalid pk "
+                        f"\"{ticket['performance_id']}\" "
+                        f"- object does not exist."
+                    }
+                )
+                continue
+
+            try:
+                Ticket.validate_ticket(
+                    ticket["row"],
+                    ticket["seat"],
+                    performance.theatre_hall,
+                    ValidationError,
+                )
+            except ValidationError as error:
+                errors.append(error.detail)
+                continue
+
+            if performance.id not in seat_maps:
+                seat_maps[performance.id] = SeatMap.for_performance(
+                    performance
+                )
+            key = (performance.id, ticket["row"], ticket["seat"])
+            if key in requested:
+                errors.append(
+                    {"non_field_errors": ["Seat is requested more than once."]}
+                )
+            elif seat_maps[performance.id].is_taken(
+                ticket["row"], ticket["seat"]
+            ):
+                errors.append(
+                    {"non_field_errors": ["Seat is already taken."]}
+                )
+            else:
+                errors.append({})
+            requested.add(key)
+            ticket["performance"] = performance
+
+        if any(errors):
+            raise ValidationError(errors)
+
+        for ticket in attrs:
+            del ticket["performance_id"]
+        return attrs
+
+
+class ReservationTicketSerializer(TicketSerializer):
+    performance = serializers.IntegerField(
+        source="performance_id", min_value=1
+    )
+
+    class Meta:
+        model = Ticket
+        fields = ("id", "row", "seat", "performance")
+        list_serializer_class = ReservationTicketListSerializer
+        validators = []
+
+    def validate(self, attrs):
+        return attrs
+
+
 class TicketListSerializer(TicketSerializer):
     performance = PerformanceListSerializer(many=False, read_only=True)
 
@@ -132,51 +290,91 @@ class TicketSeatsSerializer(TicketSerializer):
 class PerformanceDetailSerializer(PerformanceSerializer):
     play = PlayListSerializer(many=False, read_only=True)
     theatre_hall = TheatreHallSerializer(many=False, read_only=True)
-    taken_places = TicketSeatsSerializer(
-        source="tickets",
-        many=True,
-        read_only=True
-    )
+    taken_places = serializers.SerializerMethodField()
 
     class Meta:
         model = Performance
         fields = (
             "id",
             "show_time",
+            "end_time",
             "play",
             "theatre_hall",
             "taken_places",
         )
 
+    @extend_schema_field(TicketSeatsSerializer(many=True))
+    def get_taken_places(self, performance):
+        seat_map = SeatMap.for_performance(performance)
+        return [{"row": row, "seat": seat} for row, seat in seat_map.taken()]
+
 
 class ReservationSerializer(serializers.ModelSerializer):
-    tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
+    tickets = ReservationTicketSerializer(
+        many=True, read_only=False, allow_empty=False
+    )
 
     class Meta:
         model = Reservation
         fields = ("id", "created_at", "tickets")
 
     def create(self, validated_data):
-        with transaction.atomic():
-            tickets_data = validated_data.pop("tickets")
-            reservation = Reservation.objects.create(**validated_data)
-            tickets = [
-                Ticket(reservation=reservation, **ticket_data)
-                for ticket_data in tickets_data
-            ]
-            Ticket.objects.bulk_create(tickets)
-            return reservation
+        tickets_data = validated_data.pop("tickets")
+        return book_seats(validated_data["user"], tickets_data)
+
+
+class BestAvailableSerializer(serializers.Serializer):
+    performance = serializers.IntegerField(min_value=1)
+    seats = serializers.IntegerField(min_value=1)
+
+    def create(self, validated_data):
+        return book_best_available(
+            validated_data["user"],
+            validated_data["performance"],
+            validated_data["seats"],
+        )
+
+
+class ReservationSummaryListSerializer(serializers.ListSerializer):
+    """
+    Attaches the titles of the booked plays to a page of reservations
+    with one query instead of walking each reservation's tickets.
+    """
+
+    def to_representation(self, data):
+        reservations = list(data.all() if hasattr(data, "all") else data)
+        play_titles = defaultdict(list)
+        for reservation_id, title in (
+            Ticket.objects.filter(
+                reservation_id__in=[item.id for item in reservations]
+            )
+            .values_list("reservation_id", "performance__play__title")
+            .distinct()
+            .order_by("reservation_id", "performance__play__title")
+        ):
+            play_titles[reservation_id].append(title)
+        for reservation in reservations:
+            reservation.play_titles = play_titles[reservation.id]
+        return super().to_representation(reservations)
 
 
 class ReservationListSerializer(serializers.ModelSerializer):
-    tickets_count = serializers.IntegerField(
-        source="tickets.count",
-        read_only=True
+    tickets_count = serializers.IntegerField(read_only=True)
+    first_show_time = serializers.DateTimeField(read_only=True)
+    play_titles = serializers.ListField(
+        child=serializers.CharField(), read_only=True
     )
 
     class Meta:
         model = Reservation
-        fields = ("id", "created_at", "tickets_count")
+        fields = (
+            "id",
+            "created_at",
+            "tickets_count",
+            "first_show_time",
+            "play_titles",
+        )
+        list_serializer_class = ReservationSummaryListSerializer
 
 
 class ReservationDetailSerializer(serializers.ModelSerializer):
@@ -185,3 +383,25 @@ class ReservationDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Reservation
         fields = ("id", "created_at", "tickets")
+
+
+class HeldSeatSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = HeldSeat
+        fields = ("row", "seat")
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    seats = HeldSeatSerializer(many=True, allow_empty=False)
+
+    class Meta:
+        model = SeatHold
+        fields = ("id", "performance", "seats", "created_at", "expires_at")
+        read_only_fields = ("created_at", "expires_at")
+
+    def create(self, validated_data):
+        return hold_seats(
+            validated_data["user"],
+            validated_data["performance"],
+            [(seat["row"], seat["seat"]) for seat in validated_data["seats"]],
+        )
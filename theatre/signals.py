@@ -0,0 +1,216 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models import QuerySet
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.conf import settings
+from django.dispatch import receiver
+from rest_framework.exceptions import ValidationError
+
+from theatre.authentication import forget_user_state
+from theatre.cache import invalidate_model
+from theatre.metrics import registry
+from theatre.models import Actor, Genre, Performance, Play, TheatreHall, Ticket
+from theatre.schedule import change_play_duration
+from theatre.search import refresh_search_documents
+from theatre.seat_map import (
+    performance_seats_outside_hall,
+    rebuild_hall_seat_maps,
+    rebuild_seat_maps,
+    seats_outside_hall,
+    update_seat_map,
+)
+
+CATALOG_MODELS = (Play, Actor, Genre, TheatreHall)
+
+
+def _deletes_performance(origin):
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model in (Performance, Play, TheatreHall)
+
+
+@receiver(post_save, sender=Ticket)
+def take_ticket_seat(sender, instance, created, **kwargs):
+    if created:
+        update_seat_map(
+            instance.performance_id, taken=[(instance.row, instance.seat)]
+        )
+
+
+@receiver(post_delete, sender=Ticket)
+def release_ticket_seat(sender, instance, origin=None, **kwargs):
+    if _deletes_performance(origin):
+        return
+    update_seat_map(
+        instance.performance_id, released=[(instance.row, instance.seat)]
+    )
+
+
+# The admin forms report these checks as form errors, the pre_save
+# handlers below are the last guard for other saves.
+@receiver(pre_save, sender=TheatreHall)
+def check_hall_resize(sender, instance, raw, **kwargs):
+    instance._resized = False
+    if raw or instance.pk is None:
+        return
+    stored = (
+        TheatreHall.objects.filter(pk=instance.pk)
+        .values_list("rows", "seats_in_row")
+        .first()
+    )
+    if stored is None or stored == (instance.rows, instance.seats_in_row):
+        return
+    outside = seats_outside_hall(
+        instance.pk, instance.rows, instance.seats_in_row
+    )
+    if outside:
+        raise ValidationError(
+            {
+                "non_field_errors": [
+                    f"{outside} sold or held seats would be outside of "
+                    f"the resized hall."
+                ]
+            }
+        )
+    instance._resized = True
+
+
+@receiver(post_save, sender=TheatreHall)
+def rebuild_resized_hall_seat_maps(sender, instance, **kwargs):
+    if getattr(instance, "_resized", False):
+        rebuild_hall_seat_maps(instance)
+
+
+@receiver(pre_save, sender=Performance)
+def check_performance_move(sender, instance, raw, update_fields, **kwargs):
+    instance._moved = False
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and "theatre_hall" not in update_fields:
+        return
+    stored = (
+        Performance.objects.filter(pk=instance.pk)
+        .values_list("theatre_hall_id", flat=True)
+        .first()
+    )
+    if stored is None or stored == instance.theatre_hall_id:
+        return
+    outside = performance_seats_outside_hall(
+        instance.pk, instance.theatre_hall
+    )
+    if outside:
+        raise ValidationError(
+            {
+                "theatre_hall": [
+                    f"{outside} sold or held seats would be outside of "
+                    f"the new theatre hall."
+                ]
+            }
+        )
+    instance._moved = True
+
+
+@receiver(post_save, sender=Performance)
+def rebuild_moved_performance_seat_map(sender, instance, **kwargs):
+    if getattr(instance, "_moved", False):
+        rebuild_seat_maps([instance.pk])
+
+
+# Until the write commits, concurrent reads still see the old rows and
+# could cache them under the new version, so the versions move on commit.
+def invalidate_catalog_responses(sender, using, **kwargs):
+    transaction.on_commit(partial(invalidate_model, sender), using=using)
+
+
+def invalidate_play_responses(sender, action, using, **kwargs):
+    if action.startswith("post_"):
+        transaction.on_commit(partial(invalidate_model, Play), using=using)
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(invalidate_catalog_responses, sender=model)
+    post_delete.connect(invalidate_catalog_responses, sender=model)
+
+for through in (Play.actors.through, Play.genres.through):
+    m2m_changed.connect(invalidate_play_responses, sender=through)
+
+
+# The play admin form reports overlapping durations as a form error first.
+@receiver(pre_save, sender=Play)
+def move_performance_end_times(sender, instance, raw, update_fields, **kwargs):
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and "duration" not in update_fields:
+        return
+    stored = (
+        Play.objects.filter(pk=instance.pk)
+        .values_list("duration", flat=True)
+        .first()
+    )
+    if stored is not None and stored != instance.duration:
+        change_play_duration(instance, instance.duration)
+
+
+@receiver(post_save, sender=Play)
+def refresh_play_search_document(sender, instance, **kwargs):
+    refresh_search_documents([instance.pk])
+
+
+def collect_search_play_ids(sender, instance, **kwargs):
+    related = "actor" if sender is Actor else "genre"
+    through = Play.actors.through if sender is Actor else Play.genres.through
+    instance._search_play_ids = list(
+        through.objects.filter(**{related: instance}).values_list(
+            "play_id", flat=True
+        )
+    )
+
+
+def refresh_play_search_documents(sender, instance, action, reverse, pk_set,
+                                  **kwargs):
+    if reverse and action == "pre_clear":
+        collect_search_play_ids(type(instance), instance)
+    elif action in ("post_add", "post_remove"):
+        refresh_search_documents(pk_set if reverse else [instance.pk])
+    elif action == "post_clear":
+        refresh_search_documents(
+            instance.__dict__.pop("_search_play_ids", [])
+            if reverse
+            else [instance.pk]
+        )
+
+
+def refresh_related_search_documents(sender, instance, **kwargs):
+    collect_search_play_ids(sender, instance)
+    refresh_search_documents(instance.__dict__.pop("_search_play_ids"))
+
+
+def refresh_deleted_search_documents(sender, instance, **kwargs):
+    refresh_search_documents(instance.__dict__.pop("_search_play_ids", []))
+
+
+for model in (Actor, Genre):
+    pre_delete.connect(collect_search_play_ids, sender=model)
+    post_delete.connect(refresh_deleted_search_documents, sender=model)
+    post_save.connect(refresh_related_search_documents, sender=model)
+
+for through in (Play.actors.through, Play.genres.through):
+    m2m_changed.connect(refresh_play_search_documents, sender=through)
+
+
+@receiver(connection_created)
+def count_database_connection(sender, connection, **kwargs):
+    registry.connection_opened(connection.alias)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def forget_cached_user_state(sender, instance, **kwargs):
+    forget_user_state(instance.pk)
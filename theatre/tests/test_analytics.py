@@ -0,0 +1,209 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.analytics import refresh_sales_rollups
+from theatre.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    SalesRollup,
+    TheatreHall,
+    Ticket,
+)
+
+NOW = datetime(2024, 3, 20, 12, tzinfo=dt_timezone.utc)
+
+
+class SalesAnalyticsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = get_user_model().objects.create_user(
+            email="admin@admin.com", password="admin123", is_staff=True
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+        self.drama = Genre.objects.create(name="Drama")
+        self.comedy = Genre.objects.create(name="Comedy")
+        self.actor = Actor.objects.create(first_name="Tom", last_name="Hanks")
+        self.hamlet = Play.objects.create(title="Hamlet", description="")
+        self.hamlet.genres.add(self.drama)
+        self.hamlet.actors.add(self.actor)
+        self.sketch = Play.objects.create(title="Sketch", description="")
+        self.sketch.genres.add(self.comedy)
+
+        self.hall = TheatreHall.objects.create(
+            name="Main", rows=2, seats_in_row=5
+        )
+        self.small_hall = TheatreHall.objects.create(
+            name="Small", rows=1, seats_in_row=4
+        )
+        self.hamlet_show = Performance.objects.create(
+            play=self.hamlet,
+            theatre_hall=self.hall,
+            show_time="2024-03-25T19:00:00Z",
+        )
+        self.sketch_show = Performance.objects.create(
+            play=self.sketch,
+            theatre_hall=self.small_hall,
+            show_time="2024-03-26T19:00:00Z",
+        )
+
+        self.sell(
+            self.hamlet_show, [(1, 1), (1, 2), (1, 3)], "2024-03-10T10:00"
+        )
+        self.sell(self.sketch_show, [(1, 1)], "2024-03-10T10:00")
+        self.sell(self.hamlet_show, [(2, 1)], "2024-03-12T10:00")
+
+    def sell(self, performance, seats, created_at):
+        reservation = Reservation.objects.create(user=self.admin_user)
+        Reservation.objects.filter(pk=reservation.pk).update(
+            created_at=f"{created_at}:00Z"
+        )
+        for row, seat in seats:
+            Ticket.objects.create(
+                reservation=reservation,
+                performance=performance,
+                row=row,
+                seat=seat,
+            )
+
+    def get(self, report, params=None):
+        response = self.client.get(
+            f"/api/theatre/analytics/{report}/", params or {}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["results"]
+
+    def test_refresh_is_incremental(self):
+        self.assertEqual(refresh_sales_rollups(now=NOW)["created"], 3)
+
+        self.sell(self.sketch_show, [(1, 2)], "2024-03-20T11:56")
+        self.sell(self.hamlet_show, [(2, 2)], "2024-03-20T11:58")
+        # The second reservation is younger than the refresh lag.
+        result = refresh_sales_rollups(now=NOW + timedelta(minutes=2))
+        self.assertEqual((result["created"], result["updated"]), (1, 0))
+
+        self.sell(self.sketch_show, [(1, 3)], "2024-03-20T11:59")
+        result = refresh_sales_rollups(now=NOW + timedelta(minutes=10))
+        self.assertEqual((result["created"], result["updated"]), (1, 1))
+        self.assertEqual(
+            SalesRollup.objects.get(
+                day="2024-03-20", performance=self.sketch_show
+            ).tickets,
+            2,
+        )
+
+    def test_full_refresh_drops_cancelled_tickets(self):
+        refresh_sales_rollups(now=NOW)
+        Ticket.objects.filter(performance=self.hamlet_show, row=1).delete()
+
+        refresh_sales_rollups(full=True, now=NOW)
+
+        self.assertEqual(
+            list(
+                SalesRollup.objects.order_by("day", "performance").values_list(
+                    "day", "performance", "tickets"
+                )
+            ),
+            [
+                (datetime(2024, 3, 10).date(), self.sketch_show.id, 1),
+                (datetime(2024, 3, 12).date(), self.hamlet_show.id, 1),
+            ],
+        )
+
+    def test_reports(self):
+        call_command("refresh_sales_rollups", stdout=StringIO())
+
+        self.assertEqual(
+            [
+                (row["day"].isoformat(), row["tickets"])
+                for row in self.get("sales")
+            ],
+            [("2024-03-10", 4), ("2024-03-12", 1)],
+        )
+        self.assertEqual(
+            self.get("sales", {"from": "2024-03-11"})[0]["tickets"], 1
+        )
+        self.assertEqual(
+            self.get("top-plays"),
+            [
+                {"id": self.hamlet.id, "title": "Hamlet", "tickets": 4},
+                {"id": self.sketch.id, "title": "Sketch", "tickets": 1},
+            ],
+        )
+        self.assertEqual(
+            self.get("top-plays", {"limit": 1})[0]["title"], "Hamlet"
+        )
+        self.assertEqual(
+            self.get("top-actors"),
+            [
+                {
+                    "id": self.actor.id,
+                    "first_name": "Tom",
+                    "last_name": "Hanks",
+                    "tickets": 4,
+                }
+            ],
+        )
+        self.assertEqual(
+            [(row["name"], row["tickets"]) for row in self.get("top-genres")],
+            [("Drama", 4), ("Comedy", 1)],
+        )
+        self.assertEqual(
+            self.get("occupancy", {"from": "2024-03-25", "to": "2024-03-26"}),
+            [
+                {
+                    "theatre_hall": self.hall.id,
+                    "theatre_hall_name": "Main",
+                    "performances": 1,
+                    "capacity": 10,
+                    "seats_sold": 4,
+                    "occupancy": 0.4,
+                },
+                {
+                    "theatre_hall": self.small_hall.id,
+                    "theatre_hall_name": "Small",
+                    "performances": 1,
+                    "capacity": 4,
+                    "seats_sold": 1,
+                    "occupancy": 0.25,
+                },
+            ],
+        )
+
+    def test_reports_do_not_read_tickets(self):
+        refresh_sales_rollups(now=NOW)
+
+        for report in (
+            "sales", "occupancy", "top-plays", "top-actors", "top-genres"
+        ):
+            with CaptureQueriesContext(connection) as queries:
+                self.get(report)
+            for query in queries.captured_queries:
+                self.assertNotIn("theatre_ticket", query["sql"], report)
+
+    def test_invalid_limit(self):
+        response = self.client.get(
+            "/api/theatre/analytics/top-plays/", {"limit": "1000"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_admin_only(self):
+        user = get_user_model().objects.create_user(
+            email="user@test.com", password="user123"
+        )
+        self.client.force_authenticate(user=user)
+
+        response = self.client.get("/api/theatre/analytics/sales/")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,94 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theatre.models import Genre, Performance, Play, TheatreHall
+from theatre.seat_map import update_seat_map
+
+SYNC_URL = "/api/theatre/performances/"
+ASYNC_URL = "/api/theatre/async/performances/"
+
+
+class AsyncPerformanceViewsTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="userpass123"
+        )
+        self.sync_client = APIClient()
+        self.sync_client.force_authenticate(self.user)
+        self.async_client = AsyncClient()
+        self.auth_headers = {
+            "Authorization": f"Bearer {AccessToken.for_user(self.user)}"
+        }
+
+        hall = TheatreHall.objects.create(name="Hall", rows=3, seats_in_row=4)
+        play = Play.objects.create(title="Hamlet", description="Tragedy")
+        play.genres.add(Genre.objects.create(name="Drama"))
+        self.performances = [
+            Performance.objects.create(
+                play=play,
+                theatre_hall=hall,
+                show_time=f"2024-03-{day}T19:00:00Z",
+            )
+            for day in (10, 11, 12)
+        ]
+        update_seat_map(self.performances[0].id, taken=[(1, 2), (3, 4)])
+
+    async def async_get(self, url):
+        return await self.async_client.get(url, headers=self.auth_headers)
+
+    async def assert_same_response(self, path):
+        sync_response = await sync_to_async(self.sync_client.get)(
+            SYNC_URL + path
+        )
+        async_response = await self.async_get(ASYNC_URL + path)
+
+        self.assertEqual(
+            async_response.status_code, sync_response.status_code
+        )
+        self.assertEqual(async_response.json(), sync_response.json())
+
+    async def test_list_matches_sync_endpoint(self):
+        await self.assert_same_response("")
+        await self.assert_same_response("?date=2024-03-11")
+
+    async def test_list_paginates(self):
+        response = await self.async_get(ASYNC_URL + "?page_size=2")
+        page = response.json()
+
+        self.assertEqual(len(page["results"]), 2)
+        self.assertIn("/api/theatre/async/performances/", page["next"])
+        next_page = await self.async_get(page["next"])
+        self.assertEqual(len(next_page.json()["results"]), 1)
+
+    async def test_detail_matches_sync_endpoint(self):
+        await self.assert_same_response(f"{self.performances[0].id}/")
+
+    async def test_seat_map_matches_sync_endpoint(self):
+        performance_id = self.performances[0].id
+        await self.assert_same_response(f"{performance_id}/seat-map/")
+        await self.assert_same_response(
+            f"{performance_id}/seat-map/?encoding=rle"
+        )
+        await self.assert_same_response(
+            f"{performance_id}/seat-map/?encoding=png"
+        )
+
+    async def test_missing_performance_returns_404(self):
+        response = await self.async_get(ASYNC_URL + "999/")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_authentication_required(self):
+        response = await AsyncClient().get(ASYNC_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=1.0)
+    async def test_async_request_queries_are_timed(self):
+        response = await self.async_get(ASYNC_URL)
+
+        self.assertRegex(response["Server-Timing"], r'desc="[1-9]\d* queries"')
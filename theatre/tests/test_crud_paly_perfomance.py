@@ -4,7 +4,7 @@ from django.test import TestCase
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from theatre.models import Play, Performance, TheatreHall
+from theatre.models import Genre, Play, Performance, TheatreHall
 from theatre.serializers import (
     PlaySerializer,
     PerformanceSerializer,
@@ -102,7 +102,7 @@ class PerformanceTests(TestCase):
         )
         response = self.client.get("/api/theatre/performances/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_retrieve_performance(self):
         performance = Performance.objects.create(
@@ -138,3 +138,170 @@ class PerformanceTests(TestCase):
         response = self.client.delete(f"/api/theatre/performances/{performance.id}/")
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Performance.objects.count(), 0)
+
+    def test_filter_performances_by_date(self):
+        other_hall = TheatreHall.objects.create(
+            name="Other Hall", rows=10, seats_in_row=10
+        )
+        for hall, show_time in (
+            (self.theatre_hall, "2024-03-09T23:59:59Z"),
+            (other_hall, "2024-03-10T00:00:00Z"),
+            (self.theatre_hall, "2024-03-10T23:59:59Z"),
+            (other_hall, "2024-03-11T00:00:00Z"),
+        ):
+            Performance.objects.create(
+                play=self.play,
+                theatre_hall=hall,
+                show_time=show_time,
+            )
+
+        response = self.client.get(
+            "/api/theatre/performances/", {"date": "2024-03-10"}
+        )
+        self.assertEqual(
+            [item["show_time"] for item in response.data["results"]],
+            ["2024-03-10T00:00:00Z", "2024-03-10T23:59:59Z"],
+        )
+
+    def test_filter_performances_by_invalid_date(self):
+        response = self.client.get(
+            "/api/theatre/performances/", {"date": "10.03.2024"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("date", response.data)
+
+    def test_filter_performances_by_range_and_ids(self):
+        other_play = Play.objects.create(
+            title="Other Play", description="Other Description"
+        )
+        other_hall = TheatreHall.objects.create(
+            name="Other Hall", rows=5, seats_in_row=5
+        )
+        genre = Genre.objects.create(name="Drama")
+        other_play.genres.add(genre)
+        for play, hall, show_time in (
+            (self.play, self.theatre_hall, "2024-03-09T19:00:00Z"),
+            (self.play, self.theatre_hall, "2024-03-10T19:00:00Z"),
+            (other_play, other_hall, "2024-03-11T19:00:00Z"),
+            (other_play, self.theatre_hall, "2024-03-12T19:00:00Z"),
+            (self.play, other_hall, "2024-03-13T19:00:00Z"),
+        ):
+            Performance.objects.create(
+                play=play, theatre_hall=hall, show_time=show_time
+            )
+
+        def show_days(params):
+            response = self.client.get("/api/theatre/performances/", params)
+            return [
+                item["show_time"][8:10] for item in response.data["results"]
+            ]
+
+        self.assertEqual(
+            show_days({"from": "2024-03-10", "to": "2024-03-12"}),
+            ["10", "11", "12"],
+        )
+        self.assertEqual(
+            show_days({"play": f"{self.play.id},{other_play.id}"}),
+            ["09", "10", "11", "12", "13"],
+        )
+        self.assertEqual(show_days({"hall": other_hall.id}), ["11", "13"])
+        self.assertEqual(
+            show_days({"genre": genre.id, "hall": self.theatre_hall.id}),
+            ["12"],
+        )
+
+    def test_filter_performances_invalid_params(self):
+        for params in (
+            {"play": "x"},
+            {"hall": "0"},
+            {"from": "2024-03-12", "to": "2024-03-10"},
+        ):
+            response = self.client.get("/api/theatre/performances/", params)
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST, params
+            )
+
+    def test_calendar(self):
+        other_hall = TheatreHall.objects.create(
+            name="Other Hall", rows=5, seats_in_row=4
+        )
+        for hall, show_time, tickets_sold in (
+            (self.theatre_hall, "2024-03-10T12:00:00Z", 10),
+            (self.theatre_hall, "2024-03-10T19:00:00Z", 30),
+            (other_hall, "2024-03-10T19:00:00Z", 5),
+            (other_hall, "2024-03-12T19:00:00Z", 20),
+            (other_hall, "2024-04-12T19:00:00Z", 20),
+        ):
+            Performance.objects.create(
+                play=self.play,
+                theatre_hall=hall,
+                show_time=show_time,
+                tickets_sold=tickets_sold,
+            )
+
+        response = self.client.get(
+            "/api/theatre/performances/calendar/",
+            {"from": "2024-03-01", "to": "2024-03-31"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            [
+                {
+                    "date": "2024-03-10",
+                    "halls": [
+                        {
+                            "theatre_hall": self.theatre_hall.id,
+                            "theatre_hall_name": "Test Hall",
+                            "performances": 2,
+                            "seats_sold": 40,
+                            "capacity": 200,
+                            "occupancy": 0.2,
+                        },
+                        {
+                            "theatre_hall": other_hall.id,
+                            "theatre_hall_name": "Other Hall",
+                            "performances": 1,
+                            "seats_sold": 5,
+                            "capacity": 20,
+                            "occupancy": 0.25,
+                        },
+                    ],
+                },
+                {
+                    "date": "2024-03-12",
+                    "halls": [
+                        {
+                            "theatre_hall": other_hall.id,
+                            "theatre_hall_name": "Other Hall",
+                            "performances": 1,
+                            "seats_sold": 20,
+                            "capacity": 20,
+                            "occupancy": 1.0,
+                        },
+                    ],
+                },
+            ],
+        )
+
+    def test_calendar_uses_one_query(self):
+        Performance.objects.create(
+            play=self.play,
+            theatre_hall=self.theatre_hall,
+            show_time="2024-03-10T12:00:00Z",
+        )
+        # Authentication and throttling do not query for a forced user.
+        with self.assertNumQueries(1):
+            self.client.get(
+                "/api/theatre/performances/calendar/",
+                {"from": "2024-03-01", "to": "2024-03-31", "genre": "1"},
+            )
+
+    def test_calendar_range_is_bounded(self):
+        response = self.client.get(
+            "/api/theatre/performances/calendar/",
+            {"from": "2024-01-01", "to": "2024-12-31"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("to", response.data)
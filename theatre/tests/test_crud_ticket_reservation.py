@@ -1,5 +1,7 @@
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from rest_framework.test import APIClient
@@ -49,7 +51,52 @@ class TicketReservationTests(TestCase):
 
         response = self.client.get("/api/theatre/reservations/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_list_reservations_summary(self):
+        other_play = Play.objects.create(title="Another Play", description="")
+        later_performance = Performance.objects.create(
+            play=other_play,
+            theatre_hall=self.theatre_hall,
+            show_time="2024-03-12T19:00:00Z",
+        )
+        reservation = Reservation.objects.create(user=self.user)
+        for performance, seat in (
+            (later_performance, 1),
+            (self.performance, 1),
+            (self.performance, 2),
+        ):
+            Ticket.objects.create(
+                reservation=reservation,
+                performance=performance,
+                row=1,
+                seat=seat,
+            )
+
+        response = self.client.get("/api/theatre/reservations/")
+        summary = response.data["results"][0]
+        self.assertEqual(summary["tickets_count"], 3)
+        self.assertEqual(summary["first_show_time"], "2024-03-10T19:00:00Z")
+        self.assertEqual(summary["play_titles"], ["Another Play", "Test Play"])
+
+    def test_list_reservations_in_constant_queries(self):
+        def reserve(count):
+            for _ in range(count):
+                reservation = Reservation.objects.create(user=self.user)
+                Ticket.objects.create(
+                    reservation=reservation,
+                    performance=self.performance,
+                    row=Reservation.objects.count(),
+                    seat=1,
+                )
+
+        reserve(1)
+        with CaptureQueriesContext(connection) as single:
+            self.client.get("/api/theatre/reservations/")
+        reserve(5)
+        with self.assertNumQueries(len(single.captured_queries)):
+            response = self.client.get("/api/theatre/reservations/")
+        self.assertEqual(len(response.data["results"]), 6)
 
     def test_retrieve_reservation(self):
         reservation = Reservation.objects.create(user=self.user)
@@ -75,3 +122,56 @@ class TicketReservationTests(TestCase):
 
         response = self.client.post("/api/theatre/reservations/", payload)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_group_booking_validates_in_constant_queries(self):
+        def payload(size, first_row):
+            return {
+                "tickets": [
+                    {
+                        "row": first_row,
+                        "seat": seat,
+                        "performance": self.performance.id,
+                    }
+                    for seat in range(1, size + 1)
+                ]
+            }
+
+        with CaptureQueriesContext(connection) as single:
+            self.client.post(
+                "/api/theatre/reservations/", payload(1, 1), format="json"
+            )
+        with self.assertNumQueries(len(single.captured_queries)):
+            response = self.client.post(
+                "/api/theatre/reservations/", payload(10, 2), format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Ticket.objects.count(), 11)
+
+    def test_reservation_reports_all_ticket_errors(self):
+        Ticket.objects.create(
+            reservation=Reservation.objects.create(user=self.user),
+            performance=self.performance,
+            row=5,
+            seat=5,
+        )
+        payload = {
+            "tickets": [
+                {"row": 1, "seat": 1, "performance": self.performance.id},
+                {"row": 1, "seat": 1, "performance": self.performance.id},
+                {"row": 11, "seat": 1, "performance": self.performance.id},
+                {"row": 5, "seat": 5, "performance": self.performance.id},
+                {"row": 1, "seat": 2, "performance": 999},
+            ]
+        }
+
+        response = self.client.post(
+            "/api/theatre/reservations/", payload, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data["tickets"]
+        self.assertEqual(errors[0], {})
+        self.assertIn("non_field_errors", errors[1])
+        self.assertIn("row", errors[2])
+        self.assertIn("non_field_errors", errors[3])
+        self.assertIn("performance", errors[4])
+        self.assertEqual(Ticket.objects.count(), 1)
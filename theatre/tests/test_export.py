@@ -0,0 +1,84 @@
+import csv
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import Performance, Play, Reservation, TheatreHall, Ticket
+
+
+class ReservationExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="userpass123"
+        )
+        self.admin_user = get_user_model().objects.create_user(
+            email="admin@test.com", password="adminpass123", is_staff=True
+        )
+        hall = TheatreHall.objects.create(name="Hall", rows=5, seats_in_row=5)
+        play = Play.objects.create(title="Hamlet", description="")
+        self.performance = Performance.objects.create(
+            play=play, theatre_hall=hall, show_time="2024-03-10T19:00:00Z"
+        )
+        self.other_performance = Performance.objects.create(
+            play=play, theatre_hall=hall, show_time="2024-03-11T19:00:00Z"
+        )
+        reservation = Reservation.objects.create(user=self.user)
+        for performance, seat in (
+            (self.performance, 1),
+            (self.performance, 2),
+            (self.other_performance, 1),
+        ):
+            Ticket.objects.create(
+                reservation=reservation,
+                performance=performance,
+                row=1,
+                seat=seat,
+            )
+
+    def export(self, params):
+        response = self.client.get("/api/theatre/reservations/export/", params)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_export_is_admin_only(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get("/api/theatre/reservations/export/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_csv(self):
+        self.client.force_authenticate(user=self.admin_user)
+        response, content = self.export(
+            {"performance": self.performance.id}
+        )
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual([row["seat"] for row in rows], ["1", "2"])
+        self.assertEqual(rows[0]["user_email"], "user@test.com")
+        self.assertEqual(rows[0]["play_title"], "Hamlet")
+
+    def test_export_ndjson_date_range(self):
+        self.client.force_authenticate(user=self.admin_user)
+        _, content = self.export(
+            {"export_format": "ndjson", "from": "2000-01-01"}
+        )
+        self.assertEqual(len(content.splitlines()), 3)
+        self.assertEqual(json.loads(content.splitlines()[0])["row"], 1)
+
+        _, content = self.export({"export_format": "ndjson", "to": "2000-01-01"})
+        self.assertEqual(content, "")
+
+    def test_export_command(self):
+        out = StringIO()
+        call_command(
+            "export_reservations",
+            "--format=ndjson",
+            f"--performance={self.other_performance.id}",
+            stdout=out,
+        )
+        self.assertEqual(len(out.getvalue().splitlines()), 1)
@@ -0,0 +1,123 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import Performance, Play, TheatreHall
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="userpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.plays = [
+            Play.objects.create(title=f"Play {i:02}", description="drama")
+            for i in range(7)
+        ]
+        for play in self.plays:
+            # Performances of a hall cannot overlap.
+            hall = TheatreHall.objects.create(
+                name=play.title, rows=5, seats_in_row=5
+            )
+            for show_time in ("2024-03-10T19:00:00Z", "2024-03-11T19:00:00Z"):
+                Performance.objects.create(
+                    play=play, theatre_hall=hall, show_time=show_time
+                )
+
+    def collect(self, url, params):
+        ids = []
+        response = self.client.get(url, params)
+        while True:
+            ids.extend(item["id"] for item in response.data["results"])
+            if not response.data["next"]:
+                return ids
+            response = self.client.get(response.data["next"])
+
+    def test_performances_pages_are_stable_with_equal_show_times(self):
+        ids = self.collect("/api/theatre/performances/", {"page_size": 3})
+
+        expected = list(
+            Performance.objects.order_by("show_time", "id").values_list(
+                "id", flat=True
+            )
+        )
+        self.assertEqual(ids, expected)
+
+    def test_plays_pages(self):
+        ids = self.collect("/api/theatre/plays/", {"page_size": 2})
+        self.assertEqual(ids, [play.id for play in self.plays])
+
+    def test_search_results_pages(self):
+        ids = self.collect(
+            "/api/theatre/plays/", {"page_size": 2, "search": "drama"}
+        )
+        self.assertEqual(sorted(ids), [play.id for play in self.plays])
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="userpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        play = Play.objects.create(title="Play", description="drama")
+        # Many performances at one show time, in separate halls.
+        for i in range(25):
+            hall = TheatreHall.objects.create(
+                name=f"Hall {i}", rows=5, seats_in_row=5
+            )
+            Performance.objects.create(
+                play=play,
+                theatre_hall=hall,
+                show_time="2024-03-10T19:00:00Z",
+            )
+        self.expected = list(
+            Performance.objects.order_by("show_time", "id").values_list(
+                "id", flat=True
+            )
+        )
+
+    def test_pages_within_equal_show_times_use_no_offset(self):
+        ids, sql = [], []
+        url, params = "/api/theatre/performances/", {"page_size": 4}
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, params)
+            sql.extend(query["sql"] for query in queries.captured_queries)
+            ids.extend(item["id"] for item in response.data["results"])
+            url, params = response.data["next"], None
+
+        self.assertEqual(ids, self.expected)
+        self.assertFalse(any("OFFSET" in query.upper() for query in sql))
+
+    def test_previous_pages_within_equal_show_times(self):
+        url, params = "/api/theatre/performances/", {"page_size": 4}
+        while True:
+            response = self.client.get(url, params)
+            if not response.data["next"]:
+                break
+            url, params = response.data["next"], None
+
+        ids = []
+        while True:
+            ids[:0] = [item["id"] for item in response.data["results"]]
+            if not response.data["previous"]:
+                break
+            response = self.client.get(response.data["previous"])
+
+        self.assertEqual(ids, self.expected)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(
+            "/api/theatre/performances/", {"cursor": "cD1bIngiXQ=="}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
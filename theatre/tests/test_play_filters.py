@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import Actor, Genre, Play
+
+
+class PlayFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="userpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.drama = Genre.objects.create(name="Drama")
+        self.comedy = Genre.objects.create(name="Comedy")
+        self.actor = Actor.objects.create(first_name="Tom", last_name="Hanks")
+
+        self.hamlet = Play.objects.create(title="Hamlet", description="")
+        self.hamlet.genres.add(self.drama, self.comedy)
+        self.hamlet.actors.add(self.actor)
+        self.macbeth = Play.objects.create(title="Macbeth", description="")
+        self.macbeth.genres.add(self.drama)
+
+    def titles(self, params):
+        response = self.client.get("/api/theatre/plays/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [play["title"] for play in response.data["results"]]
+
+    def test_filters_are_combined(self):
+        self.assertEqual(
+            self.titles({"genres": f"{self.drama.id}"}), ["Hamlet", "Macbeth"]
+        )
+        self.assertEqual(
+            self.titles(
+                {"genres": f"{self.drama.id}", "actors": f"{self.actor.id}"}
+            ),
+            ["Hamlet"],
+        )
+        self.assertEqual(
+            self.titles({"genres": f"{self.drama.id}", "title": "mac"}),
+            ["Macbeth"],
+        )
+
+    def test_matching_several_ids_does_not_duplicate_plays(self):
+        with CaptureQueriesContext(connection) as queries:
+            titles = self.titles(
+                {"genres": f"{self.drama.id},{self.comedy.id}"}
+            )
+        self.assertEqual(titles, ["Hamlet", "Macbeth"])
+        play_query = next(
+            query["sql"]
+            for query in queries.captured_queries
+            if 'FROM "theatre_play"' in query["sql"]
+        )
+        self.assertIn("EXISTS", play_query)
+        self.assertNotIn("DISTINCT", play_query)
+
+    def test_invalid_ids(self):
+        response = self.client.get("/api/theatre/plays/", {"genres": "1,x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("genres", response.data)
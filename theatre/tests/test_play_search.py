@@ -0,0 +1,54 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from theatre.models import Actor, Genre, Play
+from theatre.search import search_plays
+
+
+class PlaySearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="userpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.hamlet = Play.objects.create(
+            title="Hamlet", description="Prince of Denmark seeks revenge"
+        )
+        self.lear = Play.objects.create(
+            title="King Lear", description="An old king divides his realm"
+        )
+        self.musical = Play.objects.create(
+            title="Cats", description="A musical inspired by Hamlet jokes"
+        )
+        self.actor = Actor.objects.create(
+            first_name="Ian", last_name="McKellen"
+        )
+        self.lear.actors.add(self.actor)
+        self.lear.genres.add(Genre.objects.create(name="Tragedy"))
+
+    def search(self, query):
+        return [play.title for play in search_plays(Play.objects, query)]
+
+    def test_title_matches_rank_first(self):
+        self.assertEqual(self.search("hamlet"), ["Hamlet", "Cats"])
+
+    def test_search_actors_and_genres(self):
+        self.assertEqual(self.search("mckellen"), ["King Lear"])
+        self.assertEqual(self.search("tragedy king"), ["King Lear"])
+
+    def test_search_document_follows_related_changes(self):
+        self.actor.last_name = "Holm"
+        self.actor.save()
+        self.assertEqual(self.search("holm"), ["King Lear"])
+
+        self.actor.delete()
+        self.assertEqual(self.search("holm"), [])
+
+    def test_search_endpoint(self):
+        response = self.client.get("/api/theatre/plays/", {"search": "king"})
+        self.assertEqual(
+            [play["title"] for play in response.data["results"]], ["King Lear"]
+        )
@@ -0,0 +1,94 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.benchmarks import (
+    API_PREFIX,
+    discover_routes,
+    filtered_plays_params,
+    seed,
+)
+from theatre.cache import get_response_cache
+from theatre import urls
+
+SMALL = {
+    "genres": 2,
+    "actors": 3,
+    "halls": 1,
+    "plays": 2,
+    "performances": 2,
+    "reservations": 2,
+    "tickets_per_reservation": 1,
+}
+LARGE = {
+    "genres": 6,
+    "actors": 20,
+    "halls": 3,
+    "plays": 12,
+    "performances": 15,
+    "reservations": 12,
+    "tickets_per_reservation": 4,
+}
+
+
+class QueryCountTests(TestCase):
+    """Query counts of GET routes must not grow with the amount of data."""
+
+    def query_counts(self, volumes):
+        counts = {}
+        with transaction.atomic():
+            user = seed(volumes)
+            client = APIClient()
+            client.force_authenticate(user=user)
+            for name, url in discover_routes(urls, user):
+                get_response_cache().clear()
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(url)
+                    if response.streaming:
+                        b"".join(response.streaming_content)
+                self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+                counts[name] = len(queries.captured_queries)
+            transaction.set_rollback(True)
+        return counts
+
+    def test_query_counts_do_not_depend_on_data_volume(self):
+        self.assertEqual(self.query_counts(SMALL), self.query_counts(LARGE))
+
+    def filtered_play_list_queries(self, volumes):
+        with transaction.atomic():
+            user = seed(volumes)
+            client = APIClient()
+            client.force_authenticate(user=user)
+            get_response_cache().clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(
+                    f"{API_PREFIX}plays/", filtered_plays_params()
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            transaction.set_rollback(True)
+        return len(queries.captured_queries)
+
+    def test_filtered_play_list_does_not_depend_on_through_tables(self):
+        self.assertEqual(
+            self.filtered_play_list_queries(SMALL),
+            self.filtered_play_list_queries(
+                {**LARGE, "genres_per_play": 4, "actors_per_play": 10}
+            ),
+        )
+
+
+class ExplainEndpointsTests(TestCase):
+    def test_reports_plans_of_every_route(self):
+        out = StringIO()
+        call_command("explain_endpoints", stdout=out, **SMALL)
+
+        output = out.getvalue()
+        self.assertIn("performance-list", output)
+        self.assertIn("sequential scans found", output)
+        self.assertNotIn("seq scan on theatre_performance", output)
+        self.assertNotIn("seq scan on theatre_reservation", output)
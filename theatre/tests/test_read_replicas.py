@@ -0,0 +1,117 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theater_api.db_routers import ReplicaRouter, replica_reads
+from theatre.cache import get_response_cache
+from theatre.models import Genre, Performance, Play, TheatreHall
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTests(TestCase):
+    def test_reads_go_to_replica_only_when_enabled(self):
+        router = ReplicaRouter()
+
+        self.assertIsNone(router.db_for_read(Play))
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Play), "replica")
+            self.assertEqual(router.db_for_write(Play), "default")
+        self.assertIsNone(router.db_for_read(Play))
+
+    def test_replicas_are_not_migrated(self):
+        router = ReplicaRouter()
+
+        self.assertTrue(router.allow_migrate("default", "theatre"))
+        self.assertFalse(router.allow_migrate("replica", "theatre"))
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReadReplicaRoutingTests(TransactionTestCase):
+    # The replica mirrors the default test database. SQLite cannot read
+    # rows another connection has not committed, so nothing is wrapped
+    # in a transaction.
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="userpass123"
+        )
+        self.client.force_authenticate(self.user)
+        hall = TheatreHall.objects.create(name="Hall", rows=5, seats_in_row=5)
+        play = Play.objects.create(title="Hamlet", description="")
+        Genre.objects.create(name="Drama")
+        self.performance = Performance.objects.create(
+            play=play, theatre_hall=hall, show_time="2024-03-10T19:00:00Z"
+        )
+
+    def replica_queries(self, method, url, data=None):
+        with CaptureQueriesContext(connections["replica"]) as queries:
+            response = getattr(self.client, method)(url, data, format="json")
+        return response, len(queries.captured_queries)
+
+    def test_catalog_reads_use_replica(self):
+        for url in (
+            "/api/theatre/plays/",
+            "/api/theatre/genres/",
+            "/api/theatre/performances/",
+            f"/api/theatre/performances/{self.performance.id}/",
+        ):
+            response, replica_queries = self.replica_queries("get", url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertGreater(replica_queries, 0, url)
+
+    def test_reservations_stay_on_primary(self):
+        response, replica_queries = self.replica_queries(
+            "get", "/api/theatre/reservations/"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(replica_queries, 0)
+
+    def test_reads_after_write_stay_on_primary(self):
+        response, _ = self.replica_queries(
+            "post",
+            "/api/theatre/reservations/",
+            {
+                "tickets": [
+                    {
+                        "row": 1,
+                        "seat": 1,
+                        "performance": self.performance.id,
+                    }
+                ]
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        url = f"/api/theatre/performances/{self.performance.id}/"
+        response, replica_queries = self.replica_queries("get", url)
+        self.assertEqual(replica_queries, 0)
+        self.assertEqual(len(response.data["taken_places"]), 1)
+
+        cache.clear()
+        _, replica_queries = self.replica_queries("get", url)
+        self.assertGreater(replica_queries, 0)
+
+    def test_fresh_writes_are_not_cached_from_replica(self):
+        get_response_cache().clear()
+        url = "/api/theatre/genres/"
+        Genre.objects.create(name="Comedy")
+
+        for _ in range(2):
+            response, replica_queries = self.replica_queries("get", url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertGreater(replica_queries, 0)
+
+        with override_settings(READ_REPLICA_PIN_SECONDS=0):
+            Genre.objects.create(name="Opera")
+        self.replica_queries("get", url)
+        response, replica_queries = self.replica_queries("get", url)
+        self.assertEqual(replica_queries, 0)
+        self.assertEqual(len(response.data), 3)
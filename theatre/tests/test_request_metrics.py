@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.metrics import registry
+from theatre.models import Genre
+
+GENRE_URL = reverse("theatre:genre-list")
+METRICS_URL = reverse("theatre:metrics")
+
+
+@override_settings(REQUEST_METRICS_SAMPLE_RATE=1.0)
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="userpass123"
+        )
+        self.admin_user = get_user_model().objects.create_user(
+            email="admin@test.com", password="adminpass123", is_staff=True
+        )
+        Genre.objects.create(name="Drama")
+
+    def test_sampled_response_has_server_timing(self):
+        self.client.force_authenticate(self.user)
+        with self.assertLogs("theatre.metrics", level="INFO") as logs:
+            response = self.client.get(GENRE_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("db;dur=", response["Server-Timing"])
+        self.assertIn("serializer;dur=", response["Server-Timing"])
+        self.assertIn("render;dur=", response["Server-Timing"])
+        self.assertIn('"view": "GenreViewSet.list"', logs.output[0])
+        self.assertIn('"serializer_ms": ', logs.output[0])
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=0.0)
+    def test_unsampled_response_is_untouched(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(GENRE_URL)
+
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(registry.snapshot(), {})
+
+    def test_metrics_are_aggregated_per_action(self):
+        self.client.force_authenticate(self.user)
+        self.client.get(GENRE_URL)
+        self.client.get(GENRE_URL)
+
+        self.client.force_authenticate(self.admin_user)
+        response = self.client.get(METRICS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        genre_list = response.data["views"]["GenreViewSet.list"]
+        self.assertEqual(genre_list["count"], 2)
+        self.assertEqual(
+            sum(genre_list["latency_ms_histogram"].values()), 2
+        )
+        self.assertGreater(genre_list["avg_serializer_ms"], 0)
+        self.assertGreater(genre_list["avg_queries"], 0)
+        self.assertGreater(genre_list["avg_response_bytes"], 0)
+
+    def test_metrics_include_database_connections(self):
+        self.client.force_authenticate(self.admin_user)
+        response = self.client.get(METRICS_URL)
+
+        default = response.data["databases"]["default"]
+        self.assertIn("conn_max_age", default)
+        self.assertIn("connections_opened", default)
+        self.assertIsNone(default["pool"])
+
+    def test_metrics_endpoint_is_admin_only(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(METRICS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
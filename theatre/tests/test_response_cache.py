@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.cache import get_response_cache
+from theatre.models import Actor, Genre, Play
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="userpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.genre = Genre.objects.create(name="Drama")
+
+    def test_cached_list_skips_database(self):
+        first = self.client.get("/api/theatre/genres/")
+
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/theatre/genres/")
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_write_invalidates_list(self):
+        self.client.get("/api/theatre/genres/")
+        with self.captureOnCommitCallbacks(execute=True):
+            Genre.objects.create(name="Comedy")
+
+        response = self.client.get("/api/theatre/genres/")
+        self.assertEqual(len(response.data), 2)
+
+    def test_write_invalidates_list_on_commit(self):
+        self.client.get("/api/theatre/genres/")
+        with self.captureOnCommitCallbacks() as callbacks:
+            Genre.objects.create(name="Comedy")
+
+        with self.assertNumQueries(0):
+            self.client.get("/api/theatre/genres/")
+        for callback in callbacks:
+            callback()
+        response = self.client.get("/api/theatre/genres/")
+        self.assertEqual(len(response.data), 2)
+
+    def test_if_none_match(self):
+        etag = self.client.get("/api/theatre/genres/")["ETag"]
+
+        response = self.client.get(
+            "/api/theatre/genres/", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.genre.name = "Tragedy"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.genre.save()
+        response = self.client.get(
+            "/api/theatre/genres/", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_play_m2m_change_invalidates_list(self):
+        play = Play.objects.create(title="Hamlet", description="Tragedy")
+        self.client.get("/api/theatre/plays/")
+
+        actor = Actor.objects.create(first_name="Tom", last_name="Hanks")
+        with self.captureOnCommitCallbacks(execute=True):
+            play.actors.add(actor)
+            play.genres.add(self.genre)
+
+        response = self.client.get("/api/theatre/plays/")
+        self.assertEqual(response.data["results"][0]["actors"], ["Tom Hanks"])
+        self.assertEqual(response.data["results"][0]["genres"], ["Drama"])
@@ -0,0 +1,307 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from theatre.models import Performance, Play, TheatreHall
+from theatre.schedule import create_schedule_constraint, find_conflicts
+
+PERFORMANCES_URL = "/api/theatre/performances/"
+VALIDATE_URL = "/api/theatre/performances/validate-schedule/"
+
+
+class ScheduleConflictTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = get_user_model().objects.create_user(
+            email="admin@admin.com", password="admin123", is_staff=True
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+        self.play = Play.objects.create(
+            title="Hamlet",
+            description="Tragedy",
+            duration=timedelta(hours=3),
+        )
+        self.short_play = Play.objects.create(
+            title="Sketch", description="Comedy", duration=timedelta(hours=1)
+        )
+        self.hall = TheatreHall.objects.create(
+            name="Main", rows=10, seats_in_row=10
+        )
+        self.other_hall = TheatreHall.objects.create(
+            name="Small", rows=5, seats_in_row=5
+        )
+        self.performance = Performance.objects.create(
+            play=self.play,
+            theatre_hall=self.hall,
+            show_time="2024-03-10T18:00:00Z",
+        )
+
+    def create(self, show_time, play=None, hall=None):
+        return self.client.post(
+            PERFORMANCES_URL,
+            {
+                "play": (play or self.short_play).id,
+                "theatre_hall": (hall or self.hall).id,
+                "show_time": show_time,
+            },
+        )
+
+    def test_end_time_follows_play_duration(self):
+        self.assertEqual(
+            self.performance.end_time,
+            datetime(2024, 3, 10, 21, tzinfo=dt_timezone.utc),
+        )
+
+    def test_overlapping_performance_is_rejected(self):
+        response = self.create("2024-03-10T20:00:00Z")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(self.performance.id), response.data["show_time"][0])
+
+    def test_adjacent_or_other_hall_performances_are_accepted(self):
+        response = self.create("2024-03-10T21:00:00Z")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["end_time"], "2024-03-10T22:00:00Z")
+
+        response = self.create("2024-03-10T17:00:00Z")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.create("2024-03-10T19:00:00Z", hall=self.other_hall)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_moving_a_performance_ignores_its_old_slot(self):
+        response = self.client.patch(
+            f"{PERFORMANCES_URL}{self.performance.id}/",
+            {"show_time": "2024-03-10T19:00:00Z"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["end_time"], "2024-03-10T22:00:00Z")
+
+    def test_longer_play_duration_must_not_overlap(self):
+        self.create("2024-03-10T21:30:00Z")
+
+        response = self.client.patch(
+            f"/api/theatre/plays/{self.play.id}/", {"duration": "04:00:00"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("duration", response.data)
+
+        response = self.client.patch(
+            f"/api/theatre/plays/{self.play.id}/", {"duration": "03:30:00"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.performance.refresh_from_db()
+        self.assertEqual(
+            self.performance.end_time,
+            datetime(2024, 3, 10, 21, 30, tzinfo=dt_timezone.utc),
+        )
+
+    def test_play_save_moves_end_times(self):
+        self.play.duration = timedelta(hours=4)
+        self.play.save()
+
+        self.performance.refresh_from_db()
+        self.assertEqual(
+            self.performance.end_time,
+            datetime(2024, 3, 10, 22, tzinfo=dt_timezone.utc),
+        )
+
+    def test_play_save_rejects_overlapping_duration(self):
+        self.create("2024-03-10T21:30:00Z")
+
+        self.play.duration = timedelta(hours=4)
+        with self.assertRaises(ValidationError):
+            self.play.save()
+
+        self.performance.refresh_from_db()
+        self.assertEqual(
+            self.performance.end_time,
+            datetime(2024, 3, 10, 21, tzinfo=dt_timezone.utc),
+        )
+
+    def test_admin_reports_overlapping_duration_as_form_error(self):
+        self.create("2024-03-10T21:30:00Z")
+        self.admin_user.is_superuser = True
+        self.admin_user.save()
+        client = Client()
+        client.force_login(self.admin_user)
+
+        response = client.post(
+            f"/admin/theatre/play/{self.play.id}/change/",
+            {
+                "title": "Hamlet",
+                "description": "Tragedy",
+                "duration": "04:00:00",
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(
+            response,
+            f"Performance {self.performance.id} would overlap with",
+        )
+        self.play.refresh_from_db()
+        self.assertEqual(self.play.duration, timedelta(hours=3))
+
+    def test_queryset_update_moves_end_times(self):
+        Play.objects.filter(pk=self.play.pk).update(
+            duration=timedelta(hours=1)
+        )
+
+        self.performance.refresh_from_db()
+        self.assertEqual(
+            self.performance.end_time,
+            datetime(2024, 3, 10, 19, tzinfo=dt_timezone.utc),
+        )
+
+    def test_queryset_update_rejects_overlapping_duration(self):
+        self.create("2024-03-10T21:30:00Z")
+
+        with self.assertRaises(ValidationError):
+            Play.objects.filter(pk=self.play.pk).update(
+                duration=timedelta(hours=4)
+            )
+
+        self.play.refresh_from_db()
+        self.assertEqual(self.play.duration, timedelta(hours=3))
+
+    def test_missing_end_times_are_filled_in(self):
+        Performance.objects.update(end_time=None)
+
+        create_schedule_constraint()
+
+        self.performance.refresh_from_db()
+        self.assertEqual(
+            self.performance.end_time,
+            datetime(2024, 3, 10, 21, tzinfo=dt_timezone.utc),
+        )
+
+    def test_validate_schedule(self):
+        proposals = [
+            # Overlaps the stored performance.
+            {
+                "play": self.short_play.id,
+                "theatre_hall": self.hall.id,
+                "show_time": "2024-03-10T20:30:00Z",
+            },
+            {
+                "play": self.short_play.id,
+                "theatre_hall": self.other_hall.id,
+                "show_time": "2024-03-10T20:00:00Z",
+            },
+            # Overlaps the previous proposal.
+            {
+                "play": self.short_play.id,
+                "theatre_hall": self.other_hall.id,
+                "show_time": "2024-03-10T20:59:00Z",
+            },
+            {
+                "play": self.short_play.id,
+                "theatre_hall": self.hall.id,
+                "show_time": "2024-03-10T21:30:00Z",
+            },
+            {
+                "play": self.short_play.id + 100,
+                "theatre_hall": self.hall.id,
+                "show_time": "2024-03-11T21:00:00Z",
+            },
+        ]
+
+        response = self.client.post(
+            VALIDATE_URL, {"performances": proposals}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                "valid": False,
+                "performances": 5,
+                "conflicts": [
+                    {
+                        "index": 0,
+                        "conflicts_with": {
+                            "performance": self.performance.id
+                        },
+                    },
+                    {"index": 2, "conflicts_with": {"index": 1}},
+                ],
+                "errors": [
+                    {"index": 4, "error": "Unknown play or theatre hall."}
+                ],
+            },
+        )
+        self.assertEqual(Performance.objects.count(), 1)
+
+    def test_validate_schedule_is_admin_only(self):
+        user = get_user_model().objects.create_user(
+            email="user@test.com", password="user123"
+        )
+        self.client.force_authenticate(user=user)
+
+        response = self.client.post(
+            VALIDATE_URL, {"performances": []}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_find_conflicts_loads_stored_schedule_once(self):
+        start = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+        proposals = [
+            Performance(
+                theatre_hall_id=self.hall.id,
+                show_time=start + timedelta(hours=2 * slot),
+                end_time=start + timedelta(hours=2 * slot + 2),
+            )
+            for slot in range(2000)
+        ]
+        proposals.append(
+            Performance(
+                theatre_hall_id=self.hall.id,
+                show_time=start + timedelta(hours=1),
+                end_time=start + timedelta(hours=2),
+            )
+        )
+
+        with self.assertNumQueries(1):
+            conflicts = find_conflicts(proposals)
+
+        # The stored performance spans slots 837 and 838.
+        self.assertEqual(
+            conflicts,
+            [
+                {
+                    "index": 837,
+                    "conflicts_with": {"performance": self.performance.id},
+                },
+                {
+                    "index": 838,
+                    "conflicts_with": {"performance": self.performance.id},
+                },
+                {"index": 2000, "conflicts_with": {"index": 0}},
+            ],
+        )
+
+    def test_find_conflicts_reports_a_proposal_once(self):
+        self.create("2024-03-10T22:00:00Z")
+        proposal = Performance(
+            theatre_hall_id=self.hall.id,
+            show_time=datetime(2024, 3, 10, 17, tzinfo=dt_timezone.utc),
+            end_time=datetime(2024, 3, 11, tzinfo=dt_timezone.utc),
+        )
+
+        self.assertEqual(
+            find_conflicts([proposal]),
+            [
+                {
+                    "index": 0,
+                    "conflicts_with": {"performance": self.performance.id},
+                }
+            ],
+        )
@@ -0,0 +1,193 @@
+from io import StringIO
+from tempfile import NamedTemporaryFile
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import Actor, Genre, Performance, Play, TheatreHall
+
+SEASON = {
+    "theatre_halls": [{"name": "Main", "rows": 10, "seats_in_row": 12}],
+    "plays": [
+        {
+            "title": "Hamlet",
+            "description": "Tragedy",
+            "genres": ["Drama", "Tragedy"],
+            "actors": ["Tom Hanks", "Meryl Streep"],
+        },
+        {
+            "title": "Macbeth",
+            "description": "Tragedy",
+            "genres": ["Drama"],
+            "actors": ["Tom Hanks"],
+        },
+    ],
+    "performances": [
+        {
+            "play": "Hamlet",
+            "theatre_hall": "Main",
+            "show_time": "2025-03-10T19:00:00Z",
+        },
+        {
+            "play": "Macbeth",
+            "theatre_hall": "Main",
+            "show_time": "2025-03-11T19:00:00Z",
+        },
+    ],
+}
+
+SEASON_CSV = (
+    "play_title,description,genres,actors,theatre_hall,rows,"
+    "seats_in_row,show_time\n"
+    "Hamlet,Tragedy,Drama;Tragedy,Tom Hanks,Main,10,12,2025-03-10T19:00Z\n"
+    "Hamlet,Tragedy,Drama;Tragedy,Tom Hanks,Main,10,12,2025-03-12T19:00Z\n"
+)
+
+
+class SeasonImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = get_user_model().objects.create_user(
+            email="admin@test.com", password="adminpass123", is_staff=True
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        Genre.objects.create(name="Drama")
+
+    def test_import_json_dedupes_by_name(self):
+        response = self.client.post(
+            "/api/theatre/season-import/", SEASON, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"]["genre"], 1)
+        self.assertIn("total", response.data["timings_ms"])
+
+        self.assertEqual(Genre.objects.count(), 2)
+        self.assertEqual(Actor.objects.count(), 2)
+        self.assertEqual(TheatreHall.objects.count(), 1)
+        self.assertEqual(Performance.objects.count(), 2)
+        hamlet = Play.objects.get(title="Hamlet")
+        self.assertEqual(hamlet.actors.count(), 2)
+        self.assertIn("Meryl Streep", hamlet.search_document)
+
+        self.client.post("/api/theatre/season-import/", SEASON, format="json")
+        self.assertEqual(Play.objects.count(), 2)
+        self.assertEqual(Performance.objects.count(), 2)
+
+    def test_dry_run_saves_nothing(self):
+        response = self.client.post(
+            "/api/theatre/season-import/?dry_run=true", SEASON, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"]["play"], 2)
+        self.assertFalse(Play.objects.exists())
+
+    def test_invalid_reference_rolls_back(self):
+        season = {
+            **SEASON,
+            "performances": [
+                {"play": "Unknown", "theatre_hall": "Main", "show_time": "x"}
+            ],
+        }
+        response = self.client.post(
+            "/api/theatre/season-import/", season, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Play.objects.exists())
+
+    def test_impossible_show_time_is_a_row_error(self):
+        season = {
+            **SEASON,
+            "performances": [
+                {
+                    "play": "Hamlet",
+                    "theatre_hall": "Main",
+                    "show_time": "2024-13-45T19:00:00",
+                }
+            ],
+        }
+        response = self.client.post(
+            "/api/theatre/season-import/", season, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("invalid show_time", response.data["errors"][0])
+        self.assertFalse(Play.objects.exists())
+
+    def post_play(self, **fields):
+        play = {**SEASON["plays"][0], **fields}
+        return self.client.post(
+            "/api/theatre/season-import/",
+            {**SEASON, "plays": [play, SEASON["plays"][1]]},
+            format="json",
+        )
+
+    def test_genres_string_is_a_row_error(self):
+        response = self.post_play(genres="Drama")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["errors"],
+            ["Play 0: genres must be a list of names."],
+        )
+        self.assertFalse(Play.objects.exists())
+
+    def test_actors_string_is_a_row_error(self):
+        response = self.post_play(actors="Tom Hanks")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["errors"],
+            ["Play 0: actors must be a list of names."],
+        )
+        self.assertFalse(Actor.objects.exists())
+
+    def test_non_string_names_are_a_row_error(self):
+        response = self.post_play(genres=["Drama", 7], actors=[{"a": 1}])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["errors"],
+            [
+                "Play 0: genres must be a list of names.",
+                "Play 0: actors must be a list of names.",
+            ],
+        )
+
+    def test_overlapping_performances_roll_back(self):
+        season = {
+            **SEASON,
+            "performances": [
+                *SEASON["performances"],
+                {
+                    "play": "Macbeth",
+                    "theatre_hall": "Main",
+                    "show_time": "2025-03-10T20:00:00Z",
+                },
+            ],
+        }
+        response = self.client.post(
+            "/api/theatre/season-import/", season, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("overlaps", response.data["errors"][0])
+        self.assertFalse(Performance.objects.exists())
+
+    def test_import_csv_upload(self):
+        upload = SimpleUploadedFile("season.csv", SEASON_CSV.encode())
+        response = self.client.post(
+            "/api/theatre/season-import/", {"file": upload}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Performance.objects.count(), 2)
+        self.assertEqual(Play.objects.get().genres.count(), 2)
+
+    def test_import_command_dry_run(self):
+        out = StringIO()
+        with NamedTemporaryFile("w", suffix=".csv") as season_file:
+            season_file.write(SEASON_CSV)
+            season_file.flush()
+            call_command(
+                "import_season", season_file.name, "--dry-run", stdout=out
+            )
+        self.assertIn("Dry run finished", out.getvalue())
+        self.assertFalse(Play.objects.exists())
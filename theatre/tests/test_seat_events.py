@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theatre.broker import get_broker, seat_channel
+from theatre.models import Performance, Play, Reservation, TheatreHall, Ticket
+from theatre.seat_map import SeatMap
+
+
+def parse_event(chunk):
+    name, data = chunk.decode().strip().split("\n")
+    return name.removeprefix("event: "), json.loads(
+        data.removeprefix("data: ")
+    )
+
+
+class SeatMapChangesTests(TestCase):
+    def test_changes_between_maps(self):
+        old = SeatMap(3, 4)
+        old.take(1, 1)
+        old.take(2, 3)
+        new = SeatMap(3, 4, old.to_bytes())
+        new.release(1, 1)
+        new.take(3, 4)
+
+        self.assertEqual(old.changes(new), ([(3, 4)], [(1, 1)]))
+
+
+class SeatEventsTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="userpass123"
+        )
+        self.auth_headers = {
+            "Authorization": f"Bearer {AccessToken.for_user(self.user)}"
+        }
+        hall = TheatreHall.objects.create(name="Hall", rows=3, seats_in_row=4)
+        play = Play.objects.create(title="Hamlet", description="")
+        self.performance = Performance.objects.create(
+            play=play, theatre_hall=hall, show_time="2024-03-10T19:00:00Z"
+        )
+        self.url = (
+            f"/api/theatre/async/performances/{self.performance.id}"
+            f"/seat-events/"
+        )
+
+    def book_seat(self, row, seat):
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(
+                reservation=Reservation.objects.create(user=self.user),
+                performance=self.performance,
+                row=row,
+                seat=seat,
+            )
+
+    async def test_stream_sends_snapshot_then_deltas(self):
+        await sync_to_async(self.book_seat)(1, 1)
+        response = await AsyncClient().get(
+            self.url, headers=self.auth_headers
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = aiter(response.streaming_content)
+
+        name, snapshot = parse_event(await anext(events))
+        self.assertEqual(name, "snapshot")
+        self.assertEqual(snapshot["taken"], 1)
+
+        await sync_to_async(self.book_seat)(2, 3)
+        name, delta = parse_event(
+            await asyncio.wait_for(anext(events), timeout=5)
+        )
+        self.assertEqual(name, "seats")
+        self.assertEqual(delta["taken"], [[2, 3]])
+        self.assertEqual(delta["released"], [])
+
+        channel = seat_channel(self.performance.id)
+        self.assertEqual(get_broker().subscriber_count(channel), 1)
+
+        # ASGI servers cancel the response task when the client leaves.
+        waiting = asyncio.ensure_future(anext(events))
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+        self.assertEqual(get_broker().subscriber_count(channel), 0)
+
+    async def test_missing_performance_returns_404(self):
+        response = await AsyncClient().get(
+            "/api/theatre/async/performances/999/seat-events/",
+            headers=self.auth_headers,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import Performance, TheatreHall, Play, SeatHold, Ticket
+from theatre.seat_map import SeatMap
+
+
+class SeatHoldTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass123"
+        )
+        self.other_user = get_user_model().objects.create_user(
+            email="other@test.com", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.theatre_hall = TheatreHall.objects.create(
+            name="Test Hall", rows=5, seats_in_row=5
+        )
+        self.play = Play.objects.create(
+            title="Test Play", description="Test Description"
+        )
+        self.performance = Performance.objects.create(
+            play=self.play,
+            theatre_hall=self.theatre_hall,
+            show_time="2024-03-10T19:00:00Z",
+        )
+        self.payload = {
+            "performance": self.performance.id,
+            "seats": [{"row": 1, "seat": 1}, {"row": 1, "seat": 2}],
+        }
+
+    def hold(self, payload=None):
+        return self.client.post(
+            "/api/theatre/seat-holds/", payload or self.payload, format="json"
+        )
+
+    def test_hold_and_confirm(self):
+        response = self.hold()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        hold_id = response.data["id"]
+
+        response = self.client.post(
+            f"/api/theatre/seat-holds/{hold_id}/confirm/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["tickets"]), 2)
+        self.assertFalse(SeatHold.objects.exists())
+
+        self.performance.refresh_from_db()
+        seat_map = SeatMap.for_performance(self.performance)
+        self.assertEqual(list(seat_map.taken()), [(1, 1), (1, 2)])
+
+    def test_held_seats_unavailable_to_other_users(self):
+        self.hold()
+
+        self.client.force_authenticate(user=self.other_user)
+        response = self.hold()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(
+            "/api/theatre/reservations/",
+            {
+                "tickets": [
+                    {"row": 1, "seat": 2, "performance": self.performance.id}
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_release_hold(self):
+        hold_id = self.hold().data["id"]
+
+        response = self.client.delete(f"/api/theatre/seat-holds/{hold_id}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.client.force_authenticate(user=self.other_user)
+        self.assertEqual(self.hold().status_code, status.HTTP_201_CREATED)
+
+    def test_expired_hold(self):
+        hold_id = self.hold().data["id"]
+        SeatHold.objects.update(expires_at=timezone.now() - timedelta(1))
+
+        response = self.client.post(
+            f"/api/theatre/seat-holds/{hold_id}/confirm/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(user=self.other_user)
+        self.assertEqual(self.hold().status_code, status.HTTP_201_CREATED)
@@ -0,0 +1,454 @@
+import base64
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from theatre.models import Performance, TheatreHall, Play, Reservation, Ticket
+from theatre.models import HeldSeat, SeatHold
+from theatre.seat_map import SeatMap, best_available, rebuild_seat_map
+
+
+class SeatMapTests(TestCase):
+    def test_take_release_and_encode(self):
+        seat_map = SeatMap(rows=2, seats_in_row=5)
+        seat_map.take(1, 1)
+        seat_map.take(2, 4)
+        seat_map.take(2, 5)
+
+        self.assertTrue(seat_map.is_taken(2, 4))
+        self.assertEqual(list(seat_map.taken()), [(1, 1), (2, 4), (2, 5)])
+        self.assertEqual(seat_map.taken_count, 3)
+        self.assertEqual(seat_map.to_runs(), [0, 1, 7, 2])
+
+        seat_map.release(1, 1)
+        self.assertEqual(seat_map.to_runs(), [8, 2])
+        self.assertEqual(seat_map.to_bytes(), bytes([0b00000000, 0b11000000]))
+
+    def test_seat_outside_hall(self):
+        seat_map = SeatMap(rows=2, seats_in_row=5)
+        with self.assertRaises(IndexError):
+            seat_map.take(3, 1)
+
+    def test_free_intervals(self):
+        seat_map = SeatMap(rows=3, seats_in_row=5)
+        for row, seat in ((1, 1), (1, 4), (2, 5)):
+            seat_map.take(row, seat)
+        for seat in range(1, 6):
+            seat_map.take(3, seat)
+
+        self.assertEqual(
+            seat_map.free_intervals(), [[(2, 3), (5, 5)], [(1, 4)], []]
+        )
+
+    def test_best_available_prefers_row_then_centre(self):
+        seat_map = SeatMap(rows=6, seats_in_row=8)
+        for seat in range(3, 7):
+            seat_map.take(2, seat)
+
+        self.assertEqual(best_available(seat_map, 2), [(2, 1), (2, 2)])
+        self.assertEqual(
+            best_available(seat_map, 3), [(1, 3), (1, 4), (1, 5)]
+        )
+
+        for seat in range(1, 9):
+            seat_map.take(1, seat)
+        self.assertEqual(
+            best_available(seat_map, 3), [(3, 3), (3, 4), (3, 5)]
+        )
+        self.assertIsNone(best_available(seat_map, 9))
+
+
+class PerformanceSeatMapTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.theatre_hall = TheatreHall.objects.create(
+            name="Test Hall", rows=3, seats_in_row=4
+        )
+        self.play = Play.objects.create(
+            title="Test Play", description="Test Description"
+        )
+        self.performance = Performance.objects.create(
+            play=self.play,
+            theatre_hall=self.theatre_hall,
+            show_time="2024-03-10T19:00:00Z",
+        )
+
+    def test_reservation_updates_seat_map(self):
+        payload = {
+            "tickets": [
+                {"row": 1, "seat": 2, "performance": self.performance.id},
+                {"row": 3, "seat": 4, "performance": self.performance.id},
+            ]
+        }
+        response = self.client.post(
+            "/api/theatre/reservations/", payload, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get(
+            f"/api/theatre/performances/{self.performance.id}/seat-map/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["taken"], 2)
+        self.assertEqual(
+            base64.b64decode(response.data["data"]),
+            bytes([0b01000000, 0b00010000]),
+        )
+
+        response = self.client.get(
+            f"/api/theatre/performances/{self.performance.id}/seat-map/",
+            {"encoding": "rle"},
+        )
+        self.assertEqual(response.data["data"], [1, 1, 9, 1])
+
+    def test_detail_taken_places_follow_ticket_writes(self):
+        reservation = Reservation.objects.create(user=self.user)
+        ticket = Ticket.objects.create(
+            reservation=reservation, performance=self.performance, row=2, seat=3
+        )
+
+        response = self.client.get(
+            f"/api/theatre/performances/{self.performance.id}/"
+        )
+        self.assertEqual(response.data["taken_places"], [{"row": 2, "seat": 3}])
+
+        ticket.delete()
+        response = self.client.get(
+            f"/api/theatre/performances/{self.performance.id}/"
+        )
+        self.assertEqual(response.data["taken_places"], [])
+
+
+class TicketsSoldCounterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.theatre_hall = TheatreHall.objects.create(
+            name="Test Hall", rows=3, seats_in_row=4
+        )
+        self.play = Play.objects.create(
+            title="Test Play", description="Test Description"
+        )
+        self.performance = Performance.objects.create(
+            play=self.play,
+            theatre_hall=self.theatre_hall,
+            show_time="2024-03-10T19:00:00Z",
+        )
+
+    def test_counter_follows_ticket_writes(self):
+        self.client.post(
+            "/api/theatre/reservations/",
+            {
+                "tickets": [
+                    {"row": 1, "seat": 1, "performance": self.performance.id},
+                    {"row": 1, "seat": 2, "performance": self.performance.id},
+                ]
+            },
+            format="json",
+        )
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 2)
+
+        Ticket.objects.filter(row=1, seat=1).get().delete()
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 1)
+
+        response = self.client.get("/api/theatre/performances/")
+        self.assertEqual(response.data["results"][0]["available_seats"], 11)
+
+    def test_reconcile_fixes_drift(self):
+        reservation = Reservation.objects.create(user=self.user)
+        Ticket.objects.create(
+            reservation=reservation, performance=self.performance, row=3, seat=1
+        )
+        Performance.objects.update(seat_map=b"", tickets_sold=5)
+
+        out = StringIO()
+        call_command("reconcile_seat_counters", "--dry-run", stdout=out)
+        self.assertIn("Found 1 with drift", out.getvalue())
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 5)
+
+        call_command("reconcile_seat_counters", stdout=out)
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 1)
+        self.assertEqual(
+            list(SeatMap.for_performance(self.performance).taken()), [(3, 1)]
+        )
+
+
+class HallResizeTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass123"
+        )
+        self.theatre_hall = TheatreHall.objects.create(
+            name="Test Hall", rows=3, seats_in_row=4
+        )
+        self.performance = Performance.objects.create(
+            play=Play.objects.create(title="Test Play", description="Test"),
+            theatre_hall=self.theatre_hall,
+            show_time="2024-03-10T19:00:00Z",
+        )
+        Ticket.objects.create(
+            reservation=Reservation.objects.create(user=self.user),
+            performance=self.performance,
+            row=2,
+            seat=3,
+        )
+
+    def taken(self):
+        self.performance.refresh_from_db()
+        return list(SeatMap.for_performance(self.performance).taken())
+
+    def test_resizing_keeps_sold_seats_in_place(self):
+        self.theatre_hall.rows = 2
+        self.theatre_hall.seats_in_row = 7
+        self.theatre_hall.save()
+
+        self.assertEqual(self.taken(), [(2, 3)])
+        self.assertEqual(self.performance.tickets_sold, 1)
+
+    def test_resizing_below_sold_seats_is_rejected(self):
+        self.theatre_hall.seats_in_row = 2
+        with self.assertRaises(ValidationError):
+            self.theatre_hall.save()
+
+        self.theatre_hall.refresh_from_db()
+        self.assertEqual(self.theatre_hall.seats_in_row, 4)
+        self.assertEqual(self.taken(), [(2, 3)])
+
+    def test_resizing_below_held_seats_is_rejected(self):
+        hold = SeatHold.objects.create(
+            user=self.user,
+            performance=self.performance,
+            expires_at=timezone.now() + timedelta(minutes=10),
+        )
+        HeldSeat.objects.create(
+            hold=hold, performance=self.performance, row=3, seat=1
+        )
+
+        self.theatre_hall.rows = 2
+        with self.assertRaises(ValidationError):
+            self.theatre_hall.save()
+
+    def test_admin_reports_rejected_resize_as_form_error(self):
+        self.user.is_staff = self.user.is_superuser = True
+        self.user.save()
+        self.client.force_login(self.user)
+
+        response = self.client.post(
+            f"/admin/theatre/theatrehall/{self.theatre_hall.id}/change/",
+            {"name": "Test Hall", "rows": 3, "seats_in_row": 2},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(
+            response, "1 sold or held seats would be outside of the resized"
+        )
+        self.theatre_hall.refresh_from_db()
+        self.assertEqual(self.theatre_hall.seats_in_row, 4)
+
+    def test_rebuild_skips_tickets_outside_the_hall(self):
+        TheatreHall.objects.update(rows=1)
+        self.performance.refresh_from_db()
+
+        self.assertEqual(list(rebuild_seat_map(self.performance).taken()), [])
+
+
+class PerformanceMoveTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            email="admin@admin.com", password="admin123", is_staff=True
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.small_hall = TheatreHall.objects.create(
+            name="Small Hall", rows=2, seats_in_row=2
+        )
+        self.performance = Performance.objects.create(
+            play=Play.objects.create(title="Test Play", description="Test"),
+            theatre_hall=self.small_hall,
+            show_time="2024-03-10T19:00:00Z",
+        )
+        Ticket.objects.create(
+            reservation=Reservation.objects.create(user=self.admin),
+            performance=self.performance,
+            row=2,
+            seat=2,
+        )
+
+    def move(self, theatre_hall):
+        return self.client.patch(
+            f"/api/theatre/performances/{self.performance.id}/",
+            {"theatre_hall": theatre_hall.id},
+            format="json",
+        )
+
+    def test_moving_keeps_sold_seats_in_place(self):
+        large_hall = TheatreHall.objects.create(
+            name="Large Hall", rows=3, seats_in_row=5
+        )
+
+        response = self.move(large_hall)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(
+            f"/api/theatre/performances/{self.performance.id}/"
+        )
+        self.assertEqual(response.data["taken_places"], [{"row": 2, "seat": 2}])
+        response = self.client.post(
+            "/api/theatre/reservations/",
+            {
+                "tickets": [
+                    {"row": 2, "seat": 2, "performance": self.performance.id}
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_moving_below_sold_seats_is_rejected(self):
+        tiny_hall = TheatreHall.objects.create(
+            name="Tiny Hall", rows=1, seats_in_row=5
+        )
+
+        response = self.move(tiny_hall)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("theatre_hall", response.data)
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.theatre_hall, self.small_hall)
+
+    def test_admin_reports_rejected_move_as_form_error(self):
+        self.admin.is_superuser = True
+        self.admin.save()
+        self.client = Client()
+        self.client.force_login(self.admin)
+        tiny_hall = TheatreHall.objects.create(
+            name="Tiny Hall", rows=1, seats_in_row=5
+        )
+
+        response = self.client.post(
+            f"/admin/theatre/performance/{self.performance.id}/change/",
+            {
+                "play": self.performance.play_id,
+                "theatre_hall": tiny_hall.id,
+                "show_time_0": "2024-03-10",
+                "show_time_1": "19:00:00",
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(
+            response, "1 sold or held seats would be outside of the new"
+        )
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.theatre_hall, self.small_hall)
+
+    def test_saving_a_move_below_sold_seats_is_rejected(self):
+        self.performance.theatre_hall = TheatreHall.objects.create(
+            name="Tiny Hall", rows=1, seats_in_row=5
+        )
+        with self.assertRaises(ValidationError):
+            self.performance.save()
+
+
+class BestAvailableTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass123"
+        )
+        self.other_user = get_user_model().objects.create_user(
+            email="other@test.com", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.theatre_hall = TheatreHall.objects.create(
+            name="Test Hall", rows=3, seats_in_row=4
+        )
+        self.play = Play.objects.create(
+            title="Test Play", description="Test Description"
+        )
+        self.performance = Performance.objects.create(
+            play=self.play,
+            theatre_hall=self.theatre_hall,
+            show_time="2024-03-10T19:00:00Z",
+        )
+
+    def book(self, seats):
+        return self.client.post(
+            "/api/theatre/reservations/best-available/",
+            {"performance": self.performance.id, "seats": seats},
+            format="json",
+        )
+
+    @staticmethod
+    def booked_seats(response):
+        return [
+            (ticket["row"], ticket["seat"])
+            for ticket in response.data["tickets"]
+        ]
+
+    def test_books_adjacent_seats(self):
+        response = self.book(2)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.booked_seats(response), [(1, 2), (1, 3)])
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 2)
+
+        response = self.book(4)
+        self.assertEqual(
+            self.booked_seats(response),
+            [(2, 1), (2, 2), (2, 3), (2, 4)],
+        )
+
+    def test_skips_seats_held_by_other_users(self):
+        hold = SeatHold.objects.create(
+            user=self.other_user,
+            performance=self.performance,
+            expires_at=timezone.now() + timedelta(minutes=5),
+        )
+        HeldSeat.objects.create(
+            hold=hold, performance=self.performance, row=1, seat=3
+        )
+
+        response = self.book(2)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.booked_seats(response), [(1, 1), (1, 2)])
+
+    def test_no_block_available(self):
+        response = self.book(5)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("seats", response.data)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_unknown_performance(self):
+        response = self.client.post(
+            "/api/theatre/reservations/best-available/",
+            {"performance": self.performance.id + 1, "seats": 1},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("performance", response.data)
@@ -0,0 +1,89 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+GENRE_URL = "/api/theatre/genres/"
+
+
+class StatelessJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="userpass123"
+        )
+
+    def obtain_token(self):
+        response = self.client.post(
+            "/api/user/token/",
+            {"email": "user@test.com", "password": "userpass123"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["access"]
+
+    def get(self, url, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        user_table = get_user_model()._meta.db_table
+        user_queries = [
+            query
+            for query in queries.captured_queries
+            if user_table in query["sql"]
+        ]
+        return response, len(user_queries)
+
+    def test_token_contains_staff_claim(self):
+        token = AccessToken(self.obtain_token())
+
+        self.assertIs(token["is_staff"], False)
+
+    def test_catalog_reads_skip_user_lookup(self):
+        token = self.obtain_token()
+
+        response, user_queries = self.get(GENRE_URL, token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries, 1)
+
+        response, user_queries = self.get(GENRE_URL, token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries, 0)
+
+    def test_deactivated_user_is_rejected(self):
+        token = self.obtain_token()
+        self.get(GENRE_URL, token)
+
+        self.user.is_active = False
+        self.user.save()
+
+        response, _ = self.get(GENRE_URL, token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_outdated_staff_claim_is_rejected(self):
+        token = self.obtain_token()
+
+        self.user.is_staff = True
+        self.user.save()
+
+        response, _ = self.get(GENRE_URL, token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_tokens_without_claims_load_the_user(self):
+        token = AccessToken.for_user(self.user)
+
+        response, user_queries = self.get(GENRE_URL, token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries, 1)
+
+    def test_reservations_still_load_the_user(self):
+        response, user_queries = self.get(
+            "/api/theatre/reservations/", self.obtain_token()
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries, 1)
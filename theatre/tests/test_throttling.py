@@ -0,0 +1,103 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import Performance, Play, TheatreHall
+from theatre.throttling import ScopedFixedWindowThrottle
+
+RATES = {
+    "anon": "2/minute",
+    "user": "2/minute",
+    "catalog": "5/minute",
+    "reservations": "1/minute",
+}
+
+
+@override_settings(
+    REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_RATES": RATES,
+    }
+)
+class ScopedFixedWindowThrottleTests(TestCase):
+    def setUp(self):
+        caches[settings.THROTTLE_CACHE_ALIAS].clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="userpass123"
+        )
+        self.client.force_authenticate(self.user)
+        hall = TheatreHall.objects.create(name="Hall", rows=5, seats_in_row=5)
+        play = Play.objects.create(title="Hamlet", description="")
+        self.performance = Performance.objects.create(
+            play=play, theatre_hall=hall, show_time="2024-03-10T19:00:00Z"
+        )
+
+    def reserve(self, seat):
+        return self.client.post(
+            "/api/theatre/reservations/",
+            {
+                "tickets": [
+                    {
+                        "row": 1,
+                        "seat": seat,
+                        "performance": self.performance.id,
+                    }
+                ]
+            },
+            format="json",
+        )
+
+    def test_catalog_reads_use_their_own_looser_limit(self):
+        for _ in range(5):
+            response = self.client.get("/api/theatre/plays/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get("/api/theatre/genres/")
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertIn("Retry-After", response)
+
+        response = self.client.get("/api/theatre/reservations/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_reservation_create_is_stricter(self):
+        self.assertEqual(self.reserve(1).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            self.reserve(2).status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+
+        response = self.client.get("/api/theatre/reservations/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_limits_are_per_user(self):
+        self.reserve(1)
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="other@test.com", password="otherpass123"
+            )
+        )
+
+        self.assertEqual(self.reserve(2).status_code, status.HTTP_201_CREATED)
+
+    def test_window_is_a_single_counter(self):
+        with mock.patch.object(
+            ScopedFixedWindowThrottle, "timer", lambda self: 150.0
+        ):
+            self.client.get("/api/theatre/plays/")
+            self.client.get("/api/theatre/plays/")
+
+        # 150 seconds fall into the third one-minute window.
+        self.assertEqual(
+            caches[settings.THROTTLE_CACHE_ALIAS].get(
+                f"throttle_catalog_{self.user.pk}:2"
+            ),
+            2,
+        )
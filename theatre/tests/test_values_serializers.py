@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from theatre.cache import get_response_cache
+from theatre.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+from theatre.renderers import FastJSONRenderer
+
+
+class FastListSerializationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="userpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        genres = [
+            Genre.objects.create(name=name)
+            for name in ("Drama", "Comédie", "Line\u2028break")
+        ]
+        actors = [
+            Actor.objects.create(first_name="Anna", last_name="Łukasz"),
+            Actor.objects.create(first_name="John", last_name='"Quoted"'),
+        ]
+        hall = TheatreHall.objects.create(name="Blue", rows=5, seats_in_row=6)
+        self.reservation = Reservation.objects.create(user=self.user)
+        start = timezone.now().replace(microsecond=123456)
+        for i in range(5):
+            play = Play.objects.create(
+                title=f"Play {i} ✓", description=f"Drama\n{i}"
+            )
+            play.genres.set(genres[: i % 3 + 1])
+            play.actors.set(actors[: i % 2 + 1])
+            performance = Performance.objects.create(
+                play=play,
+                theatre_hall=hall,
+                show_time=start + timedelta(hours=3 * i),
+            )
+            Ticket.objects.create(
+                row=i + 1,
+                seat=2,
+                performance=performance,
+                reservation=self.reservation,
+            )
+        Play.objects.create(title="Without cast", description="Empty")
+
+    def get_content(self, url, params=None, fast=False):
+        get_response_cache().clear()
+        with override_settings(FAST_LIST_SERIALIZATION=fast):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assert_identical_pages(self, url, params):
+        while url:
+            regular = self.get_content(url, params)
+            fast = self.get_content(url, params, fast=True)
+            self.assertEqual(fast.content, regular.content)
+            url, params = regular.data["next"], None
+
+    def test_performance_list(self):
+        self.assert_identical_pages(
+            "/api/theatre/performances/", {"page_size": 2}
+        )
+
+    def test_filtered_performance_list(self):
+        genre = Genre.objects.get(name="Comédie")
+        self.assert_identical_pages(
+            "/api/theatre/performances/",
+            {"page_size": 2, "genre": str(genre.id)},
+        )
+
+    def test_play_list(self):
+        self.assert_identical_pages("/api/theatre/plays/", {"page_size": 2})
+
+    def test_play_search(self):
+        self.assert_identical_pages(
+            "/api/theatre/plays/", {"page_size": 2, "search": "drama"}
+        )
+
+    def test_reservation_tickets(self):
+        url = f"/api/theatre/reservations/{self.reservation.id}/"
+        self.assertEqual(
+            self.get_content(url, fast=True).content,
+            self.get_content(url).content,
+        )
+
+    def test_fast_list_does_not_instantiate_serializers(self):
+        with override_settings(FAST_LIST_SERIALIZATION=True):
+            with self.assertNumQueries(1):
+                response = self.client.get("/api/theatre/performances/")
+            self.assertIsInstance(response.data["results"][0], dict)
+            self.assertIsInstance(
+                response.accepted_renderer, FastJSONRenderer
+            )
+
+
+class FastJSONRendererTests(TestCase):
+    def test_matches_json_renderer(self):
+        data = {
+            "text": "Tab\t, quote \", \u2028 and \u2029 ✓",
+            "numbers": [0, -1, 2**63 - 1, None, True],
+            "time": timezone.now(),
+            "nested": {"empty": [], "tuple": (1, 2)},
+        }
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(data)
+        )
+
+    def test_falls_back_for_large_integers(self):
+        data = {"big": 2**70}
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(data)
+        )
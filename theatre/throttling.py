@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class ScopedFixedWindowThrottle(SimpleRateThrottle):
+    """
+    Count requests per client in fixed time windows with one atomic
+    ``add``/``incr`` on the ``THROTTLE_CACHE_ALIAS`` cache, so limits are
+    shared by all processes when that cache is Redis.
+
+    The rate comes from ``DEFAULT_THROTTLE_RATES[scope]``. A view picks its
+    scope with ``throttle_scope``, either a string or a mapping of viewset
+    actions to scopes; other requests use the ``user`` or ``anon`` scope.
+    """
+
+    def __init__(self):
+        # The scope, and so the rate, depends on the view.
+        self.window_end = None
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def get_scope(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        if isinstance(scope, dict):
+            scope = scope.get(getattr(view, "action", None))
+        if scope:
+            return scope
+        return "user" if request.user.is_authenticated else "anon"
+
+    def get_cache_key(self, request, view):
+        if request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+    def allow_request(self, request, view):
+        self.scope = self.get_scope(request, view)
+        try:
+            self.rate = api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f"No default throttle rate set for '{self.scope}' scope"
+            )
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.window_end = (window + 1) * self.duration
+        key = f"{self.get_cache_key(request, view)}:{window}"
+
+        if self.cache.add(key, 1, timeout=self.duration):
+            count = 1
+        else:
+            try:
+                count = self.cache.incr(key)
+            except ValueError:
+                # The window expired between add() and incr().
+                self.cache.set(key, 1, timeout=self.duration)
+                count = 1
+        return count <= self.num_requests
+
+    def wait(self):
+        return max(0, self.window_end - self.timer())
@@ -1,6 +1,12 @@
 from django.urls import path, include
 from rest_framework import routers
 
+from theatre.async_views import (
+    AsyncPerformanceDetailView,
+    AsyncPerformanceListView,
+    AsyncSeatEventsView,
+    AsyncSeatMapView,
+)
 from theatre.views import (
     TheatreHallViewSet,
     PlayViewSet,
@@ -8,6 +14,14 @@ from theatre.views import (
     GenreViewSet,
     PerformanceViewSet,
     ReservationViewSet,
+    SeatHoldViewSet,
+    SeasonImportView,
+    MetricsView,
+    SalesAnalyticsView,
+    OccupancyAnalyticsView,
+    TopPlaysAnalyticsView,
+    TopActorsAnalyticsView,
+    TopGenresAnalyticsView,
 )
 
 
@@ -18,7 +32,57 @@ router.register("actors", ActorViewSet)
 router.register("genres", GenreViewSet)
 router.register("performances", PerformanceViewSet)
 router.register("reservations", ReservationViewSet)
+router.register("seat-holds", SeatHoldViewSet)
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path("season-import/", SeasonImportView.as_view(), name="season-import"),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+    path(
+        "analytics/sales/",
+        SalesAnalyticsView.as_view(),
+        name="analytics-sales",
+    ),
+    path(
+        "analytics/occupancy/",
+        OccupancyAnalyticsView.as_view(),
+        name="analytics-occupancy",
+    ),
+    path(
+        "analytics/top-plays/",
+        TopPlaysAnalyticsView.as_view(),
+        name="analytics-top-plays",
+    ),
+    path(
+        "analytics/top-actors/",
+        TopActorsAnalyticsView.as_view(),
+        name="analytics-top-actors",
+    ),
+    path(
+        "analytics/top-genres/",
+        TopGenresAnalyticsView.as_view(),
+        name="analytics-top-genres",
+    ),
+    path(
+        "async/performances/",
+        AsyncPerformanceListView.as_view(),
+        name="async-performance-list",
+    ),
+    path(
+        "async/performances/<int:pk>/",
+        AsyncPerformanceDetailView.as_view(),
+        name="async-performance-detail",
+    ),
+    path(
+        "async/performances/<int:pk>/seat-map/",
+        AsyncSeatMapView.as_view(),
+        name="async-performance-seat-map",
+    ),
+    path(
+        "async/performances/<int:pk>/seat-events/",
+        AsyncSeatEventsView.as_view(),
+        name="async-performance-seat-events",
+    ),
+    path("", include(router.urls)),
+]
 
 app_name = "theatre"
@@ -0,0 +1,185 @@
+from django.conf import settings
+from django.db.models import F
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from theatre.middleware import time_serialization
+from theatre.models import Actor, Genre
+from theatre.renderers import FastJSONRenderer
+
+serialize_datetime = serializers.DateTimeField().to_representation
+
+
+def _build(row, plan):
+    item = {}
+    for key, column, convert in plan:
+        if isinstance(column, list):
+            item[key] = _build(row, column)
+        elif column is None:
+            item[key] = []
+        else:
+            value = row[column]
+            item[key] = (
+                value if convert is None or value is None else convert(value)
+            )
+    return item
+
+
+class ValuesSerializer:
+    """
+    Build the representation of a list serializer from ``values()`` rows
+    instead of model instances. Fields are compiled once into a plan of
+    ``(key, column, converter)`` entries, so serializing a row is a dict
+    lookup per field plus a conversion where the serializer field's
+    representation differs from the database value.
+
+    ``fields`` are ``(key, source)`` or ``(key, source, converter)`` tuples
+    in the serializer's field order. A source is a ``values()`` lookup, an
+    expression, a tuple of nested fields, or ``None`` for a key listed in
+    ``many``: a mapping of keys to functions returning the
+    ``(row id, value)`` pairs of a page of row ids, in the order the
+    serializer would list them.
+    """
+
+    def __init__(self, *fields, many=None):
+        self.lookups = []
+        self.expressions = {}
+        self.many = many or {}
+        self.plan = self._compile(fields)
+
+    def _compile(self, fields):
+        plan = []
+        for key, source, *converter in fields:
+            if isinstance(source, tuple):
+                plan.append((key, self._compile(source), None))
+                continue
+            if source is None:
+                column = None
+            elif isinstance(source, str):
+                column = source
+                self.lookups.append(source)
+            else:
+                column = f"_{len(self.expressions)}"
+                self.expressions[column] = source
+            plan.append((key, column, converter[0] if converter else None))
+        return plan
+
+    def values(self, queryset, extra=()):
+        """
+        Select the columns of the plan, plus the ``extra`` lookups that
+        pagination needs.
+        """
+        lookups = [
+            *self.lookups,
+            *(lookup for lookup in extra if lookup not in self.lookups),
+        ]
+        return queryset.values(*lookups, **self.expressions)
+
+    def to_representation(self, rows):
+        items = [_build(row, self.plan) for row in rows]
+        if self.many and items:
+            by_id = {row["id"]: item for row, item in zip(rows, items)}
+            for key, load in self.many.items():
+                for row_id, value in load(list(by_id)):
+                    by_id[row_id][key].append(value)
+        return items
+
+
+def _performance_fields(prefix="", available_seats=True):
+    fields = (
+        ("id", f"{prefix}id"),
+        ("show_time", f"{prefix}show_time", serialize_datetime),
+        ("play", f"{prefix}play"),
+        ("theatre_hall", f"{prefix}theatre_hall"),
+        ("play_title", f"{prefix}play__title"),
+        ("theatre_hall_name", f"{prefix}theatre_hall__name"),
+        (
+            "theatre_hall_total_seats",
+            F(f"{prefix}theatre_hall__rows")
+            * F(f"{prefix}theatre_hall__seats_in_row"),
+        ),
+    )
+    if available_seats:
+        fields += (("available_seats", f"{prefix}available_seats"),)
+    return fields
+
+
+def _play_genres(play_ids):
+    return Genre.objects.filter(play__in=play_ids).values_list("play", "name")
+
+
+def _play_actors(play_ids):
+    return (
+        (play_id, f"{first_name} {last_name}")
+        for play_id, first_name, last_name in Actor.objects.filter(
+            play__in=play_ids
+        ).values_list("play", "first_name", "last_name")
+    )
+
+
+# Same output as PerformanceListSerializer.
+PERFORMANCE_LIST = ValuesSerializer(*_performance_fields())
+
+# Same output as PlayListSerializer.
+PLAY_LIST = ValuesSerializer(
+    ("id", "id"),
+    ("title", "title"),
+    ("description", "description"),
+    ("genres", None),
+    ("actors", None),
+    many={"genres": _play_genres, "actors": _play_actors},
+)
+
+# Same output as TicketListSerializer of a reservation's tickets, whose
+# performances are not annotated with their available seats.
+TICKET_LIST = ValuesSerializer(
+    ("id", "id"),
+    ("row", "row"),
+    ("seat", "seat"),
+    ("performance", _performance_fields("performance__", False)),
+)
+
+
+class ValuesListMixin:
+    """
+    Serve the list action from ``values_serializer`` and render
+    ``fast_actions`` with ``FastJSONRenderer`` when
+    ``FAST_LIST_SERIALIZATION`` is enabled. Responses are identical to the
+    ones of the regular serializers and renderer.
+    """
+
+    values_serializer = None
+    fast_actions = ("list",)
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if (
+            settings.FAST_LIST_SERIALIZATION
+            and self.action in self.fast_actions
+        ):
+            return [
+                FastJSONRenderer() if type(renderer) is JSONRenderer
+                else renderer
+                for renderer in renderers
+            ]
+        return renderers
+
+    def list(self, request, *args, **kwargs):
+        if (
+            not settings.FAST_LIST_SERIALIZATION
+            or self.values_serializer is None
+        ):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = self.paginator.get_ordering(request, queryset, self)
+        rows = self.paginate_queryset(
+            self.values_serializer.values(
+                queryset, [field.lstrip("-") for field in ordering]
+            )
+        )
+        return self.get_paginated_response(
+            time_serialization(self.values_serializer.to_representation)(
+                rows
+            )
+        )
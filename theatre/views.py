@@ -1,11 +1,13 @@
-from datetime import datetime
-
-from django.db.models import F, Count
+from django.conf import settings
+from django.db.models import Count, F, Min
+from django.http import StreamingHttpResponse
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import mixins, viewsets, status
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 
 from theatre.models import (
@@ -16,9 +18,43 @@ from theatre.models import (
     Performance,
     Reservation,
     Ticket,
+    SeatHold,
+)
+from theatre.analytics import (
+    occupancy_by_hall,
+    refreshed_until,
+    sales_over_time,
+    top_actors,
+    top_genres,
+    top_plays,
+)
+from theatre.authentication import StatelessJWTAuthentication
+from theatre.cache import CachedResponseMixin
+from theatre.export import EXPORT_FORMATS, export_rows, iter_export
+from theatre.filters import (
+    filter_performances,
+    filter_plays,
+    params_to_ints,
+    parse_date_param,
 )
+from theatre.holds import confirm_hold
+from theatre.importer import SeasonImporter, parse_season
+from theatre.metrics import database_stats, registry
+from theatre.middleware import SerializerTimingMixin, time_serialization
+from theatre.pagination import KeysetCursorPagination
 from theatre.permissions import IsAdminOrIfAuthenticatedReadOnly
+from theatre.replicas import ReadReplicaMixin
+from theatre.schedule import performance_calendar, validate_schedule
+from theatre.seat_map import SEAT_MAP_ENCODINGS, seat_map_data
+from theatre.values_serializers import (
+    PERFORMANCE_LIST,
+    PLAY_LIST,
+    TICKET_LIST,
+    ValuesListMixin,
+    serialize_datetime,
+)
 from theatre.serializers import (
+    BestAvailableSerializer,
     TheatreHallSerializer,
     PlaySerializer,
     ActorSerializer,
@@ -32,65 +68,90 @@ from theatre.serializers import (
     PerformanceDetailSerializer,
     ReservationListSerializer,
     ReservationDetailSerializer,
+    ScheduleValidationSerializer,
+    SeatHoldSerializer,
 )
 
 
 class TheatreHallViewSet(
+    ReadReplicaMixin,
+    CachedResponseMixin,
+    SerializerTimingMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
 ):
+    cache_models = (TheatreHall,)
     queryset = TheatreHall.objects.all()
     serializer_class = TheatreHallSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    authentication_classes = (StatelessJWTAuthentication,)
+    throttle_scope = "catalog"
 
 
-class PlayViewSet(viewsets.ModelViewSet):
+class PlayPagination(KeysetCursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("title", "id")
+
+    def get_ordering(self, request, queryset, view):
+        if request.query_params.get("search"):
+            return ("-search_rank", "id")
+        return self.ordering
+
+
+class PlayViewSet(
+    ReadReplicaMixin,
+    CachedResponseMixin,
+    SerializerTimingMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
     """
     List all plays, or retrieve a single play by title.
-    Optionally, filter by title, genres(id), or actors(id).
+    Optionally, filter by title, genres(id), or actors(id),
+    or search by relevance over titles, descriptions, actors and genres.
     """
 
+    cache_models = (Play, Actor, Genre)
+
     queryset = Play.objects.prefetch_related("genres", "actors")
     serializer_class = PlaySerializer
+    values_serializer = PLAY_LIST
+    pagination_class = PlayPagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
-
-    @staticmethod
-    def _params_to_ints(qs):
-        return [int(str_id) for str_id in qs.split(",")]
+    authentication_classes = (StatelessJWTAuthentication,)
+    throttle_scope = "catalog"
 
     @extend_schema(
         parameters=[
             OpenApiParameter(name='title', type=str),
             OpenApiParameter(name='genres', type=str),
             OpenApiParameter(name='actors', type=str),
+            OpenApiParameter(name='search', type=str),
         ]
     )
     def list(self, request, *args, **kwargs):
         """
-            Returns filtered queryset based on query parameters:
+            Returns filtered queryset based on query parameters,
+            all given filters must match:
             - title: Filter by play title
             - genres: Filter by genre IDs (comma-separated)
             - actors: Filter by actor IDs (comma-separated)
+            - search: Full-text search, most relevant plays first
         """
         return super().list(request, *args, **kwargs)
 
-    def get_queryset(self):
-
-        title = self.request.query_params.get("title")
-        genres = self.request.query_params.get("genres")
-        actors = self.request.query_params.get("actors")
-
-        if title:
-            return self.queryset.filter(title__icontains=title)
-        if genres:
-            genres_ids = self._params_to_ints(genres)
-            return self.queryset.filter(genres__id__in=genres_ids)
-        if actors:
-            actors_ids = self._params_to_ints(actors)
-            return self.queryset.filter(actors__id__in=actors_ids)
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
 
-        return self.queryset.distinct()
+    def get_queryset(self):
+        return filter_plays(
+            super().get_queryset(), self.request.query_params
+        )
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -102,66 +163,135 @@ class PlayViewSet(viewsets.ModelViewSet):
 
 
 class ActorViewSet(
+    ReadReplicaMixin,
+    CachedResponseMixin,
+    SerializerTimingMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
 ):
+    cache_models = (Actor,)
     queryset = Actor.objects.all()
     serializer_class = ActorSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    authentication_classes = (StatelessJWTAuthentication,)
+    throttle_scope = "catalog"
 
 
 class GenreViewSet(
+    ReadReplicaMixin,
+    CachedResponseMixin,
+    SerializerTimingMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
 ):
+    cache_models = (Genre,)
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    authentication_classes = (StatelessJWTAuthentication,)
+    throttle_scope = "catalog"
 
 
-class PerformanceViewSet(viewsets.ModelViewSet):
+class PerformancePagination(KeysetCursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("show_time", "id")
+
+
+class PerformanceViewSet(
+    ReadReplicaMixin,
+    SerializerTimingMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
     queryset = (
         Performance.objects.all()
         .select_related("play", "theatre_hall")
-        .prefetch_related("tickets")
         .annotate(
             available_seats=(
-                    F("theatre_hall__rows") * F("theatre_hall__seats_in_row")
-                    - Count("tickets")
+                F("theatre_hall__rows") * F("theatre_hall__seats_in_row")
+                - F("tickets_sold")
             )
         )
     )
     serializer_class = PerformanceSerializer
+    values_serializer = PERFORMANCE_LIST
+    pagination_class = PerformancePagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    authentication_classes = (StatelessJWTAuthentication,)
+    throttle_scope = "catalog"
 
     @extend_schema(
         parameters=[
             OpenApiParameter(name='date', type=str),
-            OpenApiParameter(name='play', type=int),
+            OpenApiParameter(name='from', type=str),
+            OpenApiParameter(name='to', type=str),
+            OpenApiParameter(name='play', type=str),
+            OpenApiParameter(name='hall', type=str),
+            OpenApiParameter(name='genre', type=str),
         ]
     )
     def list(self, request, *args, **kwargs):
         """
-        Returns filtered queryset based on query parameters:
+        Returns filtered queryset based on query parameters,
+        all given filters must match:
             - date: Filter by date str
+            - from, to: Filter by dates, inclusive (YYYY-MM-DD)
             - play: Filter by play IDs (comma-separated)
+            - hall: Filter by theatre hall IDs (comma-separated)
+            - genre: Filter by genre IDs (comma-separated)
         """
         return super().list(request, *args, **kwargs)
 
-    def get_queryset(self):
-        date = self.request.query_params.get("date")
-        play_id_str = self.request.query_params.get("play")
-
-        queryset = self.queryset
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name='from', type=str),
+            OpenApiParameter(name='to', type=str),
+            OpenApiParameter(name='play', type=str),
+            OpenApiParameter(name='hall', type=str),
+            OpenApiParameter(name='genre', type=str),
+        ],
+        responses=dict,
+    )
+    @action(detail=False, methods=["get"])
+    def calendar(self, request):
+        """
+        Returns the number of performances, seats sold, capacity and
+        occupancy per day and theatre hall:
+            - from, to: Dates, inclusive (YYYY-MM-DD), a month from today
+              by default and at most 92 days
+            - play, hall, genre: Filter by IDs (comma-separated)
+        """
+        return Response(performance_calendar(request.query_params))
+
+    @extend_schema(request=ScheduleValidationSerializer, responses=dict)
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="validate-schedule",
+        permission_classes=(IsAdminUser,),
+    )
+    def validate_schedule(self, request):
+        """
+        Checks proposed performances for overlaps in their theatre halls,
+        with each other and with the stored schedule, without saving them.
+        """
+        serializer = ScheduleValidationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            validate_schedule(serializer.validated_data["performances"])
+        )
 
-        if date:
-            date = datetime.strptime(date, "%Y-%m-%d").date()
-            queryset = queryset.filter(show_time__date=date)
+    def get_queryset(self):
+        queryset = filter_performances(
+            self.queryset, self.request.query_params
+        )
 
-        if play_id_str:
-            queryset = queryset.filter(play_id=int(play_id_str))
+        if self.action == "list":
+            queryset = queryset.defer("seat_map")
 
         return queryset
 
@@ -174,32 +304,77 @@ class PerformanceViewSet(viewsets.ModelViewSet):
 
         return PerformanceSerializer
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="encoding",
+                type=str,
+                enum=["bitmap", "rle"],
+                description="bitmap: base64 packed bits (default), "
+                "rle: alternating free/taken run lengths",
+            ),
+        ]
+    )
+    @action(detail=True, methods=["get"], url_path="seat-map")
+    def seat_map(self, request, pk=None):
+        """
+        Returns taken seats of a performance as a compact seat map:
+        one bit per seat, row-major, most significant bit first.
+        """
+        encoding = request.query_params.get("encoding", "bitmap")
+        if encoding not in SEAT_MAP_ENCODINGS:
+            return Response(
+                {"encoding": "Must be one of: bitmap, rle."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(seat_map_data(self.get_object(), encoding))
+
 
-class ReservationPagination(PageNumberPagination):
+class ReservationPagination(KeysetCursorPagination):
     page_size = 10
+    page_size_query_param = "page_size"
     max_page_size = 100
+    ordering = ("-created_at", "-id")
 
 
 class ReservationViewSet(
+    SerializerTimingMixin,
+    ValuesListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     GenericViewSet,
 ):
-    queryset = Reservation.objects.prefetch_related(
-        "tickets__performance__play", "tickets__performance__theatre_hall"
-    )
+    queryset = Reservation.objects.all()
     serializer_class = ReservationSerializer
     pagination_class = ReservationPagination
     permission_classes = (IsAuthenticated,)
+    fast_actions = ("retrieve",)
+    throttle_scope = {
+        "create": "reservations",
+        "best_available": "reservations",
+    }
 
     def get_queryset(self):
-        return Reservation.objects.filter(
-            user=self.request.user
-        ).prefetch_related(
-            "tickets__performance__play",
-            "tickets__performance__theatre_hall"
-        )
+        queryset = Reservation.objects.filter(user=self.request.user)
+
+        if self.action == "list":
+            return queryset.annotate(
+                tickets_count=Count("tickets"),
+                first_show_time=Min("tickets__performance__show_time"),
+            )
+
+        if (
+            self.action == "retrieve"
+            and not settings.FAST_LIST_SERIALIZATION
+        ):
+            return queryset.prefetch_related(
+                "tickets__performance__play",
+                "tickets__performance__theatre_hall",
+            )
+
+        return queryset
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -210,5 +385,241 @@ class ReservationViewSet(
 
         return ReservationSerializer
 
+    def retrieve(self, request, *args, **kwargs):
+        if not settings.FAST_LIST_SERIALIZATION:
+            return super().retrieve(request, *args, **kwargs)
+
+        reservation = self.get_object()
+        tickets = TICKET_LIST.values(reservation.tickets.all())
+        return Response(
+            {
+                "id": reservation.id,
+                "created_at": serialize_datetime(reservation.created_at),
+                "tickets": time_serialization(
+                    TICKET_LIST.to_representation
+                )(tickets),
+            }
+        )
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    @extend_schema(
+        request=BestAvailableSerializer, responses=ReservationSerializer
+    )
+    @action(detail=False, methods=["post"], url_path="best-available")
+    def best_available(self, request):
+        """
+        Books the best available adjacent seats of a performance:
+            - performance: Performance ID
+            - seats: Number of adjacent seats
+        """
+        serializer = BestAvailableSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        reservation = serializer.save(user=request.user)
+        return Response(
+            ReservationSerializer(reservation).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="export_format", type=str, enum=list(EXPORT_FORMATS)
+            ),
+            OpenApiParameter(name="from", type=str),
+            OpenApiParameter(name="to", type=str),
+            OpenApiParameter(name="performance", type=str),
+        ],
+        responses={(200, "text/csv"): str},
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=(IsAdminUser,),
+    )
+    def export(self, request):
+        """
+        Streams all reservation tickets of all users as CSV or NDJSON:
+            - export_format: csv (default) or ndjson
+            - from, to: Reservation dates, inclusive (YYYY-MM-DD)
+            - performance: Filter by performance IDs (comma-separated)
+        """
+        params = request.query_params
+        export_format = params.get("export_format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {"export_format": "Must be one of: csv, ndjson."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        filters = {}
+        if params.get("from"):
+            filters["date_from"] = parse_date_param(params["from"], "from")
+        if params.get("to"):
+            filters["date_to"] = parse_date_param(params["to"], "to")
+        if params.get("performance"):
+            filters["performance_ids"] = params_to_ints(
+                params["performance"], "performance"
+            )
+
+        response = StreamingHttpResponse(
+            iter_export(export_format, export_rows(**filters)),
+            content_type=EXPORT_FORMATS[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="reservations.{export_format}"'
+        )
+        return response
+
+
+class SeatHoldViewSet(
+    SerializerTimingMixin,
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    GenericViewSet,
+):
+    """
+    Time-limited seat holds: hold seats, then confirm the hold into
+    a reservation or release it. Unconfirmed holds expire on their own.
+    """
+
+    queryset = SeatHold.objects.prefetch_related("seats")
+    serializer_class = SeatHoldSerializer
+    permission_classes = (IsAuthenticated,)
+    throttle_scope = {"create": "reservations", "confirm": "reservations"}
+
+    def get_queryset(self):
+        return self.queryset.filter(user=self.request.user)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    @extend_schema(request=None, responses=ReservationSerializer)
+    @action(detail=True, methods=["post"])
+    def confirm(self, request, pk=None):
+        reservation = confirm_hold(self.get_object())
+        return Response(
+            ReservationSerializer(reservation).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class SeasonImportView(APIView):
+    """
+    Import a season of genres, actors, theatre halls, plays and
+    performances, either as a JSON body or an uploaded JSON/CSV ``file``.
+    Pass ``?dry_run=true`` to validate and time the import without saving.
+    """
+
+    permission_classes = (IsAdminUser,)
+    parser_classes = (JSONParser, MultiPartParser)
+
+    @extend_schema(
+        parameters=[OpenApiParameter(name="dry_run", type=bool)],
+        request=None,
+        responses=dict,
+    )
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is not None:
+            file_format = (
+                "csv" if upload.name.lower().endswith(".csv") else "json"
+            )
+            season = parse_season(
+                upload.read().decode("utf-8-sig"), file_format
+            )
+        else:
+            season = request.data
+
+        dry_run = request.query_params.get("dry_run", "").lower() in (
+            "1",
+            "true",
+        )
+        report = SeasonImporter(season).run(dry_run=dry_run)
+        return Response(
+            report,
+            status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED,
+        )
+
+
+class MetricsView(APIView):
+    """
+    Latency histograms and average query count, database time, render
+    time and response size of sampled requests, per viewset action, and
+    database connection statistics. Numbers are kept per worker process
+    since its start.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(responses=dict)
+    def get(self, request):
+        return Response(
+            {
+                "sample_rate": settings.REQUEST_METRICS_SAMPLE_RATE,
+                "views": registry.snapshot(),
+                "databases": database_stats(),
+            }
+        )
+
+
+class AnalyticsView(APIView):
+    """
+    Base of the admin analytics endpoints. Reports are served from the
+    sales rollups, refreshed by ``python manage.py refresh_sales_rollups``,
+    and state up to which reservation time they are complete.
+    """
+
+    permission_classes = (IsAdminUser,)
+    report = None
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name="from", type=str),
+            OpenApiParameter(name="to", type=str),
+            OpenApiParameter(name="limit", type=int),
+        ],
+        responses=dict,
+    )
+    def get(self, request):
+        return Response(
+            {
+                "refreshed_until": refreshed_until(),
+                "results": self.report(request.query_params),
+            }
+        )
+
+
+class SalesAnalyticsView(AnalyticsView):
+    """Tickets sold per day of sale, for ``from``/``to`` sale dates."""
+
+    report = staticmethod(sales_over_time)
+
+
+class OccupancyAnalyticsView(AnalyticsView):
+    """
+    Tickets sold, capacity and occupancy per theatre hall, for the
+    performances shown between the ``from``/``to`` dates.
+    """
+
+    report = staticmethod(occupancy_by_hall)
+
+
+class TopPlaysAnalyticsView(AnalyticsView):
+    """The ``limit`` plays with the most tickets sold."""
+
+    report = staticmethod(top_plays)
+
+
+class TopActorsAnalyticsView(AnalyticsView):
+    """The ``limit`` actors whose plays sold the most tickets."""
+
+    report = staticmethod(top_actors)
+
+
+class TopGenresAnalyticsView(AnalyticsView):
+    """The ``limit`` genres whose plays sold the most tickets."""
+
+    report = staticmethod(top_genres)
@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -22,3 +23,12 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class TokenObtainPairWithClaimsSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        """Add the claims read-only endpoints authenticate with"""
+        token = super().get_token(user)
+        token["is_staff"] = user.is_staff
+        return token